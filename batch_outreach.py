@@ -0,0 +1,326 @@
+import json
+import os
+import time
+import uuid
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from gpt_outreach import ANTHROPIC_MODEL, GPTOutreach
+
+BATCH_FILE = 'batch.json'
+REQUESTS_FILE = 'batch_requests.jsonl'
+
+OPENAI_ENDPOINT = '/v1/chat/completions'
+
+# Provider statuses after which a batch will not change any more
+_OPENAI_DONE = ('completed', 'failed', 'expired', 'cancelled')
+_ANTHROPIC_DONE = ('ended',)
+
+
+class BatchOutreach:
+    """
+    Outreach generated through a provider's asynchronous batch API
+
+    submit() writes one request per candidate to the run directory in the provider's
+    batch format (OpenAI Batch JSONL or Anthropic Message Batches), submits it and
+    records the batch id in batch.json next to run.json. collect() checks the batch
+    later, possibly from another process, and returns the messages once it has ended.
+    Prompts are the same prefix/suffix pair GPTOutreach sends synchronously.
+    """
+
+    def __init__(self, provider: str = 'openai', client: Any = None, prompts: GPTOutreach = None):
+        if provider not in ('openai', 'anthropic'):
+            raise ValueError(f"Unknown batch provider: {provider}")
+        self.provider = provider
+        self.prompts = prompts or GPTOutreach()
+        if client is None and Config.LLM_BATCH_ENDPOINT == 'local':
+            client = LocalBatchEndpoint(Config.LOCAL_BATCH_DIR)
+        if client is None:
+            client = self.prompts.anthropic_client if provider == 'anthropic' else self.prompts.openai_client
+        self.client = client
+        self.source = ('claude' if provider == 'anthropic' else 'gpt-4') + '_batch'
+
+    @property
+    def usage(self) -> Dict[str, float]:
+        return self.prompts.usage
+
+    def build_requests(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                       recruiter_name: str = "Recruitment Team") -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        One batch request per candidate
+
+        Returns:
+            (requests in the provider's format, custom_id -> linkedin_url)
+        """
+        requests = []
+        custom_ids = {}
+        for i, candidate in enumerate(candidates):
+            # custom_id is limited to 64 characters, so profile URLs are mapped in batch.json instead
+            custom_id = f"candidate-{i}"
+            custom_ids[custom_id] = candidate['linkedin_url']
+            prefix, suffix = self.prompts._build_prompt_parts(candidate, job_details, recruiter_name)
+            if self.provider == 'anthropic':
+                requests.append({'custom_id': custom_id, 'params': {
+                    'model': ANTHROPIC_MODEL,
+                    'max_tokens': 500,
+                    'temperature': 0.7,
+                    'system': [{'type': 'text', 'text': prefix, 'cache_control': {'type': 'ephemeral'}}],
+                    'messages': [{'role': 'user', 'content': suffix}]
+                }})
+            else:
+                requests.append({'custom_id': custom_id, 'method': 'POST', 'url': OPENAI_ENDPOINT, 'body': {
+                    'model': self.prompts.model,
+                    'max_tokens': 500,
+                    'temperature': 0.7,
+                    'messages': [{'role': 'system', 'content': prefix}, {'role': 'user', 'content': suffix}]
+                }})
+        return requests, custom_ids
+
+    def submit(self, run_dir: str, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+               recruiter_name: str = "Recruitment Team") -> Dict[str, Any]:
+        """
+        Submit a batch for the candidates and record it in the run directory
+
+        Returns:
+            The batch record written to batch.json (provider, batch_id, status, custom_ids)
+        """
+        if self.client is None:
+            raise RuntimeError(f"No {self.provider} client available for batch outreach")
+        requests, custom_ids = self.build_requests(candidates, job_details, recruiter_name)
+        path = os.path.join(run_dir, REQUESTS_FILE)
+        with open(path, 'w', encoding='utf-8') as f:
+            for request in requests:
+                f.write(json.dumps(request, ensure_ascii=False) + '\n')
+
+        if self.provider == 'anthropic':
+            batch = self.client.messages.batches.create(requests=requests)
+            status = batch.processing_status
+        else:
+            with open(path, 'rb') as f:
+                uploaded = self.client.files.create(file=f, purpose='batch')
+            batch = self.client.batches.create(input_file_id=uploaded.id, endpoint=OPENAI_ENDPOINT,
+                                               completion_window='24h')
+            status = batch.status
+
+        record = {
+            'provider': self.provider,
+            'batch_id': batch.id,
+            'status': status,
+            'submitted_at': time.time(),
+            'custom_ids': custom_ids
+        }
+        write_batch_record(run_dir, record)
+        print(f"📦 Submitted {len(requests)} outreach requests as {self.provider} batch {batch.id}")
+        return record
+
+    def collect(self, run_dir: str) -> Tuple[str, Dict[str, Tuple[Optional[str], str]]]:
+        """
+        Check a run's batch and fetch its results if it has ended
+
+        Returns:
+            (provider status, linkedin_url -> (message, source)); messages are empty while
+            the batch is still running, and None for requests that failed
+        """
+        record = read_batch_record(run_dir)
+        if self.provider == 'anthropic':
+            batch = self.client.messages.batches.retrieve(record['batch_id'])
+            status = batch.processing_status
+            done = status in _ANTHROPIC_DONE
+        else:
+            batch = self.client.batches.retrieve(record['batch_id'])
+            status = batch.status
+            done = status in _OPENAI_DONE
+        record['status'] = status
+        if not done:
+            write_batch_record(run_dir, record)
+            return status, {}
+
+        replies = self._anthropic_results(batch) if self.provider == 'anthropic' else self._openai_results(batch)
+        messages = {}
+        for custom_id, url in record['custom_ids'].items():
+            message = replies.get(custom_id)
+            messages[url] = (message, self.source if message else f"{self.provider}_batch_error")
+        record['collected_at'] = time.time()
+        write_batch_record(run_dir, record)
+        return status, messages
+
+    def _openai_results(self, batch) -> Dict[str, str]:
+        replies = {}
+        if not batch.output_file_id:
+            return replies
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get('response') or {}
+            if item.get('error') or response.get('status_code') != 200:
+                continue
+            body = response['body']
+            usage = body.get('usage') or {}
+            cached = (usage.get('prompt_tokens_details') or {}).get('cached_tokens') or 0
+            self.prompts._record_usage(self.prompts.model, usage.get('prompt_tokens', 0), cached, 0,
+                                       usage.get('completion_tokens', 0), 0, Config.LLM_BATCH_DISCOUNT)
+            replies[item['custom_id']] = body['choices'][0]['message']['content'].strip()
+        return replies
+
+    def _anthropic_results(self, batch) -> Dict[str, str]:
+        replies = {}
+        for item in self.client.messages.batches.results(batch.id):
+            if item.result.type != 'succeeded':
+                continue
+            message = item.result.message
+            usage = message.usage
+            cached = getattr(usage, 'cache_read_input_tokens', 0) or 0
+            written = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+            self.prompts._record_usage(ANTHROPIC_MODEL, usage.input_tokens + cached + written, cached, written, usage.output_tokens, 0,
+                                       Config.LLM_BATCH_DISCOUNT)
+            replies[item.custom_id] = message.content[0].text.strip()
+        return replies
+
+
+def read_batch_record(run_dir: str) -> Optional[Dict[str, Any]]:
+    """The run's batch.json, or None if outreach was not sent as a batch"""
+    path = os.path.join(run_dir, BATCH_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_batch_record(run_dir: str, record: Dict[str, Any]):
+    path = os.path.join(run_dir, BATCH_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(record, f, indent=2, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+
+
+def _echo_reply(system: str, user: str) -> str:
+    name = user.split('Name: ', 1)[1].split('\n', 1)[0] if 'Name: ' in user else 'there'
+    return f"Hi {name},\n\nThis is a local batch stand-in reply.\n\nBest regards"
+
+
+class LocalBatchEndpoint:
+    """
+    Local stand-in for the OpenAI Batch and Anthropic Message Batches endpoints
+
+    Offers the client calls BatchOutreach makes (files.create/content and
+    batches.create/retrieve for OpenAI, messages.batches.create/retrieve/results for
+    Anthropic) and keeps batches as files under root, so a batch submitted by one
+    process can be collected by another. Batches finish after complete_after
+    retrieve() calls; replies come from responder(system, user).
+    """
+
+    def __init__(self, root: str, responder: Callable[[str, str], Optional[str]] = None, complete_after: int = 0):
+        self.root = root
+        self.responder = responder or _echo_reply
+        self.complete_after = complete_after
+        os.makedirs(root, exist_ok=True)
+        self.files = SimpleNamespace(create=self._create_file, content=self._file_content)
+        self.batches = SimpleNamespace(create=self._create_openai_batch, retrieve=self._retrieve_openai_batch)
+        self.messages = SimpleNamespace(batches=SimpleNamespace(
+            create=self._create_anthropic_batch, retrieve=self._retrieve_anthropic_batch,
+            results=self._anthropic_results))
+
+    # OpenAI surface
+
+    def _create_file(self, file, purpose: str):
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        self._write(file_id, file.read().decode('utf-8'))
+        return SimpleNamespace(id=file_id, purpose=purpose)
+
+    def _file_content(self, file_id: str):
+        return SimpleNamespace(text=self._read(file_id))
+
+    def _create_openai_batch(self, input_file_id: str, endpoint: str, completion_window: str):
+        requests = [json.loads(line) for line in self._read(input_file_id).splitlines() if line.strip()]
+        return self._openai_batch(self._create('batch', 'openai', requests))
+
+    def _retrieve_openai_batch(self, batch_id: str):
+        return self._openai_batch(self._advance(batch_id))
+
+    def _openai_batch(self, state: Dict[str, Any]):
+        status = 'completed' if state['ended'] else 'in_progress'
+        return SimpleNamespace(id=state['id'], status=status, output_file_id=state.get('output_file_id'),
+                               error_file_id=None)
+
+    # Anthropic surface
+
+    def _create_anthropic_batch(self, requests: List[Dict[str, Any]]):
+        return self._anthropic_batch(self._create('msgbatch', 'anthropic', requests))
+
+    def _retrieve_anthropic_batch(self, batch_id: str):
+        return self._anthropic_batch(self._advance(batch_id))
+
+    def _anthropic_batch(self, state: Dict[str, Any]):
+        return SimpleNamespace(id=state['id'], processing_status='ended' if state['ended'] else 'in_progress')
+
+    def _anthropic_results(self, batch_id: str):
+        for line in self._read(self._state(batch_id)['output_file_id']).splitlines():
+            item = json.loads(line)
+            if item['text'] is None:
+                result = SimpleNamespace(type='errored')
+            else:
+                usage = SimpleNamespace(input_tokens=item['input_tokens'], output_tokens=item['output_tokens'],
+                                        cache_read_input_tokens=0, cache_creation_input_tokens=0)
+                result = SimpleNamespace(type='succeeded', message=SimpleNamespace(
+                    content=[SimpleNamespace(type='text', text=item['text'])], usage=usage))
+            yield SimpleNamespace(custom_id=item['custom_id'], result=result)
+
+    # Shared batch state
+
+    def _create(self, prefix: str, provider: str, requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        state = {'id': f"{prefix}_{uuid.uuid4().hex[:12]}", 'provider': provider, 'requests': requests,
+                 'retrieves': 0, 'ended': False}
+        self._save(state)
+        return state
+
+    def _advance(self, batch_id: str) -> Dict[str, Any]:
+        state = self._state(batch_id)
+        state['retrieves'] += 1
+        if not state['ended'] and state['retrieves'] > self.complete_after:
+            state['output_file_id'] = self._run(state)
+            state['ended'] = True
+        self._save(state)
+        return state
+
+    def _run(self, state: Dict[str, Any]) -> str:
+        lines = []
+        for request in state['requests']:
+            if state['provider'] == 'anthropic':
+                params = request['params']
+                system = ''.join(block['text'] for block in params['system'])
+                user = params['messages'][0]['content']
+            else:
+                messages = request['body']['messages']
+                system, user = messages[0]['content'], messages[1]['content']
+            text = self.responder(system, user)
+            input_tokens, output_tokens = len(system + user) // 4, len(text or '') // 4
+            if state['provider'] == 'anthropic':
+                line = {'custom_id': request['custom_id'], 'text': text,
+                        'input_tokens': input_tokens, 'output_tokens': output_tokens}
+            elif text is None:
+                line = {'custom_id': request['custom_id'], 'response': None,
+                        'error': {'code': 'server_error', 'message': 'stand-in failure'}}
+            else:
+                line = {'custom_id': request['custom_id'], 'error': None, 'response': {'status_code': 200, 'body': {
+                    'choices': [{'message': {'role': 'assistant', 'content': text}}],
+                    'usage': {'prompt_tokens': input_tokens, 'completion_tokens': output_tokens}}}}
+            lines.append(json.dumps(line, ensure_ascii=False))
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        self._write(file_id, '\n'.join(lines) + '\n')
+        return file_id
+
+    def _state(self, batch_id: str) -> Dict[str, Any]:
+        return json.loads(self._read(batch_id))
+
+    def _save(self, state: Dict[str, Any]):
+        self._write(state['id'], json.dumps(state, ensure_ascii=False))
+
+    def _read(self, name: str) -> str:
+        with open(os.path.join(self.root, name), encoding='utf-8') as f:
+            return f.read()
+
+    def _write(self, name: str, text: str):
+        with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+            f.write(text)
@@ -0,0 +1,145 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config import Config
+from records import EnrichedProfile, ScoredCandidate
+from scoring import CandidateScorer
+
+
+class CandidateIndex:
+    """
+    Inverted index over enriched profiles from past runs and local dumps
+
+    Profiles (EnrichedProfile records) are keyed by canonical username and indexed
+    under their normalized skills, companies, schools and locations, so a job can be
+    shortlisted by posting-list intersection instead of a fresh search.
+    """
+
+    def __init__(self, searcher, scorer: CandidateScorer = None):
+        self.searcher = searcher
+        # Skills and metros are normalized exactly as scoring sees them
+        self.scorer = scorer or CandidateScorer()
+        self.profiles: List[Optional[EnrichedProfile]] = []
+        self.postings: Dict[str, Set[int]] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._doc_keys: List[Set[str]] = []
+
+    def add(self, profile: EnrichedProfile) -> Optional[int]:
+        """Index a profile (record or _parse_api_response dict); a later copy of the same person replaces the earlier one"""
+        username = self.searcher._canonical_username(profile.get('profile_url', ''))
+        if not username:
+            return None
+        if isinstance(profile, dict):
+            profile = EnrichedProfile.from_dict(profile)
+
+        doc_id = self._doc_ids.get(username)
+        if doc_id is None:
+            doc_id = len(self.profiles)
+            self._doc_ids[username] = doc_id
+            self.profiles.append(profile)
+            self._doc_keys.append(set())
+        else:
+            for key in self._doc_keys[doc_id]:
+                self.postings[key].discard(doc_id)
+            self.profiles[doc_id] = profile
+
+        keys = self._keys_for(profile)
+        self._doc_keys[doc_id] = keys
+        for key in keys:
+            self.postings.setdefault(key, set()).add(doc_id)
+        return doc_id
+
+    def add_dump(self, path: str) -> int:
+        """Index a JSONL dump of raw RapidAPI records; returns the number of profiles added"""
+        added = 0
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    profile = self.searcher._parse_api_response(json.loads(line))
+                    if profile and self.add(profile) is not None:
+                        added += 1
+        return added
+
+    def add_runs(self, runs_dir: str = None) -> int:
+        """Index every candidate scored in stored runs (oldest first, so newer data wins)"""
+        runs_dir = runs_dir or Config.RUNS_DIR
+        if not os.path.isdir(runs_dir):
+            return 0
+        paths = [os.path.join(runs_dir, name, 'candidates.jsonl') for name in os.listdir(runs_dir)]
+        paths = sorted((p for p in paths if os.path.exists(p)), key=os.path.getmtime)
+
+        added = 0
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    profile = ScoredCandidate.from_dict(json.loads(line)).profile
+                    if self.add(profile) is not None:
+                        added += 1
+        return added
+
+    def query(self, skills: Iterable[str], min_skills: int = 1, locations: Iterable[str] = None,
+              companies: Iterable[str] = None, schools: Iterable[str] = None, limit: int = None) -> List[EnrichedProfile]:
+        """
+        Profiles having at least min_skills of the given skills, optionally filtered
+
+        Args:
+            skills: Skills to match (normalized like job skills)
+            min_skills: How many of them a profile must have
+            locations: Location keys from CandidateScorer.location_keys (any of)
+            companies: Company names (any of)
+            schools: School names (any of)
+            limit: Maximum number of profiles to return
+
+        Returns:
+            Matching profiles, most skills matched first (then in indexing order)
+        """
+        lists = sorted((self.postings.get('skill:' + skill.lower().strip(), set()) for skill in set(skills)), key=len)
+        if min_skills > len(lists) or min_skills < 1:
+            return []
+
+        # A profile with >= min_skills of m skills must be in one of the m - min_skills + 1
+        # shortest lists, so only those are unioned; the rest are just probed
+        candidates = set().union(*lists[:len(lists) - min_skills + 1])
+        for prefix, values in (('loc:', locations), ('company:', companies), ('school:', schools)):
+            if values is not None:
+                allowed = set().union(*(self.postings.get(prefix + self._normalize(v), set()) for v in values))
+                candidates &= allowed
+
+        matches = []
+        for doc_id in candidates:
+            count = sum(1 for posting in lists if doc_id in posting)
+            if count >= min_skills:
+                matches.append((-count, doc_id))
+        matches.sort()
+        if limit is not None:
+            matches = matches[:limit]
+        return [self.profiles[doc_id] for _, doc_id in matches]
+
+    def query_for_job(self, job_details: Dict[str, Any], min_skills: int = None, limit: int = None) -> List[EnrichedProfile]:
+        """Shortlist indexed profiles for a job: enough of its skills, in its metro area when it has one"""
+        job_context = self.scorer.compile_job(job_details)
+        min_skills = min(min_skills or Config.CANDIDATE_INDEX_MIN_SKILLS, len(job_context.skills))
+        locations = None if job_context.is_remote else self.scorer.location_keys(job_context.location) or None
+        return self.query(job_context.skills, min_skills, locations=locations,
+                          limit=limit or Config.CANDIDATE_INDEX_LIMIT)
+
+    def __len__(self):
+        return len(self._doc_ids)
+
+    def _keys_for(self, profile: EnrichedProfile) -> Set[str]:
+        features = self.scorer.featurize(profile)
+        keys = {'skill:' + skill for skill in features.skills}
+        keys.update('loc:' + key for key in self.scorer.location_keys(features.location))
+        for exp in profile.experience:
+            if exp.get('company'):
+                keys.add('company:' + self._normalize(exp['company']))
+        for edu in profile.education:
+            if edu.get('school'):
+                keys.add('school:' + self._normalize(edu['school']))
+        return keys
+
+    def _normalize(self, value: str) -> str:
+        return ' '.join(value.lower().split())
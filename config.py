@@ -7,6 +7,13 @@ class Config:
     # RapidAPI LinkedIn Data API
     RAPIDAPI_KEY = "b33e8a9b34msh236c7d31bb49420p1b1a08jsn3c853752052e"
     RAPIDAPI_HOST = "linkedin-profile-data.p.rapidapi.com"  # Fresh LinkedIn Data API
+    RAPIDAPI_BATCH_ENDPOINT = os.getenv('RAPIDAPI_BATCH_ENDPOINT', '')  # Bulk profile endpoint, if your plan has one
+    RAPIDAPI_BATCH_SIZE = 10  # Profiles per bulk request
+    
+    # Profile enrichment settings
+    ENRICHMENT_CHUNK_SIZE = 10  # Profiles handed to fetch_many at a time
+    ENRICHMENT_WORKERS = 4  # Concurrent single-profile requests when there is no bulk endpoint
+    ENRICHMENT_BUDGET = None  # Profiles to enrich per job, picked by snippet pre-score (None = max candidates)
     
     # OpenAI API for GPT-4
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')  # Set your OpenAI API key here or via environment
@@ -19,6 +26,13 @@ class Config:
     DEFAULT_SEARCH_PAGES = 2
     SEARCH_DELAY = 2  # seconds between requests
     
+    # Retry and circuit breaker settings for outbound calls
+    RETRY_MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 1.0  # seconds, doubled per attempt with full jitter
+    RETRY_MAX_DELAY = 30.0  # upper bound on any single wait, including Retry-After
+    CIRCUIT_FAILURE_THRESHOLD = 5  # consecutive failures before a host is skipped
+    CIRCUIT_RESET_TIMEOUT = 60  # seconds before a failing host is probed again
+    
     # Scoring weights (matching your rubric)
     SCORING_WEIGHTS = {
         'education': 0.20,
@@ -29,6 +43,25 @@ class Config:
         'tenure': 0.10
     }
     
+    # Ranking settings
+    TOP_K_CANDIDATES = 10  # Candidates kept in the final output
+    MIN_FIT_SCORE = None  # Optional fit score below which candidates are dropped
+    PARALLEL_SCORING_WORKERS = None  # Processes for ParallelScorer (None = CPU count)
+    PARALLEL_SCORING_CHUNK_SIZE = 2000  # Profiles per pickled work unit
+    FEATURE_CACHE_SIZE = 100000  # Candidate feature vectors kept in memory (LRU)
+    FEATURE_CACHE_PATH = os.getenv('FEATURE_CACHE_PATH', '')  # JSONL file to persist features across runs
+    
+    # Run storage (used by rescoring)
+    SAVE_RUNS = True  # Persist every scored candidate and its sub-scores per run
+    RUNS_DIR = os.getenv('RUNS_DIR', 'runs')  # One sub-directory per run id
+    CANDIDATE_INDEX_MIN_SKILLS = 2  # Job skills an indexed profile must have to be shortlisted
+    CANDIDATE_INDEX_LIMIT = 200  # Indexed profiles shortlisted per job
+    
+    # Location matching
+    GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'gazetteer.tsv')
+    GEO_METRO_RADIUS_KM = 50  # Closer than this counts as the same metro area
+    GEO_REGION_RADIUS_KM = 150  # Closer than this scores like the same state
+    
     # Outreach settings
     OUTREACH_TEMPLATE = """
 Hi {name},
@@ -40,6 +73,37 @@ Your background in {skills_highlight} aligns perfectly with what we're looking f
 Best regards,
 {recruiter_name}
     """
+    OUTREACH_SEED = int(os.getenv('OUTREACH_SEED', '0'))  # Template variation seed (same seed, same messages)
+    LLM_BATCH_SIZE = int(os.getenv('LLM_BATCH_SIZE', '5'))  # Candidates per LLM request (1 = one request each)
+    OUTREACH_WORKERS = int(os.getenv('OUTREACH_WORKERS', '4'))  # Outreach requests in flight at once
+    OUTREACH_CACHE_SIZE = 2000  # Messages each outreach backend keeps, by candidate, job and recruiter
+    # USD per million tokens, for LLM cost accounting and --llm-budget (unlisted models count as free)
+    LLM_PRICES = {
+        'gpt-3.5-turbo': {'input': 0.50, 'cached_input': 0.50, 'cache_write': 0.50, 'output': 1.50},
+        'gpt-4': {'input': 30.00, 'cached_input': 30.00, 'cache_write': 30.00, 'output': 60.00},
+        'gpt-4o': {'input': 2.50, 'cached_input': 1.25, 'cache_write': 2.50, 'output': 10.00},
+        'gpt-4o-mini': {'input': 0.15, 'cached_input': 0.075, 'cache_write': 0.15, 'output': 0.60},
+        'claude-3-5-sonnet-20241022': {'input': 3.00, 'cached_input': 0.30, 'cache_write': 3.75, 'output': 15.00},
+        'claude-3-5-haiku-20241022': {'input': 0.80, 'cached_input': 0.08, 'cache_write': 1.00, 'output': 4.00}
+    }
+    LLM_BATCH_DISCOUNT = 0.5  # Provider batch jobs are billed at half the synchronous price
+    
+    # Near-duplicate outreach (MinHash LSH over word shingles); flagged messages are regenerated
+    DEDUP_THRESHOLD = float(os.getenv('DEDUP_THRESHOLD', '0.45'))  # Estimated Jaccard similarity; above 1 disables
+    DEDUP_SHINGLE_SIZE = 3  # Words per shingle
+    DEDUP_NUM_PERM = 128  # MinHash signature length
+    
+    # Outreach routing (--route): fit score bands and the model behind each tier
+    ROUTING_PREMIUM_SCORE = 7.5  # At or above: premium model
+    ROUTING_SMALL_SCORE = 5.0  # At or above (and below premium): small, fast model; below: local templates
+    ROUTING_MODELS = {
+        'openai': {'small': 'gpt-4o-mini', 'premium': 'gpt-4o'},
+        'anthropic': {'small': 'claude-3-5-haiku-20241022', 'premium': 'claude-3-5-sonnet-20241022'}
+    }
+    ROUTING_PREMIUM_BUDGET_SHARE = 0.8  # Past this share of --llm-budget, premium routes drop to the small model
+    # Provider batch jobs (--batch-outreach); "local" sends them to LocalBatchEndpoint instead of the API
+    LLM_BATCH_ENDPOINT = os.getenv('LLM_BATCH_ENDPOINT', '')
+    LOCAL_BATCH_DIR = os.getenv('LOCAL_BATCH_DIR', os.path.join('runs', '_local_batches'))
     
     @classmethod
     def get_rapidapi_key(cls) -> str:
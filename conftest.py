@@ -0,0 +1,10 @@
+import pytest
+
+from config import Config
+
+
+@pytest.fixture(autouse=True)
+def _runs_in_tmp(tmp_path, monkeypatch):
+    """Keep stored runs and local batches out of the working directory"""
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path / 'runs'))
+    monkeypatch.setattr(Config, 'LOCAL_BATCH_DIR', str(tmp_path / 'runs' / '_local_batches'))
@@ -0,0 +1,82 @@
+import re
+import time
+from functools import lru_cache
+from typing import Any, Optional
+
+# Returned for "Present"/"Current" end dates; resolve with current_month() when used
+PRESENT = -1
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+_PRESENT_WORDS = {'present', 'current', 'now', 'today', 'ongoing'}
+_ISO_RE = re.compile(r'^(\d{4})[-/.](\d{1,2})(?:[-/.]\d{1,2})?$')   # 2019-03, 2019/03/15
+_NUMERIC_RE = re.compile(r'^(\d{1,2})[-/.](\d{4})$')                # 03/2019
+_MONTH_NAME_RE = re.compile(r'^([a-z]{3})[a-z]*\.?,?\s+(\d{4})$')   # Mar 2019, September 2019
+_YEAR_RE = re.compile(r'^(\d{4})$')
+
+
+def month_index(year: int, month: int) -> int:
+    """Months since year 0, so month differences are plain integer subtraction"""
+    return year * 12 + month - 1
+
+
+def current_month() -> int:
+    now = time.localtime()
+    return month_index(now.tm_year, now.tm_mon)
+
+
+@lru_cache(maxsize=4096)
+def _parse_text(text: str) -> Optional[int]:
+    # Profile date strings repeat a lot ("Mar 2019", "Present"), so each is parsed once
+    text = text.strip().lower()
+    if not text:
+        return None
+    if text in _PRESENT_WORDS:
+        return PRESENT
+
+    match = _ISO_RE.match(text)
+    if match:
+        year, month = int(match.group(1)), int(match.group(2))
+    else:
+        match = _NUMERIC_RE.match(text)
+        if match:
+            month, year = int(match.group(1)), int(match.group(2))
+        else:
+            match = _MONTH_NAME_RE.match(text)
+            if match and match.group(1) in MONTHS:
+                month, year = MONTHS[match.group(1)], int(match.group(2))
+            else:
+                match = _YEAR_RE.match(text)
+                if not match:
+                    return None
+                year, month = int(match.group(1)), 1
+
+    if not 1 <= month <= 12:
+        return None
+    return month_index(year, month)
+
+
+def parse_month(value: Any) -> Optional[int]:
+    """
+    Parse a profile date into a month index
+
+    Args:
+        value: Date string ("Mar 2019", "2019-03", "03/2019", "2019", "Present") or a
+            {'year': ..., 'month': ...} dict as some API responses return
+
+    Returns:
+        Month index from month_index(), PRESENT for ongoing end dates, or None if unparseable
+    """
+    if value.__class__ is str:
+        return _parse_text(value)
+    if not value:
+        return None
+    if isinstance(value, dict) and value.get('year'):
+        try:
+            return month_index(int(value['year']), int(value.get('month') or 1))
+        except (TypeError, ValueError):
+            return None
+    return None
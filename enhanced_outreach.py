@@ -1,11 +1,30 @@
-import re
+import hashlib
 import random
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from config import Config
+from outreach_backend import OutreachBackend, register_backend
+from templates import CompiledTemplate, job_fields, job_key
 
-class EnhancedOutreachGenerator:
-    def __init__(self):
-        """Enhanced local outreach generator with multiple templates and personalization"""
+# Personalization variants of every template; each rewrites this phrase
+_PERSONALIZED_PHRASE = "Your expertise in"
+PLAIN, SCHOOL, EXTENSIVE = 0, 1, 2
+
+class EnhancedOutreachGenerator(OutreachBackend):
+    name = 'enhanced'
+    label = "🎯 Using enhanced local templates for outreach message generation"
+    
+    def __init__(self, seed: int = None):
+        """
+        Enhanced local outreach generator with multiple templates and personalization
+        
+        Args:
+            seed: Varies which template variation each candidate gets (default: Config.OUTREACH_SEED);
+                the same candidate, job and seed always give the same message
+        """
+        super().__init__()
+        self.seed = Config.OUTREACH_SEED if seed is None else seed
+        # Only for candidates with no URL or name to hash; per instance, so threads don't share state
+        self.rng = random.Random(self.seed)
         
         # Multiple template variations for different scenarios
         self.templates = {
@@ -133,8 +152,18 @@ Best regards,
                 "I'd be happy to discuss this role in more detail if you're interested."
             ]
         }
+        
+        # Each variation compiled once per personalization (see _personalization)
+        self.compiled = {
+            key: [(CompiledTemplate(template),
+                   CompiledTemplate(template.replace(_PERSONALIZED_PHRASE, "Your background from {school} and expertise in")),
+                   CompiledTemplate(template.replace(_PERSONALIZED_PHRASE, "Your extensive experience and expertise in")))
+                  for template in variations]
+            for key, variations in self.templates.items()
+        }
     
-    def generate_outreach_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team") -> str:
+    def generate_outreach_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team",
+                                  job: Dict[str, Any] = None) -> str:
         """
         Generate a personalized outreach message using enhanced local templates
         
@@ -142,45 +171,58 @@ Best regards,
             candidate: Candidate data including name, headline, skills, etc.
             job_details: Job details including title, company, location, etc.
             recruiter_name: Name of the recruiter
+            job: bind_job(job_details, recruiter_name), if the caller already has it (or one bound
+                with another seed, for a different variation)
             
         Returns:
             Personalized outreach message
         """
+        job = job or self.bind_job(job_details, recruiter_name)
+        
         # Determine the best template based on candidate profile
         template_key = self._determine_template_key(candidate, job_details)
-        template_variations = self.templates[template_key]
         
-        # Select a random template variation for variety
-        template = random.choice(template_variations)
+        # Pick a template variation for variety, stable for this candidate, job and seed
+        variations = job['templates'][template_key]
+        variants = variations[self._variation_index(candidate, job, len(variations))]
         
-        # Extract and prepare data
-        current_company = self._extract_current_company(candidate)
-        skills_highlight = self._extract_skills_highlight(candidate, job_details)
-        candidate_location = candidate.get('location', 'your area')
+        # Add personalization touches
+        variant, school = self._personalization(candidate)
         
-        # Prepare template variables
-        template_vars = {
+        return variants[variant].render({
             'name': candidate.get('name', 'there'),
             'headline': candidate.get('headline', 'professional experience'),
-            'job_title': job_details.get('title', 'this position'),
-            'company': job_details.get('company', 'our company'),
-            'location': job_details.get('location', 'our location'),
-            'skills_highlight': skills_highlight,
-            'current_company': current_company,
-            'candidate_location': candidate_location,
-            'recruiter_name': recruiter_name
-        }
-        
-        # Generate message
-        message = template.format(**template_vars)
-        
-        # Add personalization touches
-        message = self._add_personalization(message, candidate, job_details)
-        
-        # Clean up the message
-        message = self._clean_message(message)
-        
-        return message
+            'skills_highlight': self._extract_skills_highlight(candidate, job_details, job['skills']),
+            'current_company': self._extract_current_company(candidate),
+            'candidate_location': candidate.get('location', 'your area'),
+            'school': school
+        })
+    
+    def bind_job(self, job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team",
+                 seed: int = None) -> Dict[str, Any]:
+        """Templates with this job's fields filled in, its skill set and variation hash (seed: default self.seed)"""
+        seed = self.seed if seed is None else seed
+        identity = _job_identity(job_details)
+        
+        def build():
+            fields = job_fields(job_details, recruiter_name)
+            return {
+                'templates': {name: [tuple(template.bind(fields) for template in variants) for variants in variations]
+                              for name, variations in self.compiled.items()},
+                'skills': tuple(dict.fromkeys(skill.lower() for skill in job_details.get('skills') or [])),
+                'hash': hashlib.blake2b(f"{identity}\x1f{seed}\x1f".encode('utf-8'), digest_size=8)
+            }
+        return self._bound_job((job_key(job_details, recruiter_name), identity, seed), build)
+    
+    def _variation_index(self, candidate: Dict[str, Any], job: Dict[str, Any], count: int) -> int:
+        """Stable hash of (candidate URL, job id, seed) into [0, count)"""
+        identity = candidate.get('linkedin_url') or candidate.get('profile_url') or candidate.get('url') \
+            or candidate.get('name')
+        if not identity:
+            return self.rng.randrange(count)
+        digest = job['hash'].copy()
+        digest.update(identity.encode('utf-8'))
+        return int.from_bytes(digest.digest(), 'big') % count
     
     def _determine_template_key(self, candidate: Dict[str, Any], job_details: Dict[str, Any]) -> str:
         """Determine the best template based on candidate and job characteristics"""
@@ -229,29 +271,26 @@ Best regards,
         
         return ''
     
-    def _extract_skills_highlight(self, candidate: Dict[str, Any], job_details: Dict[str, Any]) -> str:
-        """Extract and format skills highlight for the message"""
-        candidate_skills = set()
-        job_skills = set()
-        
-        # Get candidate skills
-        if 'skills' in candidate:
-            candidate_skills.update(skill.lower() for skill in candidate['skills'])
+    def _extract_skills_highlight(self, candidate: Dict[str, Any], job_details: Dict[str, Any], job_skills: tuple = None) -> str:
+        """Extract and format skills highlight for the message (job_skills: the job's lowercased skills, if already known)"""
+        # Get candidate skills (lists in their own order, so messages don't depend on string hashing)
+        candidate_skills = list(dict.fromkeys(skill.lower() for skill in candidate.get('skills') or []))
         
         # Get job skills
-        if 'skills' in job_details:
-            job_skills.update(skill.lower() for skill in job_details['skills'])
+        if job_skills is None:
+            job_skills = tuple(dict.fromkeys(skill.lower() for skill in job_details.get('skills') or []))
         
-        # Find matching skills
-        matching_skills = candidate_skills.intersection(job_skills)
+        # Find matching skills, in the job's order
+        candidate_set = set(candidate_skills)
+        matching_skills = [skill for skill in job_skills if skill in candidate_set]
         
         if matching_skills:
             # Take top 3 matching skills
-            top_skills = list(matching_skills)[:3]
+            top_skills = matching_skills[:3]
             return ', '.join(skill.title() for skill in top_skills)
         elif candidate_skills:
             # Use top candidate skills if no match
-            top_skills = list(candidate_skills)[:3]
+            top_skills = candidate_skills[:3]
             return ', '.join(skill.title() for skill in top_skills)
         else:
             return "relevant technical skills"
@@ -267,71 +306,35 @@ Best regards,
         
         return candidate_city == job_city
     
-    def _add_personalization(self, message: str, candidate: Dict[str, Any], job_details: Dict[str, Any]) -> str:
-        """Add personalization touches to the message"""
+    def _personalization(self, candidate: Dict[str, Any]) -> tuple:
+        """Which template variant personalizes the message, and the school it mentions"""
         
         # Add education mention if relevant
         education = candidate.get('education', [])
         if education:
-            top_education = education[0]
-            school = top_education.get('school', '')
+            school = education[0].get('school', '')
             if school and any(prestigious in school.lower() for prestigious in ['stanford', 'mit', 'harvard', 'berkeley', 'caltech']):
-                message = message.replace(
-                    "Your expertise in",
-                    f"Your background from {school} and expertise in"
-                )
+                return SCHOOL, school
         
-        # Add experience duration if available
-        experience = candidate.get('experience', [])
-        if experience:
-            # Count years of experience (rough estimate)
-            experience_count = len(experience)
-            if experience_count >= 5:
-                message = message.replace(
-                    "Your expertise in",
-                    "Your extensive experience and expertise in"
-                )
+        # Add experience duration if available (rough estimate: five or more roles)
+        if len(candidate.get('experience', [])) >= 5:
+            return EXTENSIVE, ''
         
-        return message
+        return PLAIN, ''
     
-    def _clean_message(self, message: str) -> str:
-        """Clean and format the message"""
-        # Remove extra whitespace
-        message = re.sub(r'\n\s*\n', '\n\n', message)
-        message = message.strip()
-        
-        return message
-    
-    def generate_bulk_outreach_messages(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team") -> List[Dict[str, Any]]:
-        """
-        Generate outreach messages for multiple candidates
-        
-        Args:
-            candidates: List of candidate data
-            job_details: Job details
-            recruiter_name: Name of the recruiter
-            
-        Returns:
-            List of candidates with outreach messages
-        """
-        results = []
-        
+    def _generate_chunk(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                        recruiter_name: str) -> List[Tuple[Optional[str], str]]:
         print(f"🎯 Generating enhanced local outreach messages for {len(candidates)} candidates...")
-        
-        for i, candidate in enumerate(candidates):
-            print(f"   Generating message {i+1}/{len(candidates)}: {candidate.get('name', 'Unknown')}")
-            
-            message = self.generate_outreach_message(candidate, job_details, recruiter_name)
-            
-            candidate_with_message = {
-                **candidate,
-                'outreach_message': message,
-                'message_source': 'enhanced_local'
-            }
-            
-            results.append(candidate_with_message)
-        
-        return results
+        job = self.bind_job(job_details, recruiter_name)
+        return [(self.generate_outreach_message(candidate, job_details, recruiter_name, job), 'enhanced_local')
+                for candidate in candidates]
+
+def _job_identity(job_details: Dict[str, Any]) -> str:
+    """LinkedIn job id, else the posting URL, else title/company/location"""
+    return str(job_details.get('job_id') or job_details.get('job_url') or '|'.join(
+        str(job_details.get(field, '')) for field in ('title', 'company', 'location')))
+
+register_backend('enhanced', EnhancedOutreachGenerator)
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from resilience import CircuitOpenError
+
+
+class EnrichmentProvider:
+    """
+    Source of detailed profile data
+
+    Providers take canonical usernames (see LinkedInProfileSearcher._canonical_username)
+    and return a dict mapping each username to a profile in _parse_api_response format,
+    or None when the profile could not be fetched.
+    """
+
+    name = 'base'
+
+    def __init__(self):
+        self.stats = {'requests': 0, 'profiles_requested': 0, 'profiles_found': 0}
+
+    def fetch_many(self, usernames: List[str]) -> Dict[str, Optional[dict]]:
+        raise NotImplementedError
+
+    def fetch(self, username: str) -> Optional[dict]:
+        return self.fetch_many([username]).get(username)
+
+    def _record(self, requested: int, found: Dict[str, Optional[dict]], requests_made: int):
+        self.stats['requests'] += requests_made
+        self.stats['profiles_requested'] += requested
+        self.stats['profiles_found'] += sum(1 for profile in found.values() if profile)
+
+
+class RapidAPIProvider(EnrichmentProvider):
+    """
+    RapidAPI LinkedIn Data API provider
+
+    Uses the bulk endpoint when Config.RAPIDAPI_BATCH_ENDPOINT is set; otherwise pipelines
+    single-profile requests over a small thread pool sharing one keep-alive session.
+    """
+
+    name = 'rapidapi'
+
+    def __init__(self, searcher, batch_endpoint: str = None, batch_size: int = None, max_workers: int = None):
+        super().__init__()
+        self.searcher = searcher
+        self.batch_endpoint = Config.RAPIDAPI_BATCH_ENDPOINT if batch_endpoint is None else batch_endpoint
+        self.batch_size = batch_size or Config.RAPIDAPI_BATCH_SIZE
+        self.max_workers = max_workers or Config.ENRICHMENT_WORKERS
+
+    def fetch_many(self, usernames: List[str]) -> Dict[str, Optional[dict]]:
+        usernames = list(dict.fromkeys(u for u in usernames if u))
+        if not usernames:
+            return {}
+
+        if self.batch_endpoint:
+            results, requests_made = self._fetch_batched(usernames)
+        else:
+            results, requests_made = self._fetch_pipelined(usernames)
+
+        self._record(len(usernames), results, requests_made)
+        return results
+
+    def _fetch_pipelined(self, usernames: List[str]):
+        def fetch_one(username):
+            url = self._profile_url(username)
+            return self.searcher.profile_flights.do(username, self.searcher.get_profile_details_via_api, url)
+
+        workers = max(1, min(self.max_workers, len(usernames)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            profiles = list(pool.map(fetch_one, usernames))
+        return dict(zip(usernames, profiles)), len(usernames)
+
+    def _fetch_batched(self, usernames: List[str]):
+        results = {username: None for username in usernames}
+        requests_made = 0
+
+        for start in range(0, len(usernames), self.batch_size):
+            chunk = usernames[start:start + self.batch_size]
+            requests_made += 1
+            try:
+                response = self.searcher.resilience.request(
+                    "POST",
+                    self.batch_endpoint,
+                    headers=self.searcher.rapidapi_headers,
+                    json={"linkedin_urls": [self._profile_url(u) for u in chunk]},
+                    timeout=30
+                )
+            except CircuitOpenError:
+                print("⚠️ RapidAPI is failing, skipping bulk request")
+                break
+            except Exception as e:
+                print(f"Error in bulk profile request: {e}")
+                continue
+
+            if response.status_code != 200:
+                print(f"Bulk API request failed with status {response.status_code}: {response.text}")
+                continue
+
+            payload = response.json()
+            records = payload.get('data', []) if isinstance(payload, dict) else payload
+            for record in records:
+                profile = self.searcher._parse_api_response(record)
+                username = self.searcher._canonical_username((profile or {}).get('profile_url', ''))
+                if username in results:
+                    results[username] = profile
+
+        return results, requests_made
+
+    def _profile_url(self, username: str) -> str:
+        return f"https://www.linkedin.com/in/{username}"
+
+
+class JsonlFileProvider(EnrichmentProvider):
+    """
+    Reads profiles from local JSONL dumps of RapidAPI-style records
+
+    Each line is one raw API record (with `linkedin_url`); files are indexed by
+    canonical username on first use and then served from memory.
+    """
+
+    name = 'jsonl'
+
+    def __init__(self, searcher, paths: Iterable[str]):
+        super().__init__()
+        self.searcher = searcher
+        self.paths = list(paths)
+        self._index: Optional[Dict[str, dict]] = None
+
+    def fetch_many(self, usernames: List[str]) -> Dict[str, Optional[dict]]:
+        index = self._load()
+        results = {username: index.get(username) for username in usernames if username}
+        self._record(len(results), results, 0)
+        return results
+
+    def _load(self) -> Dict[str, dict]:
+        if self._index is None:
+            self._index = {}
+            for path in self.paths:
+                with open(path, encoding='utf-8') as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        profile = self.searcher._parse_api_response(json.loads(line))
+                        username = self.searcher._canonical_username((profile or {}).get('profile_url', ''))
+                        if username:
+                            self._index[username] = profile
+        return self._index
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from config import Config
+from dates import current_month
+
+# Bump when CandidateScorer's candidate-side logic changes so persisted features are recomputed
+FEATURE_VERSION = 2
+
+# Profile fields that candidate features are computed from
+FEATURE_FIELDS = ('education', 'experience', 'skills', 'location')
+
+
+class CandidateFeatures:
+    """Job-independent features of one profile, combined with a JobScoringContext at scoring time"""
+
+    __slots__ = ('education', 'trajectory', 'company', 'tenure', 'skills', 'location')
+
+    def __init__(self, education: float, trajectory: float, company: float, tenure: float,
+                 skills: Iterable[str], location: str):
+        self.education = education
+        self.trajectory = trajectory
+        self.company = company
+        self.tenure = tenure
+        self.skills = frozenset(skills)
+        self.location = location
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'education': self.education,
+            'trajectory': self.trajectory,
+            'company': self.company,
+            'tenure': self.tenure,
+            'skills': sorted(self.skills),
+            'location': self.location
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CandidateFeatures':
+        return cls(data['education'], data['trajectory'], data['company'], data['tenure'],
+                   data['skills'], data['location'])
+
+
+def profile_key(profile: Dict[str, Any], month: int = None) -> str:
+    """
+    Content hash of the profile fields features depend on
+
+    Hashes repr() rather than canonical JSON because it is about a third cheaper and this
+    runs for every score; profiles from _parse_api_response always share one key order,
+    so the only cost of reordered dicts would be a cache miss. Ongoing roles are measured
+    up to the reference month (default: this month), so it is part of the key too and
+    tenure is recomputed once a month rather than going stale.
+    """
+    month = current_month() if month is None else month
+    content = (FEATURE_VERSION, month) + tuple(profile.get(field) for field in FEATURE_FIELDS)
+    return hashlib.blake2b(repr(content).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class FeatureCache:
+    """
+    LRU cache of CandidateFeatures keyed by profile content hash
+
+    With a path, entries are loaded from a JSONL file on creation and new ones are
+    appended by save(), so features survive across runs and requisitions.
+    """
+
+    def __init__(self, max_size: int = None, path: Optional[str] = None):
+        self.max_size = max_size or Config.FEATURE_CACHE_SIZE
+        self.path = Config.FEATURE_CACHE_PATH if path is None else path
+        self._entries: 'OrderedDict[str, CandidateFeatures]' = OrderedDict()
+        self._unsaved: Dict[str, CandidateFeatures] = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        if self.path:
+            self._load()
+
+    def get(self, key: str) -> Optional[CandidateFeatures]:
+        with self._lock:
+            features = self._entries.get(key)
+            if features is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return features
+
+    def put(self, key: str, features: CandidateFeatures):
+        with self._lock:
+            self._insert(key, features)
+            if self.path:
+                self._unsaved[key] = features
+
+    def save(self) -> int:
+        """Append features computed since the last save to the cache file; returns the count written"""
+        if not self.path:
+            return 0
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, {}
+        if unsaved:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for key, features in unsaved.items():
+                    f.write(json.dumps({'key': key, 'features': features.to_dict()}) + '\n')
+        return len(unsaved)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _insert(self, key: str, features: CandidateFeatures):
+        self._entries[key] = features
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    self._insert(record['key'], CandidateFeatures.from_dict(record['features']))
+                except (ValueError, KeyError) as e:
+                    print(f"Skipping bad feature cache line: {e}")
@@ -0,0 +1,193 @@
+import math
+import mmap
+from array import array
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+from config import Config
+
+# Prefixes/suffixes that make a place name metro-level ("Greater Boston Area")
+_METRO_PREFIXES = ('greater ',)
+_METRO_SUFFIXES = (' metropolitan area', ' metro area', ' area', ' metro', ' region')
+
+
+class Place:
+    """A resolved location: city (if known), metro area, state, country and coordinates"""
+
+    __slots__ = ('kind', 'city', 'metro', 'state', 'country', 'lat', 'lon', 'remote')
+
+    def __init__(self, kind: str, city: str = '', metro: str = '', state: str = '', country: str = '',
+                 lat: float = None, lon: float = None, remote: bool = False):
+        self.kind = kind
+        self.city = city
+        self.metro = metro
+        self.state = state
+        self.country = country
+        self.lat = lat
+        self.lon = lon
+        self.remote = remote
+
+    def __repr__(self):
+        parts = [self.city, self.metro, self.state, self.country]
+        return f"Place({self.kind}: {', '.join(p for p in parts if p)}{' (remote)' if self.remote else ''})"
+
+
+def distance_km(a: Place, b: Place) -> Optional[float]:
+    """Great-circle distance between two places, or None if either has no coordinates"""
+    if a.lat is None or b.lat is None:
+        return None
+    lat1, lat2 = math.radians(a.lat), math.radians(b.lat)
+    dlat = lat2 - lat1
+    dlon = math.radians(b.lon - a.lon)
+    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    return 2 * 6371.0 * math.asin(min(1.0, math.sqrt(h)))
+
+
+class Gazetteer:
+    """
+    Offline place lookup backed by a memory-mapped TSV
+
+    Each line of the gazetteer file is
+        key  kind  city  metro  state  country  lat  lon
+    with lines sorted by key (lowercase UTF-8 bytes); a key may repeat for ambiguous
+    names, most likely place first. Only a line-offset array is built at load time;
+    lookups binary-search the mapped file, and resolve() memoizes whole locations.
+    """
+
+    def __init__(self, path: str = None, cache_size: int = 65536):
+        self.path = path or Config.GAZETTEER_PATH
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = array('I')
+        position = 0
+        size = len(self._map)
+        while position < size:
+            self._offsets.append(position)
+            end = self._map.find(b'\n', position)
+            position = size if end == -1 else end + 1
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def lookup(self, name: str) -> List[Tuple[str, ...]]:
+        """All rows for a lowercase name (kind, city, metro, state, country, lat, lon)"""
+        key = name.encode('utf-8')
+        low, high = 0, len(self._offsets)
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        rows = []
+        while low < len(self._offsets) and self._key_at(low) == key:
+            rows.append(tuple(self._line_at(low).split('\t')[1:]))
+            low += 1
+        return rows
+
+    def entries(self) -> Iterator[Tuple[str, str]]:
+        """(name, kind) of every row, in key order"""
+        for index in range(len(self._offsets)):
+            name, kind = self._line_at(index).split('\t', 2)[:2]
+            yield name, kind
+
+    def _key_at(self, index: int) -> bytes:
+        start = self._offsets[index]
+        return self._map[start:self._map.find(b'\t', start)]
+
+    def _line_at(self, index: int) -> str:
+        start = self._offsets[index]
+        end = self._map.find(b'\n', start)
+        return self._map[start:end if end != -1 else len(self._map)].decode('utf-8')
+
+    def _resolve(self, location: str) -> Optional[Place]:
+        """
+        Resolve free-text location ("Oakland, California, United States", "Greater Boston Area",
+        "Remote - US") to a Place, or None if nothing in it is known
+        """
+        text = (location or '').lower()
+        remote = 'remote' in text
+        for word in ('remote', '(', ')', ' - ', '·', '|'):
+            text = text.replace(word, ',')
+        parts = [part.strip(' .') for part in text.split(',')]
+        parts = [part for part in parts if part]
+        if not parts:
+            return Place('remote', remote=True) if remote else None
+
+        place = None
+        for i, part in enumerate(parts):
+            # An unknown head (e.g. a neighbourhood) falls through to the next most specific part
+            place = self._resolve_head(part, parts[i + 1:])
+            if place is not None:
+                break
+        if place is None:
+            return Place('remote', remote=True) if remote else None
+        place.remote = remote
+        return place
+
+    def _resolve_head(self, head: str, qualifiers: List[str]) -> Optional[Place]:
+        state, country, unknown = self._qualifiers(qualifiers)
+        if unknown and not (state or country):
+            # Qualified by a place the gazetteer doesn't have ("San Jose, Costa Rica"), so not one of its rows
+            return None
+        rows = self.lookup(head)
+        metro_level = False
+        if not rows:
+            stripped = head
+            for prefix in _METRO_PREFIXES:
+                if stripped.startswith(prefix):
+                    stripped = stripped[len(prefix):]
+            for suffix in _METRO_SUFFIXES:
+                if stripped.endswith(suffix):
+                    stripped = stripped[:-len(suffix)]
+                    break
+            if stripped != head:
+                rows = [row for row in self.lookup(stripped) if row[0] in ('city', 'metro')]
+                metro_level = True
+        if not rows:
+            return None
+
+        # Take the row agreeing with the qualifiers ("Portland, ME", "Cambridge, UK"); when none
+        # does, the place is only known to be in the qualifying state or country
+        def agrees(row):
+            return (not state or row[3] == state) and (not country or row[4] == country)
+        row = next((row for row in rows if agrees(row)), None)
+        if row is None:
+            return Place('state' if state else 'country', state=state, country=country)
+        kind, city, metro, row_state, row_country, lat, lon = row
+        if metro_level and metro:
+            kind, city = 'metro', ''
+        return Place(kind, city, metro, row_state, row_country,
+                     float(lat) if lat else None, float(lon) if lon else None)
+
+    def _qualifiers(self, parts: List[str]) -> Tuple[str, str, bool]:
+        """State and country named by the qualifying parts, and whether any part is an unknown name"""
+        state = country = ''
+        unknown = False
+        for part in parts:
+            # Postal codes ("CA 94105") qualify nothing
+            part = ' '.join(word for word in part.split() if not any(c.isdigit() for c in word))
+            if not part:
+                continue
+            rows = self.lookup(part)
+            unknown = unknown or not rows
+            for kind, _, _, row_state, row_country, _, _ in rows:
+                if kind == 'state' and not state:
+                    state, country = row_state, country or row_country
+                    break
+                if kind == 'country':
+                    country = row_country
+                    break
+        return state, country, unknown
+
+
+_default = None
+
+
+def default_gazetteer() -> Gazetteer:
+    """Shared gazetteer, mapped on first use"""
+    global _default
+    if _default is None:
+        _default = Gazetteer()
+    return _default
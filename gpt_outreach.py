@@ -1,22 +1,110 @@
 import openai
 import anthropic
-from typing import Dict, List, Any
+import json
+import threading
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from config import Config
+from outreach import OutreachGenerator
+from outreach_backend import OutreachBackend, register_backend
+from resilience import CircuitOpenError, default_layer
+from templates import job_key
 import time
 
-class GPTOutreach:
+ANTHROPIC_MODEL = "claude-3-5-sonnet-20241022"
+
+# Token, latency and cost counters kept per GPTOutreach instance (input_tokens includes cached ones),
+# in total and per model under 'by_model'
+USAGE_FIELDS = ('requests', 'input_tokens', 'cached_input_tokens', 'cache_write_tokens', 'output_tokens',
+                'latency_seconds', 'cost_usd')
+
+
+def new_usage() -> Dict[str, Any]:
+    usage = dict.fromkeys(USAGE_FIELDS, 0)
+    usage['by_model'] = {}
+    return usage
+
+
+def llm_cost(model: str, input_tokens: int, cached: int, written: int, output_tokens: int) -> float:
+    """Price of one request in USD from Config.LLM_PRICES (0 for models without a price)"""
+    prices = Config.LLM_PRICES.get(model)
+    if not prices:
+        return 0.0
+    uncached = input_tokens - cached - written
+    return (uncached * prices['input'] + cached * prices['cached_input'] + written * prices['cache_write']
+            + output_tokens * prices['output']) / 1e6
+
+
+def add_usage(total: Dict[str, Any], usage: Dict[str, Any]):
+    """Add one usage dict (totals and by_model) into another"""
+    for field in USAGE_FIELDS:
+        total[field] = round(total.get(field, 0) + usage.get(field, 0), 6)
+    for model, counters in usage.get('by_model', {}).items():
+        add_usage(total.setdefault('by_model', {}).setdefault(model, {}), dict(counters, by_model={}))
+    if not total.get('by_model'):
+        total.pop('by_model', None)
+
+
+def usage_since(after: Dict[str, Any], before: Dict[str, Any]) -> Dict[str, Any]:
+    """Usage between two snapshots of the same counters; models without requests are left out"""
+    usage = {field: round(after.get(field, 0) - before.get(field, 0), 6) for field in USAGE_FIELDS}
+    previous = before.get('by_model', {})
+    by_model = {model: usage_since(dict(counters, by_model={}), dict(previous.get(model, {}), by_model={}))
+                for model, counters in after.get('by_model', {}).items()}
+    usage['by_model'] = {model: counters for model, counters in by_model.items() if counters['requests']}
+    if not usage['by_model']:
+        del usage['by_model']
+    return usage
+
+
+def budget_spent(usage: Dict[str, Any], budget: Tuple[float, str]) -> bool:
+    """Whether usage has reached a (limit, 'tokens' | 'usd') budget"""
+    limit, unit = budget
+    spent = usage.get('cost_usd', 0) if unit == 'usd' else usage.get('input_tokens', 0) + usage.get('output_tokens', 0)
+    return spent >= limit
+
+# Appended to the job prefix for multi-candidate requests (so it stays a shared prefix too)
+BATCH_INSTRUCTIONS = """You will be given several numbered candidates. Write one separate message for each of them.
+
+Reply with JSON only, in exactly this form:
+{"messages": [{"id": <candidate number>, "message": "<the message>"}]}"""
+
+# Appended to a candidate's prompt when their message came out a near-duplicate of another's
+DIVERSIFY_INSTRUCTIONS = """Another candidate has already been sent a message very like this one:
+---
+{message}
+---
+Write a clearly different message: open differently, lead with another part of their background and vary the structure and wording."""
+
+class GPTOutreach(OutreachBackend):
     """Generate personalized outreach messages using OpenAI GPT-4 or Anthropic Claude"""
     
-    def __init__(self):
+    def __init__(self, use_anthropic: bool = False, openai_key: str = None, model: str = None):
+        """
+        Args:
+            use_anthropic: Provider generate_many writes with (the other methods take it per call)
+            openai_key: OpenAI API key (default: Config.get_openai_key())
+            model: Default OpenAI model (default: gpt-3.5-turbo)
+        """
+        super().__init__()
+        self.use_anthropic = use_anthropic
+        self.name = 'anthropic' if use_anthropic else 'openai'
+        self.label = f"🤖 Using {'Anthropic Claude' if use_anthropic else 'OpenAI'} for outreach message generation"
         self.openai_client = None
         self.anthropic_client = None
-        self.model = "gpt-3.5-turbo"  # Default to GPT-3.5 for cost efficiency
+        self.model = model or "gpt-3.5-turbo"  # Default to GPT-3.5 for cost efficiency
+        self.resilience = default_layer
+        
+        # Job-and-instructions prompt prefix of the last job seen (see _build_prompt_parts)
+        self._prefix = None
+        self.usage = new_usage()
+        self._usage_lock = threading.Lock()
         
         # Initialize OpenAI client if API key is available
-        openai_key = Config.get_openai_key()
+        openai_key = openai_key or Config.get_openai_key()
         if openai_key:
             try:
-                self.openai_client = openai.OpenAI(api_key=openai_key)
+                # Retries are handled by the shared resilience layer, not the SDK
+                self.openai_client = openai.OpenAI(api_key=openai_key, max_retries=0)
                 print("✅ OpenAI client initialized")
             except Exception as e:
                 print(f"⚠️ OpenAI client initialization failed: {e}")
@@ -25,69 +113,363 @@ class GPTOutreach:
         anthropic_key = Config.get_anthropic_key()
         if anthropic_key:
             try:
-                self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
+                self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key, max_retries=0)
                 print("✅ Anthropic client initialized")
             except Exception as e:
                 print(f"⚠️ Anthropic client initialization failed: {e}")
     
-    def generate_message(self, candidate, job_details, recruiter_name="Recruitment Team", use_anthropic=False):
-        """Generate personalized outreach message using AI"""
+    def generate_message(self, candidate, job_details, recruiter_name="Recruitment Team", use_anthropic=False,
+                         model: str = None, diversify_from: str = None):
+        """
+        Generate personalized outreach message using AI (model overrides the provider's default;
+        diversify_from asks for a message clearly different from that one)
+        """
         
         if use_anthropic and self.anthropic_client:
-            return self._generate_anthropic_message(candidate, job_details, recruiter_name)
+            return self._generate_anthropic_message(candidate, job_details, recruiter_name, model, diversify_from)
         elif self.openai_client:
-            return self._generate_openai_message(candidate, job_details, recruiter_name)
+            return self._generate_openai_message(candidate, job_details, recruiter_name, model, diversify_from)
         else:
             return None, "no_ai_available"
     
-    def _generate_anthropic_message(self, candidate, job_details, recruiter_name):
-        """Generate message using Anthropic Claude"""
-        try:
-            prompt = self._build_prompt(candidate, job_details, recruiter_name)
+    @property
+    def chunk_size(self) -> int:
+        return Config.LLM_BATCH_SIZE
+    
+    def _generate_chunk(self, candidates, job_details, recruiter_name) -> List[Tuple[Optional[str], str]]:
+        return self.generate_messages(candidates, job_details, recruiter_name, use_anthropic=self.use_anthropic)
+    
+    def _fallback_message(self, candidate, job_details, recruiter_name) -> str:
+        return OutreachGenerator().generate_outreach_message(candidate, job_details, recruiter_name)
+    
+    def generate_messages(self, candidates, job_details, recruiter_name="Recruitment Team", use_anthropic=False,
+                          batch_size: int = None, model: str = None) -> List[Tuple[Optional[str], str]]:
+        """
+        Generate messages for many candidates, several per request
+        
+        Each request carries the job prefix once and up to batch_size candidate
+        summaries, and asks for a JSON list of messages. Items missing from the
+        reply or failing validation are retried one at a time with generate_message.
+        
+        Args:
+            candidates: Candidates to write to
+            job_details: Job details
+            recruiter_name: Name of the recruiter
+            use_anthropic: Use Claude rather than OpenAI
+            batch_size: Candidates per request (default: Config.LLM_BATCH_SIZE; 1 disables batching)
+            model: Model to use instead of the provider's default
             
-            response = self.anthropic_client.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=500,
-                temperature=0.7,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
+        Returns:
+            (message, source) per candidate, in order; message is None where generation failed
+        """
+        if not (use_anthropic and self.anthropic_client) and not self.openai_client:
+            # Nothing to batch or retry with; callers fall back to templates straight away
+            print(f"   No AI client configured; {len(candidates)} message(s) left to the template fallback")
+            return [(None, "no_ai_available")] * len(candidates)
+        
+        batch_size = max(1, batch_size or Config.LLM_BATCH_SIZE)
+        results = []
+        for start in range(0, len(candidates), batch_size):
+            chunk = candidates[start:start + batch_size]
+            messages, source = [None] * len(chunk), None
+            if len(chunk) > 1:
+                messages, source = self._generate_batch(chunk, job_details, recruiter_name, use_anthropic, model)
+                failed = messages.count(None)
+                print(f"   Batch {start + 1}-{start + len(chunk)}: {len(chunk) - failed}/{len(chunk)} messages"
+                      + (f", retrying {failed} individually" if failed else ""))
+            
+            for candidate, message in zip(chunk, messages):
+                if message:
+                    results.append((message, source))
+                else:
+                    results.append(self.generate_message(candidate, job_details, recruiter_name, use_anthropic, model))
             
-            message = response.content[0].text.strip()
-            return message, "claude"
+            # Small delay between requests to avoid rate limiting
+            time.sleep(0.5)
+        return results
+    
+    def _generate_batch(self, chunk, job_details, recruiter_name, use_anthropic,
+                        model: str = None) -> Tuple[List[Optional[str]], str]:
+        """One request for several candidates; a message per candidate, None where the reply had none"""
+        prefix = None
+        suffixes = []
+        for i, candidate in enumerate(chunk, 1):
+            prefix, suffix = self._build_prompt_parts(candidate, job_details, recruiter_name)
+            suffixes.append(f"CANDIDATE {i}:\n{suffix}")
+        system = f"{prefix}\n\n{BATCH_INSTRUCTIONS}"
+        user = "\n\n".join(suffixes)
+        # ~150 words is ~200 tokens, plus JSON framing
+        max_tokens = min(4096, 350 * len(chunk))
+        
+        if use_anthropic and self.anthropic_client:
+            call, source, host = self._call_anthropic, "claude", "anthropic"
+        elif self.openai_client:
+            call, source, host = self._call_openai, "gpt-4", "openai"
+        else:
+            return [None] * len(chunk), "no_ai_available"
+        try:
+            text = call(system, user, max_tokens, json_output=True, model=model)
+        except CircuitOpenError:
+            return [None] * len(chunk), f"{host}_circuit_open"
+        except Exception as e:
+            print(f"❌ Batch generation error: {e}")
+            return [None] * len(chunk), f"{host}_error"
+        return self._parse_batch(text, chunk), source
+    
+    def _parse_batch(self, text: str, chunk) -> List[Optional[str]]:
+        """Split a batch reply into per-candidate messages, dropping any that fail validation"""
+        messages = [None] * len(chunk)
+        start, end = text.find('{'), text.rfind('}')
+        try:
+            data = json.loads(text[start:end + 1]) if start != -1 else None
+        except ValueError:
+            return messages
+        items = data.get('messages') if isinstance(data, dict) else None
+        
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            index, message = item.get('id'), item.get('message')
+            if not isinstance(index, int) or not 1 <= index <= len(chunk) or messages[index - 1] is not None:
+                continue
+            if not isinstance(message, str) or not message.strip():
+                continue
+            # Guard against messages swapped between candidates
+            first_name = (chunk[index - 1].get('name') or '').split()[:1]
+            if first_name and first_name[0].lower() not in message[:100].lower():
+                continue
+            messages[index - 1] = message.strip()
+        return messages
+    
+    def _call_anthropic(self, system: str, user: str, max_tokens: int = 500, json_output: bool = False,
+                        model: str = None) -> str:
+        """One Claude request; returns the reply text and records usage"""
+        model = model or ANTHROPIC_MODEL
+        started = time.perf_counter()
+        response = self.resilience.call(
+            "api.anthropic.com",
+            self.anthropic_client.messages.create,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=0.7,
+            # The job prefix is marked cacheable so later candidates of the job read it from cache
+            system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+            messages=[
+                {
+                    "role": "user",
+                    "content": user
+                }
+            ]
+        )
+        usage = response.usage
+        cached = getattr(usage, 'cache_read_input_tokens', 0) or 0
+        written = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+        self._record_usage(model, usage.input_tokens + cached + written, cached, written,
+                           usage.output_tokens, time.perf_counter() - started)
+        return response.content[0].text.strip()
+    
+    def _call_openai(self, system: str, user: str, max_tokens: int = 500, json_output: bool = False,
+                     model: str = None) -> str:
+        """One OpenAI chat request; returns the reply text and records usage"""
+        model = model or self.model
+        options = {'response_format': {"type": "json_object"}} if json_output else {}
+        started = time.perf_counter()
+        response = self.resilience.call(
+            "api.openai.com",
+            self.openai_client.chat.completions.create,
+            model=model,
+            # OpenAI caches identical prompt prefixes automatically
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.7,
+            **options
+        )
+        usage = response.usage
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached = getattr(details, 'cached_tokens', 0) or 0
+        self._record_usage(model, usage.prompt_tokens, cached, 0, usage.completion_tokens,
+                           time.perf_counter() - started)
+        return response.choices[0].message.content.strip()
+    
+    def stream_message(self, candidate, job_details, recruiter_name="Recruitment Team", use_anthropic=False,
+                       on_text: Callable[[str], None] = None,
+                       model: str = None) -> Tuple[Optional[str], str, Dict[str, float]]:
+        """
+        Generate a message through the provider's streaming API
+        
+        Args:
+            candidate: Candidate to write to
+            job_details: Job details
+            recruiter_name: Name of the recruiter
+            use_anthropic: Use Claude rather than OpenAI
+            on_text: Called with each piece of text as it arrives
+            model: Model to use instead of the provider's default
+            
+        Returns:
+            (message, source) as from generate_message, plus metrics with ttft_seconds,
+            tokens_per_second and output_tokens ({} if generation failed)
+        """
+        if use_anthropic and self.anthropic_client:
+            stream, source, host = self._stream_anthropic, "claude", "anthropic"
+        elif self.openai_client:
+            stream, source, host = self._stream_openai, "gpt-4", "openai"
+        else:
+            return None, "no_ai_available", {}
+        try:
+            prefix, suffix = self._build_prompt_parts(candidate, job_details, recruiter_name)
+            message, metrics = stream(prefix, suffix, on_text or (lambda text: None), model)
+            return message, source, metrics
+        except CircuitOpenError:
+            return None, f"{host}_circuit_open", {}
+        except Exception as e:
+            print(f"❌ Streaming error: {e}")
+            return None, f"{host}_error", {}
+    
+    def _stream_anthropic(self, system: str, user: str, on_text: Callable[[str], None],
+                          model: str = None) -> Tuple[str, Dict[str, float]]:
+        model = model or ANTHROPIC_MODEL
+        started = time.perf_counter()
+        # Retries cover opening the stream; text already shown is never repeated
+        events = self.resilience.call(
+            "api.anthropic.com",
+            self.anthropic_client.messages.create,
+            model=model,
+            max_tokens=500,
+            temperature=0.7,
+            system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+            messages=[{"role": "user", "content": user}],
+            stream=True
+        )
+        parts = []
+        first = None
+        input_tokens = cached = written = output_tokens = 0
+        for event in events:
+            if event.type == 'message_start':
+                usage = event.message.usage
+                input_tokens = usage.input_tokens
+                cached = getattr(usage, 'cache_read_input_tokens', 0) or 0
+                written = getattr(usage, 'cache_creation_input_tokens', 0) or 0
+            elif event.type == 'content_block_delta' and event.delta.type == 'text_delta':
+                if first is None:
+                    first = time.perf_counter()
+                parts.append(event.delta.text)
+                on_text(event.delta.text)
+            elif event.type == 'message_delta':
+                output_tokens = event.usage.output_tokens
+        finished = time.perf_counter()
+        self._record_usage(model, input_tokens + cached + written, cached, written, output_tokens,
+                           finished - started)
+        return ''.join(parts).strip(), self._stream_metrics(started, first, finished, output_tokens)
+    
+    def _stream_openai(self, system: str, user: str, on_text: Callable[[str], None],
+                       model: str = None) -> Tuple[str, Dict[str, float]]:
+        model = model or self.model
+        started = time.perf_counter()
+        chunks = self.resilience.call(
+            "api.openai.com",
+            self.openai_client.chat.completions.create,
+            model=model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user}
+            ],
+            max_tokens=500,
+            temperature=0.7,
+            stream=True,
+            # Usage arrives in a final chunk with no choices
+            stream_options={"include_usage": True}
+        )
+        parts = []
+        first = None
+        usage = None
+        for chunk in chunks:
+            if chunk.choices and chunk.choices[0].delta.content:
+                if first is None:
+                    first = time.perf_counter()
+                parts.append(chunk.choices[0].delta.content)
+                on_text(chunk.choices[0].delta.content)
+            if getattr(chunk, 'usage', None):
+                usage = chunk.usage
+        finished = time.perf_counter()
+        output_tokens = usage.completion_tokens if usage else 0
+        if usage:
+            details = getattr(usage, 'prompt_tokens_details', None)
+            cached = getattr(details, 'cached_tokens', 0) or 0
+            self._record_usage(model, usage.prompt_tokens, cached, 0, output_tokens, finished - started)
+        return ''.join(parts).strip(), self._stream_metrics(started, first, finished, output_tokens)
+    
+    def _stream_metrics(self, started: float, first: Optional[float], finished: float,
+                        output_tokens: int) -> Dict[str, float]:
+        """Time to first token, and output tokens per second from the first token on"""
+        if first is None:
+            return {'ttft_seconds': None, 'tokens_per_second': None, 'output_tokens': output_tokens}
+        generating = finished - first
+        return {
+            'ttft_seconds': round(first - started, 3),
+            'tokens_per_second': round(output_tokens / generating, 1) if generating > 0 else None,
+            'output_tokens': output_tokens
+        }
+    
+    def _generate_anthropic_message(self, candidate, job_details, recruiter_name, model=None, diversify_from=None):
+        """Generate message using Anthropic Claude"""
+        try:
+            prefix, suffix = self._build_prompt_parts(candidate, job_details, recruiter_name, diversify_from)
+            return self._call_anthropic(prefix, suffix, model=model), "claude"
             
+        except CircuitOpenError:
+            return None, "anthropic_circuit_open"
         except Exception as e:
             print(f"❌ Claude error: {e}")
             return None, "anthropic_error"
     
-    def _generate_openai_message(self, candidate, job_details, recruiter_name):
+    def _generate_openai_message(self, candidate, job_details, recruiter_name, model=None, diversify_from=None):
         """Generate message using OpenAI GPT"""
         try:
-            prompt = self._build_prompt(candidate, job_details, recruiter_name)
-            
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional recruiter. Write personalized, friendly outreach messages."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=500,
-                temperature=0.7
-            )
-            
-            message = response.choices[0].message.content.strip()
-            return message, "gpt-4"
+            prefix, suffix = self._build_prompt_parts(candidate, job_details, recruiter_name, diversify_from)
+            return self._call_openai(prefix, suffix, model=model), "gpt-4"
             
+        except CircuitOpenError:
+            return None, "openai_circuit_open"
         except Exception as e:
             print(f"❌ GPT-4 error: {e}")
             return None, "openai_error"
     
+    def _record_usage(self, model: str, input_tokens: int, cached: int, written: int, output_tokens: int,
+                      latency: float, discount: float = 1.0):
+        request = {
+            'requests': 1,
+            'input_tokens': input_tokens,
+            'cached_input_tokens': cached,
+            'cache_write_tokens': written,
+            'output_tokens': output_tokens,
+            'latency_seconds': latency,
+            'cost_usd': llm_cost(model, input_tokens, cached, written, output_tokens) * discount,
+            'by_model': {model: {}}
+        }
+        request['by_model'][model] = {field: request[field] for field in USAGE_FIELDS}
+        with self._usage_lock:
+            add_usage(self.usage, request)
+    
     def _build_prompt(self, candidate, job_details, recruiter_name):
-        """Build the prompt for AI message generation"""
+        """Build the prompt for AI message generation (job prefix followed by candidate suffix)"""
+        prefix, suffix = self._build_prompt_parts(candidate, job_details, recruiter_name)
+        return f"{prefix}\n\n{suffix}"
+    
+    def _build_prompt_parts(self, candidate, job_details, recruiter_name, diversify_from=None) -> Tuple[str, str]:
+        """
+        Prompt split into a prefix that is identical for every candidate of a job
+        (instructions, job, recruiter) and a short per-candidate suffix
+        
+        Providers only cache a shared prefix, and only past a minimum length
+        (1024 tokens for most models), so job-heavy prompts are what benefit.
+        diversify_from adds DIVERSIFY_INSTRUCTIONS to the suffix, leaving the prefix cacheable.
+        """
+        key = job_key(job_details, recruiter_name) + (tuple(job_details.get('requirements') or ()),)
+        if self._prefix is None or self._prefix[0] != key:
+            self._prefix = (key, self._build_job_prefix(job_details, recruiter_name))
         
         # Extract candidate information
         name = candidate.get('name', 'there')
@@ -96,6 +478,23 @@ class GPTOutreach:
         skills = candidate.get('skills', [])
         experience = candidate.get('experience', [])
         
+        # Build skills highlight
+        candidate_skills = ', '.join(skills[:3]) if skills else 'your technical background'
+        
+        suffix = f"""CANDIDATE INFO:
+- Name: {name}
+- Current Role: {headline}
+- Location: {location}
+- Skills: {candidate_skills}
+- Experience: {len(experience)} years
+
+Start with "Hi {name},"."""
+        if diversify_from:
+            suffix += "\n\n" + DIVERSIFY_INSTRUCTIONS.format(message=diversify_from)
+        
+        return self._prefix[1], suffix
+    
+    def _build_job_prefix(self, job_details, recruiter_name) -> str:
         # Extract job information
         job_title = job_details.get('title', 'this position')
         company = job_details.get('company', 'our company')
@@ -103,19 +502,11 @@ class GPTOutreach:
         job_skills = job_details.get('skills', [])
         requirements = job_details.get('requirements', [])
         
-        # Build skills highlight
-        candidate_skills = ', '.join(skills[:3]) if skills else 'your technical background'
         job_skills_text = ', '.join(job_skills[:3]) if job_skills else 'various technologies'
         
-        prompt = f"""
-Write a personalized LinkedIn outreach message for a recruitment campaign.
+        return f"""You are a professional recruiter. Write personalized, friendly outreach messages.
 
-CANDIDATE INFO:
-- Name: {name}
-- Current Role: {headline}
-- Location: {location}
-- Skills: {candidate_skills}
-- Experience: {len(experience)} years
+Write a personalized LinkedIn outreach message for a recruitment campaign. The candidate's details follow this brief.
 
 JOB OPPORTUNITY:
 - Position: {job_title}
@@ -134,27 +525,52 @@ Write a friendly, professional message that:
 5. Keeps it under 150 words
 6. Uses their name and sounds human
 
-Start with "Hi {name}," and end with "Best regards, {recruiter_name}"
-"""
-        
-        return prompt
+Start with "Hi <candidate name>," and end with "Best regards, {recruiter_name}\""""
 
-class GPT4OutreachGenerator:
+class GPT4OutreachGenerator(OutreachBackend):
     """Legacy class for backward compatibility"""
     
+    name = 'openai'
+    label = "🤖 Using OpenAI GPT-4 for outreach message generation"
+    
     def __init__(self, api_key: str = None, model: str = None):
         """Initialize GPT-4 outreach generator"""
+        super().__init__()
         self.api_key = api_key or Config.get_openai_key()
         self.model = model or "gpt-3.5-turbo"
-        if self.api_key:
-            self.client = openai.OpenAI(api_key=self.api_key)
-        else:
+        if not self.api_key:
             print("⚠️ Warning: No OpenAI API key provided. Using fallback templates.")
+        self._gpt_outreach = None
+    
+    @property
+    def gpt_outreach(self) -> GPTOutreach:
+        """One GPTOutreach for the generator's lifetime, so usage and the prompt prefix carry across calls"""
+        if self._gpt_outreach is None:
+            self._gpt_outreach = GPTOutreach(openai_key=self.api_key, model=self.model)
+        return self._gpt_outreach
+    
+    @property
+    def usage(self) -> Dict[str, float]:
+        return self.gpt_outreach.usage
+    
+    @property
+    def chunk_size(self) -> int:
+        return Config.LLM_BATCH_SIZE
+    
+    def _generate_chunk(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                        recruiter_name: str) -> List[Tuple[Optional[str], str]]:
+        return self.gpt_outreach.generate_messages(candidates, job_details, recruiter_name)
+    
+    def stream_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any],
+                       recruiter_name: str = "Recruitment Team", use_anthropic: bool = False,
+                       on_text: Callable[[str], None] = None,
+                       model: str = None) -> Tuple[Optional[str], str, Dict[str, float]]:
+        """Stream one message (see GPTOutreach.stream_message)"""
+        return self.gpt_outreach.stream_message(candidate, job_details, recruiter_name, use_anthropic, on_text, model)
     
     def generate_outreach_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team") -> str:
         """Legacy method - now uses the new GPTOutreach class"""
-        gpt_outreach = GPTOutreach()
-        message, source = gpt_outreach.generate_message(candidate, job_details, recruiter_name)
+        message, source = self.gpt_outreach.generate_message(candidate, job_details, recruiter_name)
         return message if message else self._fallback_message(candidate, job_details, recruiter_name)
     
     def _fallback_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any], recruiter_name: str) -> str:
@@ -176,28 +592,8 @@ Your background in {skills_highlight} aligns perfectly with what we're looking f
 Best regards,
 {recruiter_name}"""
     
-    def generate_bulk_outreach_messages(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team") -> List[Dict[str, Any]]:
-        """Generate outreach messages for multiple candidates"""
-        gpt_outreach = GPTOutreach()
-        results = []
-        
-        for i, candidate in enumerate(candidates, 1):
-            print(f"   Generating message {i}/{len(candidates)}: {candidate.get('name', 'Unknown')}")
-            
-            message, source = gpt_outreach.generate_message(candidate, job_details, recruiter_name)
-            
-            if not message:
-                message = self._fallback_message(candidate, job_details, recruiter_name)
-                source = "template"
-            
-            candidate['outreach_message'] = message
-            candidate['message_source'] = source
-            results.append(candidate)
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-        
-        return results
+register_backend('openai', GPT4OutreachGenerator)
+register_backend('anthropic', lambda: GPTOutreach(use_anthropic=True))
 
 # Example usage
 if __name__ == "__main__":
@@ -1,45 +1,93 @@
+import copy
 import json
 import time
 import uuid
-from typing import Dict, List, Any
+from itertools import chain
+from typing import Dict, Iterator, List, Any, Tuple
 from job_parser import LinkedInJobParser
 from linkedin_search import LinkedInProfileSearcher
-from scoring import CandidateScorer
+from scoring import CandidateScorer, weighted_fit_scores
 from outreach import OutreachGenerator
-from gpt_outreach import GPT4OutreachGenerator, GPTOutreach
+from gpt_outreach import GPTOutreach, add_usage, budget_spent, usage_since
 from enhanced_outreach import EnhancedOutreachGenerator
+from outreach_backend import create_backend
+from batch_outreach import BatchOutreach, read_batch_record
+from routing import OutreachRouter
+from near_duplicates import NearDuplicateDetector
+from enrichment import JsonlFileProvider
+from top_k import TopKAccumulator
+from records import EnrichedProfile, ProfileStub, ScoredCandidate
+from run_store import RunStore
+from candidate_index import CandidateIndex
 from config import Config
 
 class JobOrchestrator:
-    def __init__(self, use_gpt4: bool = True, use_enhanced: bool = False, use_anthropic: bool = False):
+    def __init__(self, use_gpt4: bool = True, use_enhanced: bool = False, use_anthropic: bool = False,
+                 profile_dumps: List[str] = None, use_index: bool = False, use_search: bool = True,
+                 batch_outreach: bool = False, stream: bool = False, llm_budget: Tuple[float, str] = None,
+                 route: bool = False, backend: str = None):
         self.job_parser = LinkedInJobParser()
         self.profile_searcher = LinkedInProfileSearcher()
+        if profile_dumps:
+            # Serve enrichment from local JSONL dumps instead of RapidAPI
+            self.profile_searcher.enrichment_provider = JsonlFileProvider(self.profile_searcher, profile_dumps)
         self.candidate_scorer = CandidateScorer()
-        self.use_gpt4 = use_gpt4
-        self.use_enhanced = use_enhanced
-        self.use_anthropic = use_anthropic
-        
-        # Choose outreach generator based on preference
-        if use_anthropic:
-            self.outreach_generator = GPTOutreach()
-            print("🤖 Using Anthropic Claude for outreach message generation")
-        elif use_gpt4:
-            self.outreach_generator = GPT4OutreachGenerator()
-            print("🤖 Using OpenAI GPT-4 for outreach message generation")
-        elif use_enhanced:
-            self.outreach_generator = EnhancedOutreachGenerator()
-            print("🎯 Using enhanced local templates for outreach message generation")
-        else:
-            self.outreach_generator = OutreachGenerator()
-            print("📝 Using basic template-based outreach message generation")
+        self.run_store = RunStore()
+        self.use_search = use_search
+        
+        # Profiles enriched in past runs (and any dumps) are a candidate source of their own
+        self.candidate_index = None
+        if use_index:
+            self.candidate_index = CandidateIndex(self.profile_searcher, self.candidate_scorer)
+            self.candidate_index.add_runs(self.run_store.root)
+            for path in profile_dumps or []:
+                self.candidate_index.add_dump(path)
+            print(f"📚 Candidate index: {len(self.candidate_index)} stored profiles")
+        
+        # Outreach backend from the registry (outreach_backend.OUTREACH_BACKENDS); the flags pick one by name
+        if backend is None:
+            backend = 'anthropic' if use_anthropic else 'openai' if use_gpt4 else 'enhanced' if use_enhanced \
+                else 'templates'
+        self.outreach_generator = create_backend(backend)
+        print(self.outreach_generator.label)
+        self.use_anthropic = self.outreach_generator.name == 'anthropic'
+        self.use_gpt4 = self.outreach_generator.name == 'openai'
+        self.use_enhanced = self.outreach_generator.name == 'enhanced'
+        # LLM provider for batch jobs and routing, from the backend rather than the flags
+        self._provider = 'anthropic' if self.use_anthropic else 'openai'
+        # Enhanced templates for budget fallbacks and near-duplicate rewrites, compiled once
+        self.template_generator = self.outreach_generator if self.use_enhanced else EnhancedOutreachGenerator()
+        
+        # Submit LLM outreach as a provider batch job, collected later by collect()
+        self.batch_outreach = None
+        if batch_outreach:
+            prompts = getattr(self.outreach_generator, 'gpt_outreach', self.outreach_generator)
+            self.batch_outreach = BatchOutreach(self._provider,
+                                                prompts=prompts if isinstance(prompts, GPTOutreach) else None)
+        
+        # Stream LLM messages as print_results shows each candidate (interactive runs)
+        self.stream = stream and not batch_outreach and hasattr(self.outreach_generator, 'stream_message')
+        self._pending_stream = None
+        
+        # (limit, 'tokens' | 'usd') per run; once spent, remaining messages use local templates
+        self.llm_budget = llm_budget
+        
+        # Templates, a small model or a premium model per candidate, by fit score and budget
+        self.router = None
+        if route:
+            prompts = getattr(self.outreach_generator, 'gpt_outreach', self.outreach_generator)
+            if isinstance(prompts, GPTOutreach):
+                self.router = OutreachRouter(prompts, self._provider, llm_budget, templates=self.template_generator)
     
-    def process_job_posting(self, job_url: str, max_candidates: int = 20) -> Dict[str, Any]:
+    def process_job_posting(self, job_url: str, max_candidates: int = 20, enrichment_budget: int = None) -> Dict[str, Any]:
         """
         Complete workflow: Parse job -> Search profiles -> Score candidates -> Generate outreach
         
         Args:
             job_url: LinkedIn job posting URL to analyze
             max_candidates: Maximum number of candidates to return
+            enrichment_budget: Profiles to enrich, chosen by snippet pre-score
+                (default: Config.ENRICHMENT_BUDGET, else max_candidates)
             
         Returns:
             Dictionary with job details and scored candidates in required format
@@ -64,11 +112,22 @@ class JobOrchestrator:
         print(f"Location: {job_details.get('location', 'N/A')}")
         print(f"Skills: {', '.join(job_details.get('skills', []))}")
         
-        # Step 2: Search for relevant profiles
+        # Step 2: Gather profiles from the candidate index and/or a fresh search
         print("\nStep 2: Searching for relevant LinkedIn profiles...")
-        profiles = self.profile_searcher.search_profiles_for_job(job_details, num_pages=2)
-        
-        if not profiles:
+        indexed_profiles = []
+        if self.candidate_index is not None:
+            indexed_profiles = self.candidate_index.query_for_job(job_details)
+            print(f"Index shortlisted {len(indexed_profiles)} stored profiles")
+        
+        profiles = []
+        if self.use_search:
+            profiles = [ProfileStub.from_dict(profile) for profile in
+                        self.profile_searcher.search_profiles_for_job(job_details, num_pages=2)]
+            # Indexed profiles are already enriched; don't fetch them again
+            known = {self.profile_searcher._canonical_username(p.get('profile_url', '')) for p in indexed_profiles}
+            profiles = [p for p in profiles if self.profile_searcher._canonical_username(p.get('url', '')) not in known]
+        
+        if not profiles and not indexed_profiles:
             return {
                 'error': 'No profiles found',
                 'job_details': job_details,
@@ -78,106 +137,539 @@ class JobOrchestrator:
         print(f"Found {len(profiles)} profiles")
         
         # Step 3: Enhance profile data with API
-        print("\nStep 3: Enhancing profile data with RapidAPI...")
-        enhanced_profiles = []
-        
-        for i, profile in enumerate(profiles[:max_candidates]):
-            print(f"Enhancing profile {i+1}/{min(len(profiles), max_candidates)}: {profile.get('name', 'Unknown')}")
-            
-            # Get enhanced profile data
-            enhanced_data = self.profile_searcher.get_enhanced_profile_data(
-                profile.get('url', ''), 
-                profile
-            )
-            
-            if enhanced_data:
-                enhanced_profiles.append(enhanced_data)
-            
-            # Rate limiting between API calls
-            time.sleep(1)
-        
-        # Step 4: Score candidates
+        selected = []
+        if profiles:
+            print(f"\nStep 3: Enhancing profile data via {self.profile_searcher.enrichment_provider.name}...")
+            budget = enrichment_budget or Config.ENRICHMENT_BUDGET or max_candidates
+            selected = self._select_for_enrichment(profiles, job_details, budget)
+        enhanced_profiles = chain(indexed_profiles, self._enrich_profiles(selected))
+        total = len(indexed_profiles) + len(selected)
+        
+        # Step 4: Score candidates, keeping only the top K in memory
         print("\nStep 4: Scoring candidates...")
-        scored_candidates = []
+        top_candidates = TopKAccumulator(k=Config.TOP_K_CANDIDATES, threshold=Config.MIN_FIT_SCORE)
+        job_context = self.candidate_scorer.compile_job(job_details)
+        run_id = self._generate_job_id(job_details)
+        recorder = self.run_store.start(run_id, job_details, job_url) if Config.SAVE_RUNS else None
         
         for i, profile in enumerate(enhanced_profiles):
-            print(f"Scoring candidate {i+1}/{len(enhanced_profiles)}: {profile.get('name', 'Unknown')}")
-            
-            # Calculate fit score
-            score_result = self.candidate_scorer.calculate_fit_score(profile, job_details)
-            
-            # Combine profile data with scoring results
-            scored_candidate = {
-                'name': profile.get('name', ''),
-                'linkedin_url': profile.get('profile_url', profile.get('url', '')),
-                'fit_score': score_result['fit_score'],
-                'score_breakdown': score_result['score_breakdown'],
-                'headline': profile.get('headline', ''),
-                'location': profile.get('location', ''),
-                'education': profile.get('education', []),
-                'experience': profile.get('experience', []),
-                'skills': profile.get('skills', []),
-                'processed_at': time.time()
-            }
+            print(f"Scoring candidate {i+1}/{total}: {profile.get('name', 'Unknown')}")
             
-            scored_candidates.append(scored_candidate)
-        
-        # Sort candidates by fit score
-        scored_candidates.sort(key=lambda x: x['fit_score'], reverse=True)
+            # Calculate fit score (numbers only; score cards are built for the shortlist below)
+            fit_score, breakdown = self.candidate_scorer.score(profile, job_context)
+            scored_candidate = self._build_scored_candidate(profile, fit_score, breakdown)
+            if recorder:
+                # Recorded in full before top-K selection, so rescore can promote it later
+                recorder.record(scored_candidate)
+            top_candidates.offer(scored_candidate)
+        
+        scored_candidates = top_candidates.results()
+        self._add_score_cards(scored_candidates, job_details, job_context)
+        self.candidate_scorer.feature_cache.save()
         
         # Step 5: Generate outreach messages (GPT-4, Claude, or templates)
         ai_type = "Claude" if self.use_anthropic else ("GPT-4" if self.use_gpt4 else "templates")
         print(f"\nStep 5: Generating outreach messages using {ai_type}...")
-        
-        if self.use_anthropic:
-            # Handle Anthropic Claude case
-            candidates_with_outreach = []
-            for i, candidate in enumerate(scored_candidates, 1):
-                print(f"   Generating message {i}/{len(scored_candidates)}: {candidate.get('name', 'Unknown')}")
-                
-                message, source = self.outreach_generator.generate_message(
-                    candidate, job_details, "Recruitment Team", use_anthropic=True
-                )
-                
-                if not message:
-                    # Fallback to template
-                    from outreach import OutreachGenerator
-                    template_gen = OutreachGenerator()
-                    message = template_gen.generate_outreach_message(candidate, job_details, "Recruitment Team")
-                    source = "template"
-                
-                candidate['outreach_message'] = message
-                candidate['message_source'] = source
-                candidates_with_outreach.append(candidate)
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
+        batch = None
+        if self.batch_outreach is not None and recorder:
+            batch = self._submit_outreach_batch(recorder, scored_candidates, job_details)
+        llm_usage = {}
+        duplicates = {}
+        if batch:
+            # Messages arrive with collect(); nothing more to spend now
+            candidates_with_outreach = scored_candidates
+        elif self.stream:
+            # Generated while print_results shows each candidate, or by finish_streaming()
+            candidates_with_outreach = scored_candidates
+            self._pending_stream = {'run_id': run_id, 'job_details': job_details, 'saved': recorder is not None,
+                                    'usage_before': self._llm_usage(), 'metrics': {}}
+            if self.router is not None:
+                self.router.start()
+            print("Messages will stream in as the results are printed")
         else:
-            # Handle OpenAI GPT-4 and templates
-            candidates_with_outreach = self.outreach_generator.generate_bulk_outreach_messages(
-                scored_candidates, 
-                job_details, 
-                "Recruitment Team"
-            )
+            usage_before = self._llm_usage()
+            candidates_with_outreach = self._generate_outreach(scored_candidates, job_details)
+            duplicates = self._diversify_outreach(candidates_with_outreach, job_details, usage_before)
+            llm_usage = self._usage_since(usage_before)
+        if recorder:
+            if llm_usage:
+                recorder.meta['llm_usage'] = llm_usage
+            if duplicates:
+                recorder.meta['outreach_duplicates'] = duplicates
+            recorder.finish(candidates_with_outreach)
         
         # Step 6: Format final output
         print("\nStep 6: Formatting final output...")
-        final_output = self._format_final_output(job_details, candidates_with_outreach)
+        final_output = self._format_final_output(job_details, candidates_with_outreach, top_candidates.seen, run_id)
+        self._add_usage_figures(final_output, llm_usage, job_url if recorder else None)
+        if duplicates:
+            final_output['outreach_duplicates'] = duplicates
+        if batch:
+            final_output['outreach_batch'] = self._batch_summary(batch)
         
         return final_output
     
-    def _format_final_output(self, job_details: Dict[str, Any], candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def finish_streaming(self, results: Dict[str, Any]):
+        """
+        Generate the messages streaming mode deferred and store them with the run
+        
+        print_results streams the candidates it shows and calls this for the rest, so
+        results (and any export of them) end up with every message, plus per-message
+        time to first token and tokens per second under stream_metrics.
+        
+        Args:
+            results: Output of process_job_posting, updated in place
+        """
+        pending = self._pending_stream
+        if not pending or results.get('job_id') != pending['run_id']:
+            return
+        for candidate in results.get('top_candidates', []):
+            if 'outreach_message' not in candidate:
+                self._stream_outreach(candidate)
+        self._pending_stream = None
+        # Messages already printed may still be rewritten here; the stored and exported ones are final
+        duplicates = self._diversify_outreach(results.get('top_candidates', []), pending['job_details'],
+                                              pending['usage_before'])
+        if duplicates:
+            results['outreach_duplicates'] = duplicates
+        
+        metrics = pending['metrics']
+        if metrics:
+            results['stream_metrics'] = metrics
+            ttfts = [m['ttft_seconds'] for m in metrics.values() if m['ttft_seconds'] is not None]
+            rates = [m['tokens_per_second'] for m in metrics.values() if m['tokens_per_second'] is not None]
+            if ttfts and rates:
+                print(f"Streamed {len(metrics)} messages: {sum(ttfts) / len(ttfts):.2f}s average time to first "
+                      f"token, {sum(rates) / len(rates):.0f} tokens/sec")
+        llm_usage = self._usage_since(pending['usage_before'])
+        
+        if pending['saved']:
+            meta = self.run_store.load_meta(pending['run_id'])
+            for candidate in results['top_candidates']:
+                meta['outreach'][candidate['linkedin_url']] = {
+                    'outreach_message': candidate['outreach_message'],
+                    'message_source': candidate['message_source']
+                }
+            if llm_usage:
+                self._accumulate_usage(meta, llm_usage)
+            if metrics:
+                meta['stream_metrics'] = metrics
+            if duplicates:
+                meta['outreach_duplicates'] = duplicates
+            self.run_store.save_meta(meta)
+        self._add_usage_figures(results, llm_usage, meta['job_url'] if pending['saved'] else None)
+    
+    def _stream_outreach(self, candidate: Dict[str, Any], render: bool = False):
+        """Stream one deferred message into an output candidate, echoing it as it arrives if render"""
+        pending = self._pending_stream
+        
+        def show(text):
+            print(text.replace('\n', '\n      '), end='', flush=True)
+        
+        if self.router is not None:
+            message, source, metrics = self.router.route_stream(candidate, pending['job_details'], "Recruitment Team",
+                                                                on_text=show if render else None)
+        elif self.llm_budget and budget_spent(usage_since(self._llm_usage(), pending['usage_before']), self.llm_budget):
+            self.template_generator.generate_many([candidate], pending['job_details'], "Recruitment Team")
+            if render:
+                show(candidate['outreach_message'] + '\n')
+            return
+        else:
+            message, source, metrics = self.outreach_generator.stream_message(
+                candidate, pending['job_details'], "Recruitment Team", use_anthropic=self.use_anthropic,
+                on_text=show if render else None
+            )
+        if not message:
+            # Fallback to template
+            message = OutreachGenerator().generate_outreach_message(candidate, pending['job_details'], "Recruitment Team")
+            source = "template"
+            if render:
+                show(message)
+        if render:
+            print()
+        candidate['outreach_message'] = message
+        candidate['message_source'] = source
+        if metrics:
+            pending['metrics'][candidate['linkedin_url']] = metrics
+    
+    def _submit_outreach_batch(self, recorder, candidates: List[ScoredCandidate],
+                               job_details: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit outreach as a provider batch stored with the run; None (generate now) if that fails"""
+        try:
+            batch = self.batch_outreach.submit(recorder.run_dir, candidates, job_details, "Recruitment Team")
+        except Exception as e:
+            print(f"⚠️ Batch submission failed ({e}); generating messages now instead")
+            return None
+        recorder.meta['outreach_batch'] = self._batch_summary(batch)
+        print(f"Collect the messages later with: python main.py --collect {recorder.run_id}")
+        return batch
+    
+    def _batch_summary(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        return {'provider': batch['provider'], 'batch_id': batch['batch_id'], 'status': batch['status'],
+                'requests': len(batch['custom_ids'])}
+    
+    def collect(self, run_id: str) -> Dict[str, Any]:
+        """
+        Merge the results of a run's outreach batch (see batch_outreach) into the run
+        
+        Candidates whose batch request failed get a template message instead. While the
+        batch is still running nothing is merged and outreach_batch['status'] says so.
+        
+        Args:
+            run_id: Run whose batch to collect (the job_id of a previous run)
+            
+        Returns:
+            Dictionary in the same format as process_job_posting, plus outreach_batch
+        """
+        if not self.run_store.exists(run_id):
+            return {'error': f'Run not found: {run_id}'}
+        run_dir = self.run_store.run_dir(run_id)
+        batch = read_batch_record(run_dir)
+        if not batch:
+            return {'error': f'Run {run_id} has no outreach batch'}
+        
+        meta, candidates = self.run_store.load(run_id)
+        by_url = {candidate.linkedin_url: candidate for candidate in candidates}
+        ranked = [by_url[url] for url in meta['ranking'] if url in by_url]
+        usage_before = {}
+        backend = None
+        if batch.get('collected_at'):
+            # Merged already; just report the run as it stands
+            print(f"Batch {batch['batch_id']} was already collected")
+            summary, messages = meta['outreach_batch'], {}
+        else:
+            backend = self.batch_outreach
+            if backend is None or backend.provider != batch['provider']:
+                backend = BatchOutreach(batch['provider'])
+            usage_before = self._llm_usage(backend)
+            status, messages = backend.collect(run_dir)
+            summary = self._batch_summary(read_batch_record(run_dir))
+            if not messages:
+                print(f"Batch {batch['batch_id']} is {status}; try again later")
+        if messages:
+            failed = [by_url[url] for url, (message, _) in messages.items() if not message and url in by_url]
+            for url, (message, source) in messages.items():
+                if message:
+                    meta['outreach'][url] = {'outreach_message': message, 'message_source': source}
+            if failed:
+                print(f"{len(failed)} batch request(s) failed; using templates for them")
+                for candidate in OutreachGenerator().generate_many(failed, meta['job_details'], "Recruitment Team"):
+                    meta['outreach'][candidate.linkedin_url] = {
+                        'outreach_message': candidate.outreach_message,
+                        'message_source': 'template'
+                    }
+            summary['collected'] = len(messages) - len(failed)
+            summary['failed'] = len(failed)
+            print(f"Collected {summary['collected']}/{len(messages)} messages from batch {batch['batch_id']}")
+        
+        llm_usage = self._usage_since(usage_before, backend) if backend else {}
+        if llm_usage:
+            self._accumulate_usage(meta, llm_usage)
+        meta['outreach_batch'] = summary
+        self.run_store.save_meta(meta)
+        
+        self._add_score_cards(ranked, meta['job_details'])
+        for candidate in ranked:
+            self._apply_stored_outreach(candidate, meta['outreach'])
+        output = self._format_final_output(meta['job_details'], ranked, len(candidates), run_id)
+        output['outreach_batch'] = summary
+        self._add_usage_figures(output, llm_usage, meta['job_url'])
+        return output
+    
+    def _llm_usage(self, generator=None) -> Dict[str, Any]:
+        """Copy of the outreach generator's LLM usage counters (empty for template generators)"""
+        return copy.deepcopy(getattr(generator or self.outreach_generator, 'usage', None) or {})
+    
+    def _usage_since(self, before: Dict[str, Any], generator=None) -> Dict[str, Any]:
+        """LLM usage since a _llm_usage() snapshot, or {} if no requests were made"""
+        usage = usage_since(self._llm_usage(generator), before)
+        if not usage.get('requests'):
+            return {}
+        print(f"LLM usage: {usage['requests']} request(s), {usage['cached_input_tokens']}/{usage['input_tokens']} "
+              f"input tokens read from cache, {usage['output_tokens']} output tokens, ${usage['cost_usd']:.4f}")
+        return usage
+    
+    def _add_usage_figures(self, output: Dict[str, Any], llm_usage: Dict[str, Any], job_url: str = None):
+        """Put a run's LLM usage, its budget and (for stored runs) the job's usage over all runs in the output"""
+        if llm_usage:
+            output['llm_usage'] = llm_usage
+        if self.llm_budget and self._uses_llm():
+            limit, unit = self.llm_budget
+            output['llm_budget'] = {
+                'limit': limit,
+                'unit': unit,
+                'spent': llm_usage.get('cost_usd', 0) if unit == 'usd'
+                else llm_usage.get('input_tokens', 0) + llm_usage.get('output_tokens', 0),
+                'template_messages': sum(1 for candidate in output['top_candidates']
+                                         if (candidate.get('message_source') or '').endswith('enhanced_local'))
+            }
+        if llm_usage and job_url:
+            output['job_llm_usage'] = self.run_store.job_usage(job_url)
+    
+    def _uses_llm(self) -> bool:
+        return hasattr(self.outreach_generator, 'usage')
+    
+    def _generate_outreach(self, scored_candidates: List[Dict[str, Any]], job_details: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate outreach messages with the configured generator, within the LLM budget if one is set"""
+        if self.router is not None:
+            # The router spends the budget itself, best candidates first
+            self.router.start()
+            return self.router.generate_bulk_outreach_messages(scored_candidates, job_details, "Recruitment Team")
+        if not self.llm_budget or not self._uses_llm():
+            return self._generate_with_generator(scored_candidates, job_details)
+        
+        usage_before = self._llm_usage()
+        candidates_with_outreach = []
+        remaining = list(scored_candidates)
+        # Checked between requests, so a run overshoots by at most one request
+        while remaining and not budget_spent(usage_since(self._llm_usage(), usage_before), self.llm_budget):
+            chunk, remaining = remaining[:Config.LLM_BATCH_SIZE], remaining[Config.LLM_BATCH_SIZE:]
+            candidates_with_outreach.extend(self._generate_with_generator(chunk, job_details))
+        if remaining:
+            limit, unit = self.llm_budget
+            print(f"💸 LLM budget of {f'${limit:.2f}' if unit == 'usd' else f'{limit:.0f} tokens'} spent; "
+                  f"using local templates for the remaining {len(remaining)} candidate(s)")
+            candidates_with_outreach.extend(self.template_generator.generate_many(
+                remaining, job_details, "Recruitment Team"))
+        return candidates_with_outreach
+    
+    def _diversify_outreach(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                            usage_before: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Find near-duplicate messages and regenerate only those, once
+        
+        Every message after the first of a near-duplicate group (NearDuplicateDetector) is
+        written again by the backend that wrote it: LLM messages with a prompt quoting the
+        message they repeat (within the LLM budget), enhanced template messages with another
+        template variation. A rewrite is only kept if it repeats none of the other messages,
+        rewrites included; otherwise the original stays. Basic template messages have one
+        wording per seniority level, so runs on the 'templates' backend are not checked and
+        their fallback messages in other runs are left as they are.
+        
+        Args:
+            candidates: Candidates with outreach, best first (updated in place)
+            job_details: Job details
+            usage_before: _llm_usage() snapshot from the start of the run, for the budget
+            
+        Returns:
+            messages, near_duplicates, duplicate_rate (before regeneration), regenerated and
+            remaining near-duplicates; {} when detection is off or there is nothing to compare
+        """
+        if Config.DEDUP_THRESHOLD > 1 or len(candidates) < 2 or self.outreach_generator.name == 'templates':
+            return {}
+        detector = NearDuplicateDetector()
+        texts = [candidate.get('outreach_message') or '' for candidate in candidates]
+        signatures = [detector.signature(text) for text in texts]
+        duplicates = detector.duplicates(texts)
+        summary = {
+            'messages': len(texts),
+            'near_duplicates': len(duplicates),
+            'duplicate_rate': round(len(duplicates) / len(texts), 4),
+            'regenerated': 0,
+            'remaining': 0
+        }
+        if not duplicates:
+            return summary
+        
+        prompts = getattr(self.outreach_generator, 'gpt_outreach', self.outreach_generator)
+        variations = None
+        for index, original in sorted(duplicates.items()):
+            candidate = candidates[index]
+            tier, _, producer = (candidate.get('message_source') or '').rpartition('/')
+            others = signatures[:index] + signatures[index + 1:]
+            message = None
+            if producer == 'enhanced_local':
+                # Other template variations come from the same templates bound with other seeds
+                variations = variations or [
+                    self.template_generator.bind_job(job_details, "Recruitment Team", seed=Config.OUTREACH_SEED + offset)
+                    for offset in range(1, 4)]
+                message = self._template_variation(candidate, job_details, others, detector, variations)
+            elif producer not in ('template', '') and isinstance(prompts, GPTOutreach) and not (
+                    self.llm_budget and budget_spent(usage_since(self._llm_usage(), usage_before), self.llm_budget)):
+                # Routed sources name the model ("premium/gpt-4o"); others use the provider's default
+                message, _ = prompts.generate_message(candidate, job_details, "Recruitment Team", self.use_anthropic,
+                                                      model=producer if tier else None,
+                                                      diversify_from=texts[original])
+                if message and detector.repeats(detector.signature(message), others):
+                    message = None
+            if message:
+                candidate['outreach_message'] = texts[index] = message
+                signatures[index] = detector.signature(message)
+                summary['regenerated'] += 1
+        
+        summary['remaining'] = len(detector.duplicates(texts))
+        print(f"   Near-duplicate messages: {summary['near_duplicates']}/{summary['messages']} "
+              f"({summary['duplicate_rate']:.0%}); regenerated {summary['regenerated']}, "
+              f"{summary['remaining']} remain")
+        return summary
+    
+    def _template_variation(self, candidate: Dict[str, Any], job_details: Dict[str, Any], others: List[tuple],
+                            detector: NearDuplicateDetector, variations: List[Dict[str, Any]]) -> str:
+        """An enhanced template message for candidate repeating none of others (signatures), or None if none is"""
+        for job in variations:
+            message = self.template_generator.generate_outreach_message(candidate, job_details, "Recruitment Team", job)
+            if not detector.repeats(detector.signature(message), others):
+                return message
+        return None
+    
+    def _generate_with_generator(self, scored_candidates: List[Dict[str, Any]], job_details: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate outreach messages with the configured backend"""
+        return self.outreach_generator.generate_many(scored_candidates, job_details, "Recruitment Team")
+    
+    def rescore(self, run_id: str, weights: Dict[str, float] = None) -> Dict[str, Any]:
+        """
+        Re-rank a stored run with new scoring weights, without searching or enriching again
+        
+        Fit scores are recomputed from the stored sub-scores of every candidate in the run,
+        and outreach is only generated for candidates who newly entered the top K.
+        
+        Args:
+            run_id: Run to rescore (the job_id of a previous run)
+            weights: Scoring weights to apply (default: Config.SCORING_WEIGHTS); missing
+                categories keep the run's original weight
+            
+        Returns:
+            Dictionary in the same format as process_job_posting
+        """
+        if not self.run_store.exists(run_id):
+            return {'error': f'Run not found: {run_id}'}
+        
+        meta, candidates = self.run_store.load(run_id)
+        weights = {**meta['weights'], **(weights or Config.SCORING_WEIGHTS)}
+        unknown = set(weights) - set(meta['weights'])
+        if unknown:
+            return {'error': f"Unknown scoring categories: {', '.join(sorted(unknown))}"}
+        if abs(sum(weights.values()) - 1.0) > 1e-6:
+            print(f"⚠️ Scoring weights sum to {sum(weights.values()):.2f}, not 1.0")
+        
+        print(f"Rescoring {len(candidates)} candidates from run {run_id}...")
+        totals = weighted_fit_scores([candidate['score_breakdown'] for candidate in candidates], weights)
+        
+        top_candidates = TopKAccumulator(k=Config.TOP_K_CANDIDATES, threshold=Config.MIN_FIT_SCORE)
+        for candidate, total in zip(candidates, totals):
+            candidate.fit_score = round(total, 2)
+            top_candidates.offer(candidate, score=total)
+        ranked = top_candidates.results()
+        
+        # Reuse messages for anyone already shortlisted; generate only for new entrants
+        previous = set(meta['ranking'])
+        new_entrants = [candidate for candidate in ranked if candidate.linkedin_url not in meta['outreach']]
+        self._add_score_cards(ranked, meta['job_details'])
+        for candidate in ranked:
+            self._apply_stored_outreach(candidate, meta['outreach'])
+        
+        entered = sum(1 for candidate in ranked if candidate.linkedin_url not in previous)
+        print(f"{entered} candidate(s) entered the top {len(ranked)}; generating {len(new_entrants)} new message(s)")
+        llm_usage = {}
+        if new_entrants:
+            usage_before = self._llm_usage()
+            for candidate in self._generate_outreach(new_entrants, meta['job_details']):
+                if 'outreach_message' in candidate:
+                    meta['outreach'][candidate['linkedin_url']] = {
+                        'outreach_message': candidate['outreach_message'],
+                        'message_source': candidate.get('message_source', '')
+                    }
+            for candidate in new_entrants:
+                self._apply_stored_outreach(candidate, meta['outreach'])
+            llm_usage = self._usage_since(usage_before)
+            if llm_usage:
+                self._accumulate_usage(meta, llm_usage)
+        
+        meta['weights'] = weights
+        meta['ranking'] = [candidate.linkedin_url for candidate in ranked]
+        self.run_store.save_meta(meta)
+        
+        output = self._format_final_output(meta['job_details'], ranked, len(candidates), run_id)
+        output['rescored'] = {'weights': weights, 'entered_top_k': entered, 'messages_generated': len(new_entrants)}
+        self._add_usage_figures(output, llm_usage, meta['job_url'])
+        return output
+    
+    def _accumulate_usage(self, meta: Dict[str, Any], llm_usage: Dict[str, Any]):
+        """Add usage to the run's total, so the run records everything spent on it"""
+        add_usage(meta.setdefault('llm_usage', {}), llm_usage)
+    
+    def _add_score_cards(self, candidates: List[ScoredCandidate], job_details: Dict[str, Any], job_context=None):
+        """Grade, recommendation and explanation for shortlisted candidates only"""
+        job_context = job_context or self.candidate_scorer.compile_job(job_details)
+        for candidate in candidates:
+            card = self.candidate_scorer.explain(candidate, job_details, job_context)
+            candidate.overall_grade = card['overall_grade']
+            candidate.recommendation = card['recommendation']
+            candidate.explanation = card['explanation']
+    
+    def _apply_stored_outreach(self, candidate: ScoredCandidate, outreach: Dict[str, Dict[str, str]]):
+        stored = outreach.get(candidate.linkedin_url)
+        if stored:
+            candidate.outreach_message = stored['outreach_message']
+            candidate.message_source = stored.get('message_source', '')
+    
+    def _select_for_enrichment(self, profiles: List[ProfileStub], job_details: Dict[str, Any], budget: int) -> List[ProfileStub]:
+        """Pre-score search results from their snippets and keep the top `budget` for enrichment"""
+        job_context = self.candidate_scorer.compile_job(job_details)
+        for profile in profiles:
+            profile['estimated_score'] = self.candidate_scorer.estimate_fit_score(profile, job_details, job_context)
+        
+        # Stable sort keeps search relevance order among equal estimates
+        ranked = sorted(profiles, key=lambda x: x['estimated_score'], reverse=True)
+        selected = ranked[:budget]
+        
+        if len(profiles) > budget:
+            print(f"Pre-scored {len(profiles)} profiles; enriching top {len(selected)} "
+                  f"(estimated {selected[-1]['estimated_score']:.2f}-{selected[0]['estimated_score']:.2f})")
+        
+        return selected
+    
+    def _enrich_profiles(self, profiles: List[ProfileStub]) -> Iterator[EnrichedProfile]:
+        """Fetch detailed data in chunks through the enrichment provider, falling back to search data
+        
+        Profiles are yielded chunk by chunk so scoring can start before enrichment finishes
+        and rejected profiles can be freed straight away.
+        """
+        searcher = self.profile_searcher
+        chunk_size = Config.ENRICHMENT_CHUNK_SIZE
+        flight_stats = dict(searcher.profile_flights.stats)
+        found = 0
+        
+        for start in range(0, len(profiles), chunk_size):
+            chunk = profiles[start:start + chunk_size]
+            print(f"Enhancing profiles {start + 1}-{start + len(chunk)}/{len(profiles)}")
+            
+            usernames = [searcher._canonical_username(profile.get('url', '')) for profile in chunk]
+            fetched = searcher.fetch_many([username for username in usernames if username])
+            
+            for profile, username in zip(chunk, usernames):
+                enhanced_data = fetched.get(username) if username else None
+                if enhanced_data:
+                    found += 1
+                else:
+                    enhanced_data = searcher._basic_profile_data(profile.get('url', ''), profile)
+                yield EnrichedProfile.from_dict(enhanced_data)
+        
+        flights = searcher.profile_flights.stats
+        print(f"Enriched {found}/{len(profiles)} profiles; "
+              f"{flights['coalesced'] - flight_stats['coalesced']} duplicate lookups coalesced")
+    
+    def _build_scored_candidate(self, profile: EnrichedProfile, fit_score: float,
+                                score_breakdown: Dict[str, float]) -> ScoredCandidate:
+        """Combine profile data with scoring results (the profile is shared, not copied)"""
+        if isinstance(profile, dict):
+            profile = EnrichedProfile.from_dict(profile)
+        return ScoredCandidate(profile, fit_score, score_breakdown)
+    
+    def _format_final_output(self, job_details: Dict[str, Any], candidates: List[Dict[str, Any]],
+                             candidates_found: int = None, job_id: str = None) -> Dict[str, Any]:
         """Format the final output according to the required structure"""
         
-        # Generate job ID
-        job_id = self._generate_job_id(job_details)
+        # Generate job ID (runs are stored under it, so it doubles as the run id)
+        job_id = job_id or self._generate_job_id(job_details)
         
-        # Get top candidates (top 10)
-        top_candidates = candidates[:10]
+        # Get top candidates
+        top_candidates = [candidate if isinstance(candidate, dict) else candidate.to_dict()
+                          for candidate in candidates[:Config.TOP_K_CANDIDATES]]
         
         return {
             'job_id': job_id,
-            'candidates_found': len(candidates),
+            'candidates_found': len(candidates) if candidates_found is None else candidates_found,
             'job_details': {
                 'title': job_details.get('title', ''),
                 'company': job_details.get('company', ''),
@@ -198,10 +690,10 @@ class JobOrchestrator:
         # Clean up the ID
         job_id = f"{title}-{company}-{location}".replace('--', '-').strip('-')
         
-        # Add timestamp for uniqueness
+        # Add timestamp and a random suffix for uniqueness (the same job can run twice a second)
         timestamp = int(time.time())
         
-        return f"{job_id}-{timestamp}"
+        return f"{job_id}-{timestamp}-{uuid.uuid4().hex[:8]}"
     
     def _run_demo_mode(self, max_candidates: int) -> Dict[str, Any]:
         """Run the system with demo data"""
@@ -295,37 +787,27 @@ class JobOrchestrator:
         ]
         
         # Score the demo candidates
-        scored_candidates = []
+        top_candidates = TopKAccumulator(k=Config.TOP_K_CANDIDATES, threshold=Config.MIN_FIT_SCORE)
+        job_context = self.candidate_scorer.compile_job(demo_job)
+        run_id = self._generate_job_id(demo_job)
+        recorder = self.run_store.start(run_id, demo_job, demo_job['job_url']) if Config.SAVE_RUNS else None
         for profile in demo_profiles[:max_candidates]:
-            score_result = self.candidate_scorer.calculate_fit_score(profile, demo_job)
-            
-            scored_candidate = {
-                'name': profile.get('name', ''),
-                'linkedin_url': profile.get('profile_url', ''),
-                'fit_score': score_result['fit_score'],
-                'score_breakdown': score_result['score_breakdown'],
-                'headline': profile.get('headline', ''),
-                'location': profile.get('location', ''),
-                'education': profile.get('education', []),
-                'experience': profile.get('experience', []),
-                'skills': profile.get('skills', []),
-                'processed_at': time.time()
-            }
-            
-            scored_candidates.append(scored_candidate)
+            fit_score, breakdown = self.candidate_scorer.score(profile, job_context)
+            scored_candidate = self._build_scored_candidate(profile, fit_score, breakdown)
+            if recorder:
+                recorder.record(scored_candidate)
+            top_candidates.offer(scored_candidate)
         
-        # Sort by score
-        scored_candidates.sort(key=lambda x: x['fit_score'], reverse=True)
+        scored_candidates = top_candidates.results()
+        self._add_score_cards(scored_candidates, demo_job, job_context)
         
         # Generate outreach messages
-        candidates_with_outreach = self.outreach_generator.generate_bulk_outreach_messages(
-            scored_candidates, 
-            demo_job, 
-            "Recruitment Team"
-        )
+        candidates_with_outreach = self.outreach_generator.generate_many(scored_candidates, demo_job, "Recruitment Team")
+        if recorder:
+            recorder.finish(candidates_with_outreach)
         
         # Format final output
-        return self._format_final_output(demo_job, candidates_with_outreach)
+        return self._format_final_output(demo_job, candidates_with_outreach, top_candidates.seen, run_id)
     
     def export_results(self, results: Dict[str, Any], filename: str = None) -> str:
         """Export results to JSON file"""
@@ -359,6 +841,34 @@ class JobOrchestrator:
         print(f"Skills: {', '.join(job_details.get('skills', []))}")
         
         print(f"\nTotal Candidates Found: {results.get('candidates_found', 0)}")
+        if 'rescored' in results:
+            rescored = results['rescored']
+            print(f"Rescored with weights: {', '.join(f'{k}={v:.2f}' for k, v in rescored['weights'].items())}")
+            print(f"New in top candidates: {rescored['entered_top_k']} | Messages generated: {rescored['messages_generated']}")
+        if 'outreach_batch' in results:
+            batch = results['outreach_batch']
+            print(f"Outreach batch: {batch['batch_id']} ({batch['provider']}, {batch['status']}, "
+                  f"{batch['requests']} requests)")
+        if 'llm_usage' in results:
+            usage = results['llm_usage']
+            print(f"LLM requests: {usage['requests']} | Input tokens: {usage['input_tokens']} "
+                  f"({usage['cached_input_tokens']} cached) | Output tokens: {usage['output_tokens']} "
+                  f"| Cost: ${usage['cost_usd']:.4f}")
+            for model, counters in usage.get('by_model', {}).items():
+                print(f"   {model}: {counters['requests']} request(s), ${counters['cost_usd']:.4f}")
+        if 'job_llm_usage' in results:
+            print(f"LLM cost for this job so far: ${results['job_llm_usage']['cost_usd']:.4f} "
+                  f"over {results['job_llm_usage']['runs']} run(s)")
+        if 'outreach_duplicates' in results:
+            duplicates = results['outreach_duplicates']
+            print(f"Near-duplicate messages: {duplicates['near_duplicates']}/{duplicates['messages']} "
+                  f"({duplicates['duplicate_rate']:.0%}) | Regenerated: {duplicates['regenerated']} "
+                  f"| Remaining: {duplicates['remaining']}")
+        if 'llm_budget' in results:
+            budget = results['llm_budget']
+            spent = f"${budget['spent']:.4f} of ${budget['limit']:.2f}" if budget['unit'] == 'usd' \
+                else f"{budget['spent']} of {budget['limit']:.0f} tokens"
+            print(f"LLM budget: {spent} spent; {budget['template_messages']} message(s) from local templates")
         
         print("\n🏆 TOP CANDIDATES:")
         print("-" * 80)
@@ -367,7 +877,10 @@ class JobOrchestrator:
             print(f"\n{i+1}. {candidate['name']}")
             print(f"   📝 Headline: {candidate['headline']}")
             print(f"   📍 Location: {candidate.get('location', 'N/A')}")
-            print(f"   ⭐ Fit Score: {candidate['fit_score']:.2f}/10")
+            print(f"   ⭐ Fit Score: {candidate['fit_score']:.2f}/10", end='')
+            if candidate.get('overall_grade'):
+                print(f" ({candidate['overall_grade']}, {candidate['recommendation']})", end='')
+            print()
             print(f"   🔗 LinkedIn: {candidate['linkedin_url']}")
             
             # Show score breakdown
@@ -380,11 +893,22 @@ class JobOrchestrator:
             print(f"      Location: {breakdown.get('location', 0):.1f}/10")
             print(f"      Tenure: {breakdown.get('tenure', 0):.1f}/10")
             
-            # Show outreach message preview
-            if 'outreach_message' in candidate:
+            explanation = candidate.get('explanation')
+            if explanation:
+                print(f"   ✅ Matched skills: {', '.join(explanation['matched_skills']) or 'none'}")
+                if explanation['missing_skills']:
+                    print(f"   ❔ Missing skills: {', '.join(explanation['missing_skills'])}")
+                print(f"   📍 Location match: {explanation['location']}")
+            
+            # Show outreach message preview (or the whole message, as it streams in)
+            if self._pending_stream and 'outreach_message' not in candidate:
+                print(f"   💬 Outreach:\n      ", end='', flush=True)
+                self._stream_outreach(candidate, render=True)
+            elif 'outreach_message' in candidate:
                 message_preview = candidate['outreach_message'][:100] + "..." if len(candidate['outreach_message']) > 100 else candidate['outreach_message']
                 print(f"   💬 Outreach: {message_preview}")
         
+        self.finish_streaming(results)
         print("\n" + "="*80)
 
 # Example usage
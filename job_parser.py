@@ -1,8 +1,8 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import json
 from urllib.parse import urlparse, parse_qs
+from resilience import CircuitOpenError, default_layer
 
 class LinkedInJobParser:
     def __init__(self):
@@ -41,7 +41,7 @@ class LinkedInJobParser:
             # LinkedIn job API endpoint (this is a simplified approach)
             api_url = f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
             
-            response = requests.get(api_url, headers=self.headers)
+            response = default_layer.request("GET", api_url, headers=self.headers, timeout=10)
             if response.status_code != 200:
                 print(f"Failed to fetch job details: {response.status_code}")
                 return None
@@ -65,6 +65,9 @@ class LinkedInJobParser:
             
             return job_data
             
+        except CircuitOpenError:
+            print("Failed to fetch job details: LinkedIn is failing, skipping request")
+            return None
         except Exception as e:
             print(f"Error getting job details: {e}")
             return None
@@ -1,14 +1,19 @@
-import requests
 from bs4 import BeautifulSoup
-import re
 import time
 import json
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, unquote
 from job_parser import LinkedInJobParser
+from snippet_parser import SnippetParser
+from resilience import CircuitOpenError, default_layer
+from single_flight import SingleFlight
+from enrichment import EnrichmentProvider, RapidAPIProvider
 from config import Config
 
+# Shared across searchers so concurrent jobs/workers coalesce lookups of the same person
+profile_flights = SingleFlight()
+
 class LinkedInProfileSearcher:
-    def __init__(self):
+    def __init__(self, enrichment_provider: EnrichmentProvider = None):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
@@ -17,6 +22,10 @@ class LinkedInProfileSearcher:
             "X-RapidAPI-Host": Config.get_rapidapi_host()
         }
         self.job_parser = LinkedInJobParser()
+        self.snippet_parser = SnippetParser()
+        self.resilience = default_layer
+        self.profile_flights = profile_flights
+        self.enrichment_provider = enrichment_provider or RapidAPIProvider(self)
     
     def search_profiles_for_job(self, job_details, num_pages=3, delay=2):
         """
@@ -31,6 +40,10 @@ class LinkedInProfileSearcher:
         
         # Search using different methods
         for query_info in search_queries:
+            if self.resilience.is_open("www.google.com"):
+                print("⚠️ Google search is failing, skipping remaining queries")
+                break
+            
             print(f"Searching with query: {query_info['query']}")
             
             # Google search
@@ -72,7 +85,7 @@ class LinkedInProfileSearcher:
             
             querystring = {"linkedin_url": profile_url}
             
-            response = requests.get(url, headers=self.rapidapi_headers, params=querystring, timeout=10)
+            response = self.resilience.request("GET", url, headers=self.rapidapi_headers, params=querystring, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -81,6 +94,9 @@ class LinkedInProfileSearcher:
                 print(f"API request failed with status {response.status_code}: {response.text}")
                 return None
                 
+        except CircuitOpenError:
+            print("⚠️ RapidAPI is failing, skipping API call")
+            return None
         except Exception as e:
             print(f"Error fetching profile via API: {e}")
             return None
@@ -96,6 +112,13 @@ class LinkedInProfileSearcher:
         except:
             return None
     
+    def _canonical_username(self, profile_url: str) -> str:
+        """Canonical key for a profile, so URL variants of one person compare equal"""
+        username = self._extract_username_from_url(profile_url or '')
+        if not username:
+            return None
+        return unquote(username).strip().lower()
+    
     def _parse_api_response(self, api_data: dict) -> dict:
         """Parse RapidAPI response into our standard format"""
         try:
@@ -149,25 +172,37 @@ class LinkedInProfileSearcher:
         """
         print(f"Fetching detailed data for: {profile_url}")
         
-        # Try API first
-        api_data = self.get_profile_details_via_api(profile_url)
+        # Try API first; concurrent lookups of the same person share one request
+        key = self._canonical_username(profile_url) or profile_url
+        api_data = self.profile_flights.do(key, self.get_profile_details_via_api, profile_url)
         
         if api_data:
             print("✅ Successfully fetched data via API")
             return api_data
         else:
             print("⚠️ API failed, using basic data from search results")
-            # Return enhanced basic data
-            return {
-                'name': basic_data.get('name', ''),
-                'headline': basic_data.get('headline', ''),
-                'location': basic_data.get('location', ''),
-                'profile_url': profile_url,
-                'education': [],  # Would need to be extracted from snippet
-                'experience': [],  # Would need to be extracted from snippet
-                'skills': [],  # Would need to be extracted from snippet
-                'summary': basic_data.get('snippet', '')
-            }
+            return self._basic_profile_data(profile_url, basic_data)
+    
+    def fetch_many(self, usernames: list) -> dict:
+        """
+        Fetch detailed profiles for many canonical usernames via the enrichment provider
+        
+        Returns a dict mapping each username to its profile, or None if it was not found
+        """
+        return self.enrichment_provider.fetch_many(usernames)
+    
+    def _basic_profile_data(self, profile_url: str, basic_data: dict) -> dict:
+        """Profile built from search result data when no detailed data is available"""
+        return {
+            'name': basic_data.get('name', ''),
+            'headline': basic_data.get('headline', ''),
+            'location': basic_data.get('location', ''),
+            'profile_url': profile_url,
+            'education': [],  # Would need to be extracted from snippet
+            'experience': [],  # Would need to be extracted from snippet
+            'skills': [],  # Would need to be extracted from snippet
+            'summary': basic_data.get('snippet', '')
+        }
     
     def _generate_search_queries(self, job_details):
         """
@@ -230,7 +265,7 @@ class LinkedInProfileSearcher:
             url = f"https://www.google.com/search?q={quote_plus(query)}&start={start}"
             
             try:
-                resp = requests.get(url, headers=self.headers, timeout=10)
+                resp = self.resilience.request("GET", url, headers=self.headers, timeout=10)
                 if resp.status_code != 200:
                     print(f"Google search failed with status {resp.status_code}")
                     continue
@@ -250,6 +285,9 @@ class LinkedInProfileSearcher:
                 
                 time.sleep(delay)  # Rate limiting
                 
+            except CircuitOpenError:
+                print("⚠️ Google search is failing, skipping remaining pages")
+                break
             except Exception as e:
                 print(f"Error in Google search: {e}")
                 continue
@@ -297,13 +335,14 @@ class LinkedInProfileSearcher:
             snippet = snippet_elem.get_text(separator=" ", strip=True) if snippet_elem else ""
             
             # Extract profile information
-            name, headline, location = self._extract_profile_info_from_snippet(snippet)
+            info = self.snippet_parser.parse(snippet)
             
             return {
                 "url": profile_url,
-                "name": name,
-                "headline": headline,
-                "location": location,
+                "name": info['name'],
+                "headline": info['headline'],
+                "company": info['company'],
+                "location": info['location'],
                 "snippet": snippet,
                 "extracted_at": time.time()
             }
@@ -316,46 +355,21 @@ class LinkedInProfileSearcher:
         """
         Extract name, headline, and location from LinkedIn snippet
         """
-        if not snippet:
-            return "", "", ""
-        
-        # LinkedIn snippets typically follow pattern: "Name - Title at Company - Location"
-        parts = snippet.split(" - ")
-        
-        name = parts[0].strip() if len(parts) > 0 else ""
-        headline = parts[1].strip() if len(parts) > 1 else ""
-        location = ""
-        
-        # Try to extract location from the last part or using regex
-        if len(parts) > 2:
-            location = parts[2].strip()
-        else:
-            # Look for location patterns in the entire snippet
-            location_patterns = [
-                r'([A-Z][a-z]+(?:[\s,]+[A-Z][a-z]+)*\s*(?:City|County|State|Province|Country))',
-                r'([A-Z][a-z]+(?:[\s,]+[A-Z][a-z]+)*)',
-                r'(Remote|On-site|Hybrid)'
-            ]
-            
-            for pattern in location_patterns:
-                match = re.search(pattern, snippet)
-                if match:
-                    location = match.group(1)
-                    break
-        
-        return name, headline, location
+        info = self.snippet_parser.parse(snippet)
+        return info['name'], info['headline'], info['location']
     
     def _remove_duplicates(self, profiles):
         """
-        Remove duplicate profiles based on URL
+        Remove duplicate profiles based on canonical username (falling back to URL)
         """
-        seen_urls = set()
+        seen_keys = set()
         unique_profiles = []
         
         for profile in profiles:
             url = profile.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
+            key = self._canonical_username(url) or url
+            if key and key not in seen_keys:
+                seen_keys.add(key)
                 unique_profiles.append(profile)
         
         return unique_profiles
@@ -379,7 +393,7 @@ class LinkedInProfileSearcher:
         Note: This is a simplified version - full profile scraping requires authentication
         """
         try:
-            response = requests.get(profile_url, headers=self.headers, timeout=10)
+            response = self.resilience.request("GET", profile_url, headers=self.headers, timeout=10)
             if response.status_code != 200:
                 return None
             
@@ -399,6 +413,9 @@ class LinkedInProfileSearcher:
             
             return candidate_data
             
+        except CircuitOpenError:
+            print("⚠️ LinkedIn profile pages are failing, skipping profile")
+            return None
         except Exception as e:
             print(f"Error extracting candidate data: {e}")
             return None
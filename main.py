@@ -9,6 +9,8 @@ Features job parsing, profile search, AI scoring, and GPT-4 powered personalized
 Usage:
     python main.py <job_url>
     python main.py --demo
+    python main.py --rescore <run_id> --weights skills=0.35,location=0.05
+    python main.py --batch-outreach <job_url>; later: python main.py --collect <run_id> --export
     python main.py --help
 """
 
@@ -27,6 +29,10 @@ Examples:
   python main.py --max-candidates 30 https://www.linkedin.com/jobs/view/4256398535
   python main.py --export --demo
   python main.py --templates --demo  # Use templates instead of GPT-4
+  python main.py --rescore latest --weights skills=0.35,education=0.10
+  python main.py --batch-outreach https://www.linkedin.com/jobs/view/4256398535
+  python main.py --collect latest --export
+  python main.py --llm-budget '$0.50' https://www.linkedin.com/jobs/view/4256398535
         """
     )
     
@@ -49,6 +55,13 @@ Examples:
         help='Maximum number of candidates to analyze (default: 20)'
     )
     
+    parser.add_argument(
+        '--enrichment-budget',
+        type=int,
+        default=None,
+        help='Number of profiles to enrich via API, picked by snippet pre-score (default: --max-candidates)'
+    )
+    
     parser.add_argument(
         '--export',
         action='store_true',
@@ -86,12 +99,86 @@ Examples:
         help='Use Anthropic Claude instead of OpenAI GPT-4'
     )
     
+    parser.add_argument(
+        '--profile-dump',
+        action='append',
+        metavar='PATH',
+        help='Read detailed profiles from a local JSONL dump instead of RapidAPI (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--candidate-index',
+        action='store_true',
+        help='Also shortlist candidates from profiles stored by past runs and --profile-dump files'
+    )
+    
+    parser.add_argument(
+        '--index-only',
+        action='store_true',
+        help='Use only the candidate index, skipping the Google search (implies --candidate-index)'
+    )
+    
+    parser.add_argument(
+        '--rescore',
+        metavar='RUN_ID',
+        help='Re-rank a stored run (job ID from a previous run, or "latest") without searching again'
+    )
+    
+    parser.add_argument(
+        '--weights',
+        type=str,
+        help='Scoring weights for --rescore, e.g. "skills=0.35,location=0.05" (unlisted categories keep the run\'s weights)'
+    )
+    
+    parser.add_argument(
+        '--batch-outreach',
+        action='store_true',
+        help='Submit LLM outreach as a provider batch job (cheaper, finishes within 24h) instead of generating it now'
+    )
+    
+    parser.add_argument(
+        '--collect',
+        metavar='RUN_ID',
+        help='Merge the finished outreach batch of a run (job ID, or "latest") into its candidates'
+    )
+    
+    parser.add_argument(
+        '--llm-budget',
+        type=str,
+        help='LLM spend allowed per run, in tokens ("200000") or dollars ("$0.50"); '
+             'remaining messages use local templates once it is spent'
+    )
+    
+    parser.add_argument(
+        '--route',
+        action='store_true',
+        help='Pick per candidate by fit score: premium model for the top band, a small model for the middle, '
+             'local templates below (see ROUTING_* in config.py)'
+    )
+    
+    parser.add_argument(
+        '--no-stream',
+        action='store_true',
+        help="Don't stream LLM messages into the printed results (streaming is on when run in a terminal)"
+    )
+    
     args = parser.parse_args()
     
-    if not args.job_url and not args.demo:
+    if not args.job_url and not args.demo and not args.rescore and not args.collect:
         parser.print_help()
         return
     
+    if args.batch_outreach and (args.templates or args.enhanced):
+        parser.error("--batch-outreach needs an LLM (GPT-4 or --anthropic), not templates")
+    if args.route and (args.templates or args.enhanced):
+        parser.error("--route needs an LLM (GPT-4 or --anthropic), not templates")
+    
+    try:
+        weights = parse_weights(args.weights) if args.weights else None
+        llm_budget = parse_budget(args.llm_budget) if args.llm_budget else None
+    except ValueError as e:
+        parser.error(str(e))
+    
     print("🚀 LinkedIn Recruitment Agent")
     print("=" * 60)
     print("Features: Job Parsing | Profile Search | AI Scoring | GPT-4/Claude Outreach")
@@ -102,17 +189,37 @@ Examples:
     use_enhanced = args.enhanced
     use_anthropic = args.anthropic
     
-    orchestrator = JobOrchestrator(use_gpt4=use_gpt4, use_enhanced=use_enhanced, use_anthropic=use_anthropic)
+    orchestrator = JobOrchestrator(use_gpt4=use_gpt4, use_enhanced=use_enhanced, use_anthropic=use_anthropic,
+                                   profile_dumps=args.profile_dump,
+                                   use_index=args.candidate_index or args.index_only,
+                                   use_search=not args.index_only,
+                                   batch_outreach=args.batch_outreach,
+                                   stream=sys.stdout.isatty() and not args.no_stream and not args.quiet,
+                                   llm_budget=llm_budget, route=args.route)
     
     try:
-        if args.demo:
+        if args.collect:
+            run_id = orchestrator.run_store.latest() if args.collect == 'latest' else args.collect
+            if not run_id:
+                print("\n❌ Error: No stored runs to collect")
+                return
+            print(f"📦 Collecting outreach batch of run: {run_id}")
+            results = orchestrator.collect(run_id)
+        elif args.rescore:
+            run_id = orchestrator.run_store.latest() if args.rescore == 'latest' else args.rescore
+            if not run_id:
+                print("\n❌ Error: No stored runs to rescore")
+                return
+            print(f"♻️ Rescoring run: {run_id}")
+            results = orchestrator.rescore(run_id, weights)
+        elif args.demo:
             # Run with demo data
             print("🎯 Running with demo data...")
             results = orchestrator.process_job_posting("demo", args.max_candidates)
         else:
             # Process actual job URL
             print(f"🔍 Processing job URL: {args.job_url}")
-            results = orchestrator.process_job_posting(args.job_url, args.max_candidates)
+            results = orchestrator.process_job_posting(args.job_url, args.max_candidates, args.enrichment_budget)
         
         if 'error' in results:
             print(f"\n❌ Error: {results['error']}")
@@ -142,6 +249,42 @@ Examples:
         print("This might be due to LinkedIn's anti-scraping measures or network issues.")
         print("Try running with --demo to test the system with sample data.")
 
+def parse_weights(text):
+    """Parse "category=weight,..." into a dict of floats"""
+    weights = {}
+    for part in text.split(','):
+        if not part.strip():
+            continue
+        category, sep, value = part.partition('=')
+        if not sep:
+            raise ValueError(f"Invalid weight '{part.strip()}', expected category=weight")
+        try:
+            weights[category.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid weight value for {category.strip()}: {value.strip()}")
+    return weights
+
+def parse_budget(text):
+    """Parse "200000", "200k tokens", "$0.50" or "0.50usd" into (limit, 'tokens' | 'usd')"""
+    value = text.strip().lower().replace(',', '')
+    unit = 'tokens'
+    if value.startswith('$') or value.endswith('usd'):
+        unit = 'usd'
+        value = value.lstrip('$')
+        if value.endswith('usd'):
+            value = value[:-3]
+    elif value.endswith('tokens'):
+        value = value[:-6]
+    value = value.strip()
+    scale = 1000 if unit == 'tokens' and value.endswith('k') else 1
+    try:
+        limit = float(value[:-1] if scale > 1 else value) * scale
+    except ValueError:
+        raise ValueError(f"Invalid LLM budget '{text}', expected tokens (200000) or dollars ($0.50)")
+    if limit <= 0:
+        raise ValueError(f"LLM budget must be positive: {text}")
+    return limit, unit
+
 def print_summary(results):
     """Print a brief summary of results"""
     job_details = results.get('job_details', {})
@@ -151,6 +294,9 @@ def print_summary(results):
     print(f"Position: {job_details.get('title', 'N/A')} at {job_details.get('company', 'N/A')}")
     print(f"Location: {job_details.get('location', 'N/A')}")
     print(f"Total Candidates Found: {results.get('candidates_found', 0)}")
+    if 'rescored' in results:
+        rescored = results['rescored']
+        print(f"Rescored: {rescored['entered_top_k']} new in top candidates, {rescored['messages_generated']} messages generated")
     
     top_candidates = results.get('top_candidates', [])
     if top_candidates:
@@ -0,0 +1,112 @@
+import hashlib
+import random
+import re
+from collections import defaultdict
+from typing import Dict, List, Sequence, Set, Tuple
+
+from config import Config
+
+# Mersenne prime for the (a * x + b) mod p hash permutations
+_PRIME = (1 << 61) - 1
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def shingles(text: str, size: int = None) -> Set[int]:
+    """Hashed word n-grams of a message (lower-cased, punctuation dropped)"""
+    size = size or Config.DEDUP_SHINGLE_SIZE
+    words = _WORD.findall(text.lower())
+    grams = [' '.join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))]
+    return {int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'big') for gram in grams}
+
+
+def lsh_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    (bands, rows) with bands * rows <= num_perm whose LSH threshold (1/bands)^(1/rows)
+    is closest to, but not above, the similarity threshold: pairs near the threshold
+    still share a bucket, and the false positives are dropped on verification
+    """
+    best = (1, num_perm)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+class NearDuplicateDetector:
+    """
+    Finds near-duplicate outreach messages with MinHash and locality-sensitive hashing
+
+    Each message gets a MinHash signature of its word shingles; signatures are cut into
+    bands and hashed into buckets, so only messages sharing a bucket are compared, in
+    roughly linear time rather than pairwise. Candidate pairs are kept when the share of
+    matching signature values (an estimate of the shingle Jaccard similarity) reaches
+    the threshold. Signatures are deterministic for a given seed.
+    """
+
+    def __init__(self, threshold: float = None, num_perm: int = None, shingle_size: int = None, seed: int = 1):
+        self.threshold = Config.DEDUP_THRESHOLD if threshold is None else threshold
+        self.num_perm = num_perm or Config.DEDUP_NUM_PERM
+        self.shingle_size = shingle_size or Config.DEDUP_SHINGLE_SIZE
+        self.bands, self.rows = lsh_bands(self.num_perm, self.threshold)
+        rng = random.Random(seed)
+        self._permutations = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME)) for _ in range(self.num_perm)]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """MinHash signature: the minimum of each hash permutation over the message's shingles"""
+        hashes = shingles(text, self.shingle_size)
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._permutations)
+
+    def similarity(self, first: Sequence[int], second: Sequence[int]) -> float:
+        """Estimated Jaccard similarity of two signatures"""
+        return sum(1 for x, y in zip(first, second) if x == y) / self.num_perm
+
+    def repeats(self, signature: Sequence[int], others: List[Sequence[int]]) -> bool:
+        """True if a signature is a near-duplicate of any of others"""
+        return any(self.similarity(signature, other) >= self.threshold for other in others)
+
+    def clusters(self, texts: List[str]) -> List[List[int]]:
+        """
+        Group near-duplicate messages
+
+        Args:
+            texts: Messages, best candidate first
+
+        Returns:
+            Groups of two or more indices into texts, each in ascending order, so the
+            first message of a group is the one to keep
+        """
+        signatures = [self.signature(text) for text in texts]
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+        for i, signature in enumerate(signatures):
+            for band in range(self.bands):
+                buckets[(band, signature[band * self.rows:(band + 1) * self.rows])].append(i)
+
+        # Union-find over verified pairs
+        parent = list(range(len(texts)))
+
+        def root(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        checked = set()
+        for members in buckets.values():
+            for position, j in enumerate(members):
+                for i in members[:position]:
+                    if (i, j) in checked:
+                        continue
+                    checked.add((i, j))
+                    if self.similarity(signatures[i], signatures[j]) >= self.threshold:
+                        first, second = sorted((root(i), root(j)))
+                        parent[second] = first
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(texts)):
+            groups[root(i)].append(i)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def duplicates(self, texts: List[str]) -> Dict[int, int]:
+        """Index of every near-duplicate message -> index of the message it repeats (the first of its group)"""
+        return {i: group[0] for group in self.clusters(texts) for i in group[1:]}
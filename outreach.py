@@ -1,9 +1,14 @@
-import re
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from config import Config
+from outreach_backend import OutreachBackend, register_backend
+from templates import CompiledTemplate, job_fields, job_key
 
-class OutreachGenerator:
+class OutreachGenerator(OutreachBackend):
+    name = 'templates'
+    label = "📝 Using basic template-based outreach message generation"
+    
     def __init__(self):
+        super().__init__()
         self.templates = {
             'default': Config.OUTREACH_TEMPLATE,
             'senior': """
@@ -27,8 +32,12 @@ Best regards,
 {recruiter_name}
             """
         }
+        
+        # Parsed and cleaned once; job fields are bound per job in bind_job
+        self.compiled = {key: CompiledTemplate(template) for key, template in self.templates.items()}
     
-    def generate_outreach_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team") -> str:
+    def generate_outreach_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team",
+                                  job: Dict[str, Any] = None) -> str:
         """
         Generate a personalized outreach message for a candidate
         
@@ -36,35 +45,31 @@ Best regards,
             candidate: Candidate data including name, headline, skills, etc.
             job_details: Job details including title, company, location, etc.
             recruiter_name: Name of the recruiter (default: "Recruitment Team")
+            job: bind_job(job_details, recruiter_name), if the caller already has it
             
         Returns:
             Personalized outreach message
         """
+        job = job or self.bind_job(job_details, recruiter_name)
+        
         # Determine template based on candidate level
         template_key = self._determine_template(candidate, job_details)
-        template = self.templates[template_key]
-        
-        # Extract skills highlight
-        skills_highlight = self._extract_skills_highlight(candidate, job_details)
         
-        # Prepare template variables
-        template_vars = {
+        return job['templates'][template_key].render({
             'name': candidate.get('name', 'there'),
             'headline': candidate.get('headline', 'professional experience'),
-            'job_title': job_details.get('title', 'this position'),
-            'company': job_details.get('company', 'our company'),
-            'location': job_details.get('location', 'our location'),
-            'skills_highlight': skills_highlight,
-            'recruiter_name': recruiter_name
-        }
-        
-        # Generate message
-        message = template.format(**template_vars)
-        
-        # Clean up the message
-        message = self._clean_message(message)
-        
-        return message
+            'skills_highlight': self._extract_skills_highlight(candidate, job_details, job['skills'])
+        })
+    
+    def bind_job(self, job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team") -> Dict[str, Any]:
+        """Templates with this job's fields filled in, and its skill set"""
+        def build():
+            fields = job_fields(job_details, recruiter_name)
+            return {
+                'templates': {name: template.bind(fields) for name, template in self.compiled.items()},
+                'skills': tuple(dict.fromkeys(skill.lower() for skill in job_details.get('skills') or []))
+            }
+        return self._bound_job(job_key(job_details, recruiter_name), build)
     
     def _determine_template(self, candidate: Dict[str, Any], job_details: Dict[str, Any]) -> str:
         """Determine which template to use based on candidate and job level"""
@@ -87,66 +92,37 @@ Best regards,
         
         return 'default'
     
-    def _extract_skills_highlight(self, candidate: Dict[str, Any], job_details: Dict[str, Any]) -> str:
-        """Extract and format skills highlight for the message"""
-        candidate_skills = set()
-        job_skills = set()
-        
-        # Get candidate skills
-        if 'skills' in candidate:
-            candidate_skills.update(skill.lower() for skill in candidate['skills'])
+    def _extract_skills_highlight(self, candidate: Dict[str, Any], job_details: Dict[str, Any], job_skills: tuple = None) -> str:
+        """Extract and format skills highlight for the message (job_skills: the job's lowercased skills, if already known)"""
+        # Get candidate skills (lists in their own order, so messages don't depend on string hashing)
+        candidate_skills = list(dict.fromkeys(skill.lower() for skill in candidate.get('skills') or []))
         
         # Get job skills
-        if 'skills' in job_details:
-            job_skills.update(skill.lower() for skill in job_details['skills'])
+        if job_skills is None:
+            job_skills = tuple(dict.fromkeys(skill.lower() for skill in job_details.get('skills') or []))
         
-        # Find matching skills
-        matching_skills = candidate_skills.intersection(job_skills)
+        # Find matching skills, in the job's order
+        candidate_set = set(candidate_skills)
+        matching_skills = [skill for skill in job_skills if skill in candidate_set]
         
         if matching_skills:
             # Take top 3 matching skills
-            top_skills = list(matching_skills)[:3]
+            top_skills = matching_skills[:3]
             return ', '.join(skill.title() for skill in top_skills)
         elif candidate_skills:
             # Use top candidate skills if no match
-            top_skills = list(candidate_skills)[:3]
+            top_skills = candidate_skills[:3]
             return ', '.join(skill.title() for skill in top_skills)
         else:
             return "relevant technical skills"
     
-    def _clean_message(self, message: str) -> str:
-        """Clean and format the message"""
-        # Remove extra whitespace
-        message = re.sub(r'\n\s*\n', '\n\n', message)
-        message = message.strip()
-        
-        return message
-    
-    def generate_bulk_outreach_messages(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any], recruiter_name: str = "Recruitment Team") -> List[Dict[str, Any]]:
-        """
-        Generate outreach messages for multiple candidates
-        
-        Args:
-            candidates: List of candidate data
-            job_details: Job details
-            recruiter_name: Name of the recruiter
-            
-        Returns:
-            List of candidates with outreach messages
-        """
-        results = []
-        
-        for candidate in candidates:
-            message = self.generate_outreach_message(candidate, job_details, recruiter_name)
-            
-            candidate_with_message = {
-                **candidate,
-                'outreach_message': message
-            }
-            
-            results.append(candidate_with_message)
-        
-        return results
+    def _generate_chunk(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                        recruiter_name: str) -> List[Tuple[Optional[str], str]]:
+        job = self.bind_job(job_details, recruiter_name)
+        return [(self.generate_outreach_message(candidate, job_details, recruiter_name, job), 'template')
+                for candidate in candidates]
+
+register_backend('templates', OutreachGenerator)
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import Config
+from templates import job_key
+
+# Backend name -> factory; filled in by register_backend next to each generator class
+OUTREACH_BACKENDS: Dict[str, Callable[[], 'OutreachBackend']] = {}
+
+
+def register_backend(name: str, factory: Callable[[], 'OutreachBackend']):
+    """Make a backend available to create_backend (and JobOrchestrator) under name"""
+    OUTREACH_BACKENDS[name] = factory
+
+
+def create_backend(name: str) -> 'OutreachBackend':
+    """A new instance of the backend registered under name"""
+    if name not in OUTREACH_BACKENDS:
+        raise ValueError(f"Unknown outreach backend {name!r} (available: {', '.join(sorted(OUTREACH_BACKENDS))})")
+    return OUTREACH_BACKENDS[name]()
+
+
+class OutreachBackend:
+    """
+    Writes outreach messages for a job's candidates
+
+    Backends implement _generate_chunk, returning (message, source) per candidate with
+    message None where generation failed. generate_many adds what every backend shares:
+    a cache of messages by candidate, job and recruiter; chunks of chunk_size candidates
+    run on up to Config.OUTREACH_WORKERS threads (the first one alone, so the job's prompt
+    prefix is cached before the rest read it); _fallback_message for failed candidates;
+    and stats. agenerate_many is the same for asyncio callers.
+    """
+
+    name = 'base'
+    label = 'outreach backend'
+
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or Config.OUTREACH_WORKERS
+        self.stats = {'messages': 0, 'cached': 0, 'fallbacks': 0, 'seconds': 0.0}
+        self._cache: 'OrderedDict[tuple, Tuple[str, str]]' = OrderedDict()
+        # Templates bound to recent jobs (see _bound_job)
+        self._bound: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def chunk_size(self) -> Optional[int]:
+        """Candidates per _generate_chunk call (None: all of them in one)"""
+        return None
+
+    def _generate_chunk(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                        recruiter_name: str) -> List[Tuple[Optional[str], str]]:
+        raise NotImplementedError
+
+    def _fallback_message(self, candidate: Dict[str, Any], job_details: Dict[str, Any],
+                          recruiter_name: str) -> Optional[str]:
+        """Message for a candidate _generate_chunk failed on (None: leave it without one)"""
+        return None
+
+    def generate_many(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                      recruiter_name: str = "Recruitment Team") -> List[Dict[str, Any]]:
+        """
+        Generate outreach messages for many candidates
+
+        Args:
+            candidates: Candidates to write to
+            job_details: Job details
+            recruiter_name: Name of the recruiter
+
+        Returns:
+            The candidates, in order, with outreach_message and message_source set on each
+        """
+        started = time.perf_counter()
+        job = job_key(job_details, recruiter_name) + (tuple(job_details.get('requirements') or ()),)
+        pending = []
+        cached = 0
+        for candidate in candidates:
+            hit = self._cache_get((self._identity(candidate), job))
+            if hit:
+                candidate['outreach_message'], candidate['message_source'] = hit
+                cached += 1
+            else:
+                pending.append(candidate)
+
+        size = self.chunk_size or max(1, len(pending))
+        chunks = [pending[start:start + size] for start in range(0, len(pending), size)]
+        if len(chunks) > 1:
+            print(f"   Generating {len(pending)} messages, up to {size} per request, "
+                  f"{min(self.max_workers, len(chunks) - 1)} at a time")
+        generated = []
+        if chunks:
+            generated.extend(self._generate_chunk(chunks[0], job_details, recruiter_name))
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(chunks) - 1))) as pool:
+                for results in pool.map(lambda chunk: self._generate_chunk(chunk, job_details, recruiter_name),
+                                        chunks[1:]):
+                    generated.extend(results)
+
+        fallbacks = 0
+        for candidate, (message, source) in zip(pending, generated):
+            if message:
+                self._cache_put((self._identity(candidate), job), (message, source))
+            else:
+                message, source = self._fallback_message(candidate, job_details, recruiter_name), 'template'
+                fallbacks += 1
+            candidate['outreach_message'] = message
+            candidate['message_source'] = source
+
+        seconds = time.perf_counter() - started
+        with self._lock:
+            self.stats['messages'] += len(candidates)
+            self.stats['cached'] += cached
+            self.stats['fallbacks'] += fallbacks
+            self.stats['seconds'] += seconds
+        if cached or fallbacks:
+            print(f"   {self.name}: {len(candidates)} messages in {seconds:.2f}s "
+                  f"({cached} from cache, {fallbacks} template fallbacks)")
+        return list(candidates)
+
+    async def agenerate_many(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                             recruiter_name: str = "Recruitment Team") -> List[Dict[str, Any]]:
+        """generate_many for asyncio callers; it runs in a worker thread so the event loop stays free"""
+        return await asyncio.to_thread(self.generate_many, candidates, job_details, recruiter_name)
+
+    def generate_bulk_outreach_messages(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                                        recruiter_name: str = "Recruitment Team") -> List[Dict[str, Any]]:
+        """Generate outreach messages for multiple candidates (see generate_many)"""
+        return self.generate_many(candidates, job_details, recruiter_name)
+
+    def _bound_job(self, key: tuple, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Per-job template state for key, built once and shared read-only by every thread
+
+        The last few jobs are kept, so generators used for several jobs at once neither
+        rebind per message nor hand one job's templates to another.
+        """
+        with self._lock:
+            job = self._bound.get(key)
+            if job is not None:
+                self._bound.move_to_end(key)
+                return job
+        job = build()
+        with self._lock:
+            self._bound[key] = job
+            while len(self._bound) > 8:
+                self._bound.popitem(last=False)
+        return job
+
+    def _identity(self, candidate: Dict[str, Any]) -> str:
+        return candidate.get('linkedin_url') or candidate.get('profile_url') or candidate.get('name') or ''
+
+    def _cache_get(self, key: tuple) -> Optional[Tuple[str, str]]:
+        if not key[0]:
+            return None
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit:
+                self._cache.move_to_end(key)
+            return hit
+
+    def _cache_put(self, key: tuple, value: Tuple[str, str]):
+        if not key[0]:
+            return
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > Config.OUTREACH_CACHE_SIZE:
+                self._cache.popitem(last=False)
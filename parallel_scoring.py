@@ -0,0 +1,105 @@
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple
+
+from config import Config
+from scoring import CandidateScorer, JobScoringContext
+from top_k import TopKAccumulator
+
+# Per-process state, set once by _init_worker so chunks only carry profiles
+_worker_scorer = None
+_worker_job = None
+_worker_context = None
+
+
+def _init_worker(job_requirements: Dict[str, Any], weights: Dict[str, float]):
+    global _worker_scorer, _worker_job, _worker_context
+    # Workers may be spawned fresh, so carry over the parent's (possibly tweaked) weights
+    Config.SCORING_WEIGHTS = dict(weights)
+    _worker_scorer = CandidateScorer()
+    _worker_job = job_requirements
+    _worker_context = _worker_scorer.compile_job(job_requirements)
+
+
+def _score_chunk(chunk: List[Tuple[int, Dict[str, Any]]], top_k: int) -> List[Tuple[float, int, Dict[str, float]]]:
+    """Score a chunk of (index, profile) pairs and return its local top-K"""
+    return _top_k(_score_pairs(_worker_scorer, _worker_job, _worker_context, chunk), top_k)
+
+
+def _score_pairs(scorer: CandidateScorer, job_requirements: Dict[str, Any], job_context: JobScoringContext,
+                 chunk) -> List[Tuple[float, int, Dict[str, float]]]:
+    results = []
+    for index, profile in chunk:
+        result = scorer.calculate_fit_score(profile, job_requirements, job_context)
+        results.append((result['fit_score'], index, result['score_breakdown']))
+    return results
+
+
+def _top_k(scored: Iterable[Tuple[float, int, Dict[str, float]]], top_k: int) -> List[Tuple[float, int, Dict[str, float]]]:
+    # Ties go to the earlier profile (lower index), matching a stable sort
+    return heapq.nlargest(top_k, scored, key=lambda item: (item[0], -item[1]))
+
+
+class ParallelScorer:
+    """Score large candidate pools across a process pool and keep only the top K"""
+
+    def __init__(self, workers: int = None, chunk_size: int = None, top_k: int = None):
+        self.workers = workers or Config.PARALLEL_SCORING_WORKERS or os.cpu_count() or 1
+        self.chunk_size = chunk_size or Config.PARALLEL_SCORING_CHUNK_SIZE
+        self.top_k = top_k or Config.TOP_K_CANDIDATES
+
+    def score(self, profiles: Iterable[Dict[str, Any]], job_requirements: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Score profiles against one job and return the best top_k
+
+        Args:
+            profiles: Iterable of profile dicts (may be a generator over an export)
+            job_requirements: Dictionary containing job requirements
+
+        Returns:
+            Up to top_k dicts with 'index' (position in profiles), 'fit_score' and
+            'score_breakdown', best first
+        """
+        chunks = self._chunks(profiles)
+        best = TopKAccumulator(k=self.top_k)
+
+        if self.workers == 1:
+            scorer = CandidateScorer()
+            job_context = scorer.compile_job(job_requirements)
+            for chunk in chunks:
+                self._merge(best, _score_pairs(scorer, job_requirements, job_context, chunk))
+        else:
+            self._score_in_pool(best, chunks, job_requirements)
+
+        return best.results()
+
+    def _score_in_pool(self, best: TopKAccumulator, chunks, job_requirements):
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(job_requirements, Config.SCORING_WEIGHTS)) as pool:
+            pending = set()
+            for chunk in chunks:
+                # Keep only a couple of chunks per worker in flight so huge pools stream
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._merge(best, future.result())
+                pending.add(pool.submit(_score_chunk, chunk, self.top_k))
+            done, _ = wait(pending)
+            for future in done:
+                self._merge(best, future.result())
+
+    def _merge(self, best: TopKAccumulator, scored):
+        # Chunks finish out of order, so the profile index is the tie-break, not arrival order
+        for score, index, breakdown in scored:
+            if best.would_admit(score, order=index):
+                best.offer({'index': index, 'fit_score': score, 'score_breakdown': breakdown}, order=index)
+
+    def _chunks(self, profiles: Iterable[Dict[str, Any]]):
+        iterator = enumerate(profiles)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
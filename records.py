@@ -0,0 +1,185 @@
+import sys
+from typing import Any, Dict, List, Optional
+
+# Short, heavily repeated values inside experience/education entries ("Google", "Present")
+_INTERNED_ENTRY_FIELDS = ('title', 'company', 'school', 'degree', 'field', 'start_date', 'end_date', 'location')
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if value.__class__ is str else value
+
+
+def _intern_entries(entries: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    # Rebuilt once at load time; key order is kept so profile_key() hashes are unchanged
+    return [{key: _intern(value) if key in _INTERNED_ENTRY_FIELDS else value for key, value in entry.items()}
+            for entry in entries or []]
+
+
+class Record:
+    """
+    Slotted record with read access like the dicts it replaces
+
+    Scorers and outreach generators are written against dicts (candidate.get('skills', []),
+    candidate['name']), so records answer the same calls for their fields. A field that is
+    None counts as missing.
+    """
+
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self._fields() else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self._fields():
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    @classmethod
+    def _fields(cls) -> tuple:
+        return cls.__slots__
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self._fields() if getattr(self, field) is not None}
+
+
+class ProfileStub(Record):
+    """A search result before enrichment: what the snippet told us about a profile"""
+
+    __slots__ = ('url', 'name', 'headline', 'company', 'location', 'snippet',
+                 'search_source', 'search_query', 'job_match_score', 'extracted_at', 'estimated_score')
+
+    def __init__(self, url: str = '', name: str = '', headline: str = '', company: str = '', location: str = '',
+                 snippet: str = '', search_source: str = None, search_query: str = None,
+                 job_match_score: float = None, extracted_at: float = None, estimated_score: float = None):
+        self.url = url
+        self.name = name
+        self.headline = _intern(headline)
+        self.company = _intern(company)
+        self.location = _intern(location)
+        self.snippet = snippet
+        self.search_source = search_source
+        self.search_query = search_query
+        self.job_match_score = job_match_score
+        self.extracted_at = extracted_at
+        self.estimated_score = estimated_score
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProfileStub':
+        return cls(**{field: data[field] for field in cls.__slots__ if field in data})
+
+
+class EnrichedProfile(Record):
+    """
+    A full profile in _parse_api_response format
+
+    Skills and the short fields of experience/education entries are interned, so the
+    thousands of "Python" and "Google" strings in a large pool are one object each.
+    """
+
+    __slots__ = ('name', 'headline', 'location', 'summary', 'profile_url', 'education', 'experience', 'skills')
+
+    def __init__(self, name: str = '', headline: str = '', location: str = '', summary: str = '',
+                 profile_url: str = '', education: List[Dict[str, Any]] = None,
+                 experience: List[Dict[str, Any]] = None, skills: List[str] = None):
+        self.name = name
+        self.headline = _intern(headline)
+        self.location = _intern(location)
+        self.summary = summary
+        self.profile_url = profile_url
+        self.education = _intern_entries(education)
+        self.experience = _intern_entries(experience)
+        self.skills = [_intern(skill) for skill in skills or []]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EnrichedProfile':
+        return cls(data.get('name') or '', data.get('headline') or '', data.get('location') or '',
+                   data.get('summary') or '', data.get('profile_url') or data.get('url') or '',
+                   data.get('education'), data.get('experience'), data.get('skills'))
+
+
+class ScoredCandidate(Record):
+    """
+    A profile with its scores and, once shortlisted, its score card and outreach
+
+    Profile fields are read through the shared EnrichedProfile rather than copied, and
+    outreach is set on the record itself, so a candidate is never duplicated on its way
+    to the output. to_dict() gives the candidate shape of the JSON output.
+    """
+
+    __slots__ = ('profile', 'fit_score', 'score_breakdown', 'overall_grade', 'recommendation',
+                 'explanation', 'outreach_message', 'message_source')
+
+    # Output field order; profile fields come from the shared profile
+    _OUTPUT_FIELDS = ('name', 'linkedin_url', 'fit_score', 'score_breakdown', 'overall_grade', 'recommendation',
+                      'explanation', 'headline', 'location', 'education', 'experience', 'skills',
+                      'outreach_message', 'message_source')
+    _PROFILE_FIELDS = frozenset(('name', 'headline', 'location', 'education', 'experience', 'skills'))
+
+    def __init__(self, profile: EnrichedProfile, fit_score: float, score_breakdown: Dict[str, float]):
+        self.profile = profile
+        self.fit_score = fit_score
+        self.score_breakdown = score_breakdown
+        self.overall_grade = None
+        self.recommendation = None
+        self.explanation = None
+        self.outreach_message = None
+        self.message_source = None
+
+    @property
+    def name(self) -> str:
+        return self.profile.name
+
+    @property
+    def linkedin_url(self) -> str:
+        return self.profile.profile_url
+
+    @property
+    def headline(self) -> str:
+        return self.profile.headline
+
+    @property
+    def location(self) -> str:
+        return self.profile.location
+
+    @property
+    def education(self) -> List[Dict[str, Any]]:
+        return self.profile.education
+
+    @property
+    def experience(self) -> List[Dict[str, Any]]:
+        return self.profile.experience
+
+    @property
+    def skills(self) -> List[str]:
+        return self.profile.skills
+
+    @classmethod
+    def _fields(cls) -> tuple:
+        return cls._OUTPUT_FIELDS
+
+    def __setitem__(self, key: str, value: Any):
+        if key in self._PROFILE_FIELDS or key == 'linkedin_url':
+            raise KeyError(f"{key} belongs to the shared profile")
+        super().__setitem__(key, value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScoredCandidate':
+        """Rebuild a candidate stored by to_dict() (e.g. a run's candidates.jsonl)"""
+        profile = EnrichedProfile(data.get('name') or '', data.get('headline') or '', data.get('location') or '',
+                                  '', data.get('linkedin_url') or '', data.get('education'),
+                                  data.get('experience'), data.get('skills'))
+        candidate = cls(profile, data.get('fit_score', 0.0), data.get('score_breakdown') or {})
+        for field in ('overall_grade', 'recommendation', 'explanation', 'outreach_message', 'message_source'):
+            if data.get(field) is not None:
+                setattr(candidate, field, data[field])
+        return candidate
@@ -0,0 +1,254 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from config import Config
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is short-circuited because its host is failing"""
+
+    def __init__(self, host: str):
+        super().__init__(f"circuit open for {host}")
+        self.host = host
+
+
+class RetryableStatusError(Exception):
+    """Raised internally when a response status is worth retrying"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+        self.status_code = response.status_code
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RetryPolicy:
+    """Jittered exponential backoff that honours Retry-After"""
+
+    def __init__(self, max_attempts: int = None, base_delay: float = None, max_delay: float = None,
+                 retry_statuses=(429, 500, 502, 503, 504), rng: random.Random = None):
+        self.max_attempts = max_attempts or Config.RETRY_MAX_ATTEMPTS
+        self.base_delay = Config.RETRY_BASE_DELAY if base_delay is None else base_delay
+        self.max_delay = Config.RETRY_MAX_DELAY if max_delay is None else max_delay
+        self.retry_statuses = set(retry_statuses)
+        self.rng = rng or random.Random()
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number `attempt` (1-based)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        # "Full jitter": uniform in [0, base * 2^attempt] so retries from many callers spread out
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return self.rng.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker: closed -> open after repeated failures -> half-open probe
+
+    Once the reset timeout has passed a single probe call is let through; every other
+    caller is short-circuited until the probe is recorded as a success or failure (or
+    released without a verdict).
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = Config.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may go through now"""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                # Let a single probe through; its outcome decides the next state
+                self.state = self.HALF_OPEN
+                return True
+            if self.state == self.CLOSED:
+                return True
+            # Open, or half-open with the probe still in flight
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release(self):
+        """End a call that says nothing about the host; a half-open probe goes back to waiting"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # opened_at is unchanged, so the next caller probes again
+                self.state = self.OPEN
+
+    def record_failure(self, fatal: bool = False):
+        """Count a failure; fatal failures (bad credentials) open the circuit at once"""
+        with self._lock:
+            self.failures += 1
+            if fatal or self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class ResilienceLayer:
+    """Retries with backoff plus per-host circuit breakers for all outbound calls"""
+
+    # Credentials are bad: retrying cannot help and the host should be skipped
+    FATAL_STATUSES = {401, 403}
+    # Client errors that mean the host is struggling rather than the request being wrong
+    FAILURE_STATUSES = {429}
+
+    def __init__(self, policy: RetryPolicy = None, session=None, sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policy = policy or RetryPolicy()
+        self.session = session or requests.Session()
+        self.sleep = sleep
+        self.clock = clock
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.stats = {'calls': 0, 'retries': 0, 'failures': 0, 'short_circuited': 0}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Get (or create) the circuit breaker for a host"""
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(clock=self.clock)
+            return self.breakers[host]
+
+    def is_open(self, host: str) -> bool:
+        """True while calls to host would be short-circuited"""
+        breaker = self.breakers.get(host)
+        return bool(breaker) and breaker.state == CircuitBreaker.OPEN and \
+            self.clock() - breaker.opened_at < breaker.reset_timeout
+
+    def call(self, host: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call func with retries and the host's circuit breaker
+
+        Retries on connection errors, timeouts and retryable HTTP statuses (including
+        SDK errors exposing `status_code`). Raises CircuitOpenError without calling func
+        when the host is failing, and re-raises the last error once retries run out.
+        Only 5xx, 429, bad credentials and transport errors count against the host's
+        circuit; other client errors (400, 404, ...) show the host is answering.
+        """
+        breaker = self.breaker(host)
+        attempt = 0
+
+        while True:
+            if not breaker.allow():
+                self._count('short_circuited')
+                raise CircuitOpenError(host)
+
+            attempt += 1
+            self._count('calls')
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                status = self._status_of(e)
+                fatal = status in self.FATAL_STATUSES
+                retryable = not fatal and self._is_retryable(e, status)
+                if fatal or self._is_host_failure(e, status):
+                    breaker.record_failure(fatal=fatal)
+                elif status is not None:
+                    breaker.record_success()
+                else:
+                    breaker.release()
+
+                if not retryable or attempt >= self.policy.max_attempts:
+                    self._count('failures')
+                    raise
+
+                self._count('retries')
+                self.sleep(self.policy.backoff(attempt, self._retry_after_of(e)))
+                continue
+
+            breaker.record_success()
+            return result
+
+    def _count(self, stat: str):
+        # Clients share the layer across worker threads
+        with self._lock:
+            self.stats[stat] += 1
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Make an HTTP request through the retry/circuit-breaker layer
+
+        Non-retryable responses (e.g. 404) are returned to the caller as-is; retryable ones
+        that never succeed are returned as the final response.
+        """
+        host = urlparse(url).netloc
+
+        def send():
+            response = self.session.request(method, url, **kwargs)
+            if response.status_code in self.policy.retry_statuses or response.status_code in self.FATAL_STATUSES:
+                raise RetryableStatusError(response)
+            return response
+
+        try:
+            return self.call(host, send)
+        except RetryableStatusError as e:
+            return e.response
+
+    def _status_of(self, error: Exception) -> Optional[int]:
+        status = getattr(error, 'status_code', None)
+        if status is None and getattr(error, 'response', None) is not None:
+            status = getattr(error.response, 'status_code', None)
+        return status
+
+    def _is_retryable(self, error: Exception, status: Optional[int]) -> bool:
+        if status is not None:
+            return status in self.policy.retry_statuses
+        return self._is_transport_error(error)
+
+    def _is_host_failure(self, error: Exception, status: Optional[int]) -> bool:
+        if status is not None:
+            return status >= 500 or status in self.FAILURE_STATUSES
+        return self._is_transport_error(error)
+
+    def _is_transport_error(self, error: Exception) -> bool:
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        # SDK transport errors (openai.APIConnectionError, anthropic.APITimeoutError, ...)
+        name = type(error).__name__
+        return 'Timeout' in name or 'Connection' in name
+
+    def _retry_after_of(self, error: Exception) -> Optional[float]:
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None)
+        if not headers:
+            return None
+        return parse_retry_after(headers.get('Retry-After') or headers.get('retry-after'))
+
+
+# Shared by every client so a failing host is detected once for the whole run
+default_layer = ResilienceLayer()
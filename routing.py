@@ -0,0 +1,124 @@
+import copy
+from typing import Any, Dict, List, Tuple
+
+from config import Config
+from enhanced_outreach import EnhancedOutreachGenerator
+from gpt_outreach import GPTOutreach, usage_since
+
+TIERS = ('premium', 'small', 'template')
+
+
+class OutreachRouter:
+    """
+    Routes each candidate's outreach to local templates, a small model or a premium model
+
+    The tier comes from the candidate's fit score band (Config.ROUTING_PREMIUM_SCORE /
+    ROUTING_SMALL_SCORE) and, with a budget, how much of it has been spent: past
+    ROUTING_PREMIUM_BUDGET_SHARE premium candidates get the small model, and once the
+    budget is gone everyone gets templates. Candidates are handled best first, so the
+    budget goes to them. message_source records the decision as "<tier>/<producer>",
+    e.g. "premium/gpt-4o", "small/claude-3-5-haiku-20241022" or "template/enhanced_local";
+    a failed LLM request shows as "<tier>/enhanced_local".
+    """
+
+    def __init__(self, gpt_outreach: GPTOutreach, provider: str = 'openai', budget: Tuple[float, str] = None,
+                 models: Dict[str, str] = None, templates: EnhancedOutreachGenerator = None):
+        self.gpt_outreach = gpt_outreach
+        self.provider = provider
+        self.budget = budget
+        self.models = models or Config.ROUTING_MODELS[provider]
+        # Template tier and failed requests; the orchestrator passes its own generator
+        self.templates = templates or EnhancedOutreachGenerator()
+        self._usage_start = None
+
+    @property
+    def usage(self) -> Dict[str, float]:
+        return self.gpt_outreach.usage
+
+    def start(self):
+        """Count budget spending from now (the start of a run)"""
+        self._usage_start = copy.deepcopy(self.gpt_outreach.usage)
+
+    def spent_share(self) -> float:
+        """Share of the budget spent since start() (0 without a budget)"""
+        if not self.budget:
+            return 0.0
+        usage = usage_since(self.gpt_outreach.usage, self._usage_start or {})
+        limit, unit = self.budget
+        spent = usage['cost_usd'] if unit == 'usd' else usage['input_tokens'] + usage['output_tokens']
+        return spent / limit
+
+    def tier(self, candidate: Dict[str, Any], spent_share: float = 0.0) -> str:
+        score = candidate.get('fit_score', 0)
+        if spent_share >= 1.0 or score < Config.ROUTING_SMALL_SCORE:
+            return 'template'
+        if score >= Config.ROUTING_PREMIUM_SCORE and spent_share < Config.ROUTING_PREMIUM_BUDGET_SHARE:
+            return 'premium'
+        return 'small'
+
+    def generate_bulk_outreach_messages(self, candidates: List[Dict[str, Any]], job_details: Dict[str, Any],
+                                        recruiter_name: str = "Recruitment Team") -> List[Dict[str, Any]]:
+        """
+        Generate outreach messages, each from the tier its candidate is routed to
+
+        Args:
+            candidates: List of candidate data
+            job_details: Job details
+            recruiter_name: Name of the recruiter
+
+        Returns:
+            The candidates, in the order given, with outreach_message and message_source set
+        """
+        if self._usage_start is None:
+            self.start()
+        ranked = sorted(candidates, key=lambda candidate: candidate.get('fit_score', 0), reverse=True)
+        counts = dict.fromkeys(TIERS, 0)
+
+        start = 0
+        while start < len(ranked):
+            # The budget is re-checked before every request; neighbours on the same tier share one
+            spent = self.spent_share()
+            tier = self.tier(ranked[start], spent)
+            end = start + 1
+            size = len(ranked) if tier == 'template' else Config.LLM_BATCH_SIZE
+            while end < len(ranked) and end - start < size and self.tier(ranked[end], spent) == tier:
+                end += 1
+            self._generate(ranked[start:end], tier, job_details, recruiter_name)
+            counts[tier] += end - start
+            start = end
+
+        print(f"   Routed {counts['premium']} to {self.models['premium']}, {counts['small']} to "
+              f"{self.models['small']}, {counts['template']} to local templates")
+        return list(candidates)
+
+    def route_stream(self, candidate: Dict[str, Any], job_details: Dict[str, Any], recruiter_name: str,
+                     on_text=None) -> Tuple[str, str, Dict[str, float]]:
+        """Streaming counterpart for a single candidate: (message, source, stream metrics)"""
+        if self._usage_start is None:
+            self.start()
+        tier = self.tier(candidate, self.spent_share())
+        if tier != 'template':
+            model = self.models[tier]
+            message, _, metrics = self.gpt_outreach.stream_message(
+                candidate, job_details, recruiter_name, self.provider == 'anthropic', on_text, model)
+            if message:
+                return message, f"{tier}/{model}", metrics
+        message = self.templates.generate_outreach_message(candidate, job_details, recruiter_name)
+        if on_text:
+            on_text(message)
+        return message, f"{tier}/enhanced_local", {}
+
+    def _generate(self, chunk: List[Dict[str, Any]], tier: str, job_details: Dict[str, Any], recruiter_name: str):
+        generated = [(None, None)] * len(chunk)
+        if tier != 'template':
+            model = self.models[tier]
+            generated = self.gpt_outreach.generate_messages(chunk, job_details, recruiter_name,
+                                                            use_anthropic=self.provider == 'anthropic', model=model)
+        for candidate, (message, _) in zip(chunk, generated):
+            if message:
+                candidate['outreach_message'] = message
+                candidate['message_source'] = f"{tier}/{self.models[tier]}"
+            else:
+                candidate['outreach_message'] = self.templates.generate_outreach_message(
+                    candidate, job_details, recruiter_name)
+                candidate['message_source'] = f"{tier}/enhanced_local"
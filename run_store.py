@@ -0,0 +1,120 @@
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import Config
+from gpt_outreach import add_usage
+from records import ScoredCandidate
+
+
+class RunRecorder:
+    """
+    Writes one run to disk as it happens
+
+    candidates.jsonl gets every scored candidate (profile fields plus score_breakdown)
+    before top-K selection trims it; run.json holds the job, weights, ranking and outreach.
+    """
+
+    def __init__(self, run_dir: str, run_id: str, job_details: Dict[str, Any], job_url: str = ''):
+        self.run_dir = run_dir
+        self.run_id = run_id
+        # Never write over another run
+        os.makedirs(os.path.dirname(run_dir) or '.', exist_ok=True)
+        os.mkdir(run_dir)
+        self.meta = {
+            'run_id': run_id,
+            'job_url': job_url,
+            'job_details': job_details,
+            'weights': dict(Config.SCORING_WEIGHTS),
+            'top_k': Config.TOP_K_CANDIDATES,
+            'ranking': [],
+            'outreach': {},
+            'candidates_found': 0,
+            'created_at': time.time()
+        }
+        self._candidates = open(os.path.join(run_dir, 'candidates.jsonl'), 'w', encoding='utf-8')
+
+    def record(self, candidate: ScoredCandidate):
+        self.meta['candidates_found'] += 1
+        if not isinstance(candidate, dict):
+            candidate = candidate.to_dict()
+        self._candidates.write(json.dumps(candidate, ensure_ascii=False) + '\n')
+
+    def finish(self, top_candidates: List[ScoredCandidate]):
+        """Store the final ranking and the outreach generated for it"""
+        self._candidates.close()
+        self.meta['ranking'] = [candidate['linkedin_url'] for candidate in top_candidates]
+        for candidate in top_candidates:
+            if 'outreach_message' in candidate:
+                self.meta['outreach'][candidate['linkedin_url']] = {
+                    'outreach_message': candidate['outreach_message'],
+                    'message_source': candidate.get('message_source', '')
+                }
+        RunStore.write_meta(self.run_dir, self.meta)
+
+
+class RunStore:
+    """Directory of past runs (one sub-directory per run id) used for rescoring"""
+
+    def __init__(self, root: str = None):
+        self.root = root or Config.RUNS_DIR
+
+    def start(self, run_id: str, job_details: Dict[str, Any], job_url: str = '') -> RunRecorder:
+        return RunRecorder(self.run_dir(run_id), run_id, job_details, job_url)
+
+    def run_dir(self, run_id: str) -> str:
+        return os.path.join(self.root, run_id)
+
+    def exists(self, run_id: str) -> bool:
+        return os.path.exists(os.path.join(self.run_dir(run_id), 'run.json'))
+
+    def load(self, run_id: str) -> Tuple[Dict[str, Any], List[ScoredCandidate]]:
+        """Load a run's metadata and every candidate scored in it"""
+        run_dir = self.run_dir(run_id)
+        meta = self.load_meta(run_id)
+        candidates = []
+        with open(os.path.join(run_dir, 'candidates.jsonl'), encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    candidates.append(ScoredCandidate.from_dict(json.loads(line)))
+        return meta, candidates
+
+    def load_meta(self, run_id: str) -> Dict[str, Any]:
+        with open(os.path.join(self.run_dir(run_id), 'run.json'), encoding='utf-8') as f:
+            return json.load(f)
+
+    def save_meta(self, meta: Dict[str, Any]):
+        meta['updated_at'] = time.time()
+        self.write_meta(self.run_dir(meta['run_id']), meta)
+
+    @staticmethod
+    def write_meta(run_dir: str, meta: Dict[str, Any]):
+        path = os.path.join(run_dir, 'run.json')
+        # Write then rename so an interrupted save never leaves a truncated run.json
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    def job_usage(self, job_url: str) -> Dict[str, Any]:
+        """LLM usage summed over every stored run of a job posting, with the number of runs"""
+        total = {}
+        runs = 0
+        for run_id in self.list_runs():
+            meta = self.load_meta(run_id)
+            if meta.get('job_url') == job_url and meta.get('llm_usage'):
+                add_usage(total, meta['llm_usage'])
+                runs += 1
+        total['runs'] = runs
+        return total
+
+    def list_runs(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if self.exists(name))
+
+    def latest(self) -> Optional[str]:
+        runs = self.list_runs()
+        if not runs:
+            return None
+        return max(runs, key=lambda run_id: os.path.getmtime(os.path.join(self.run_dir(run_id), 'run.json')))
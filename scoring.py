@@ -1,9 +1,58 @@
 import re
-from typing import Dict, List, Any
+from array import array
+from typing import Dict, List, Any, Tuple
 from config import Config
+from dates import PRESENT, current_month, parse_month
+from feature_cache import CandidateFeatures, FeatureCache, profile_key
+from geo import Gazetteer, Place, default_gazetteer, distance_km
+
+# Sub-score categories, in the order calculate_fit_score sums them
+SCORE_CATEGORIES = ('education', 'trajectory', 'company', 'skills', 'location', 'tenure')
+
+def weighted_fit_scores(breakdowns: List[Dict[str, float]], weights: Dict[str, float]) -> List[float]:
+    """
+    Recompute unrounded fit scores for many candidates from stored sub-scores
+    
+    Sub-scores are laid out as one column per category and combined column by column,
+    summing in the same order as calculate_fit_score so unchanged weights give
+    identical scores.
+    
+    Args:
+        breakdowns: score_breakdown dicts from calculate_fit_score
+        weights: Weight per category (same keys as Config.SCORING_WEIGHTS)
+        
+    Returns:
+        Weighted total per candidate, in input order
+    """
+    totals = array('d', bytes(8 * len(breakdowns)))
+    for category in SCORE_CATEGORIES:
+        weight = weights.get(category, 0.0)
+        column = array('d', [breakdown.get(category, 0.0) for breakdown in breakdowns])
+        totals = array('d', [total + value * weight for total, value in zip(totals, column)])
+    return list(totals)
+
+class JobScoringContext:
+    """
+    Job-side scoring inputs, normalized once per job and shared by every candidate
+    
+    Build one with CandidateScorer.compile_job() and pass it to calculate_fit_score()
+    so per-candidate work only covers the candidate side.
+    """
+    
+    __slots__ = ('job_requirements', 'skills', 'location', 'place', 'is_remote')
+    
+    def __init__(self, job_requirements: Dict[str, Any], skills: frozenset, location: str, place: Place):
+        self.job_requirements = job_requirements
+        self.skills = skills
+        self.location = location
+        self.place = place
+        self.is_remote = 'remote' in location
 
 class CandidateScorer:
-    def __init__(self):
+    def __init__(self, feature_cache: FeatureCache = None, gazetteer: Gazetteer = None):
+        # Job-independent candidate features, shared across every job a profile is scored for
+        self.feature_cache = FeatureCache() if feature_cache is None else feature_cache
+        
         # Elite schools list
         self.elite_schools = {
             'mit', 'stanford', 'harvard', 'caltech', 'princeton', 'yale', 'columbia',
@@ -40,42 +89,114 @@ class CandidateScorer:
             'ansible', 'chef', 'puppet', 'elasticsearch', 'kafka', 'rabbitmq',
             'nginx', 'apache', 'linux', 'unix', 'bash', 'shell scripting'
         }
+        
+        # Title keywords for progression, matched case-insensitively
+        self._senior_title = re.compile('senior|lead|principal|staff', re.IGNORECASE)
+        self._manager_title = re.compile('manager|director|head', re.IGNORECASE)
+        
+        # Month index used as the end of ongoing roles
+        self.today = current_month()
+        
+        # Parsed (start, end, senior, manager) per distinct (start_date, end_date, title);
+        # date strings and titles repeat heavily across profiles
+        self._role_cache = {}
+        
+        # Resolves free-text locations to city/metro/state/country (memoized)
+        self.gazetteer = gazetteer or default_gazetteer()
+    
+    def compile_job(self, job_requirements: Dict[str, Any]) -> JobScoringContext:
+        """
+        Normalize the job side of scoring once
+        
+        Args:
+            job_requirements: Dictionary containing job requirements
+            
+        Returns:
+            JobScoringContext to pass to calculate_fit_score for every candidate
+        """
+        job_skills = {skill.lower() for skill in job_requirements.get('skills') or []}
+        for req in job_requirements.get('requirements') or []:
+            req_lower = req.lower()
+            job_skills.update(skill for skill in self.technical_skills if skill in req_lower)
+        
+        location = (job_requirements.get('location') or '').lower()
+        place = self.gazetteer.resolve(location) if location else None
+        
+        return JobScoringContext(job_requirements, frozenset(job_skills), location, place)
     
-    def calculate_fit_score(self, candidate_data: Dict[str, Any], job_requirements: Dict[str, Any]) -> Dict[str, Any]:
+    def location_keys(self, location: str) -> tuple:
+        """
+        Keys for grouping profiles by place: the metro area if known, else the city
+        
+        Remote or empty locations have no keys.
+        """
+        location = (location or '').lower()
+        if not location or 'remote' in location:
+            return ()
+        place = self.gazetteer.resolve(location)
+        if place is not None and place.metro:
+            return ('metro:' + place.metro,)
+        if place is not None and place.city:
+            return (f"city:{place.city.lower()}|{place.state.lower()}",)
+        return ('city:' + ' '.join(location.split(',')[0].split()),)
+    
+    def calculate_fit_score(self, candidate_data: Dict[str, Any], job_requirements: Dict[str, Any],
+                            job_context: JobScoringContext = None) -> Dict[str, Any]:
         """
         Calculate comprehensive fit score for a candidate based on job requirements
         
         Args:
             candidate_data: Dictionary containing candidate information
             job_requirements: Dictionary containing job requirements
+            job_context: Precompiled job context from compile_job (built on the fly if omitted)
             
         Returns:
             Dictionary with detailed scoring breakdown matching required format
         """
+        job_context = job_context or self.compile_job(job_requirements)
+        fit_score, scores = self.score(candidate_data, job_context)
+        return {
+            'fit_score': fit_score,
+            'score_breakdown': scores,
+            'overall_grade': self._get_grade(fit_score),
+            'recommendation': self._get_recommendation(fit_score)
+        }
+    
+    def score(self, candidate_data: Dict[str, Any], job_context: JobScoringContext) -> Tuple[float, Dict[str, float]]:
+        """
+        Numeric fit score used for ranking: just the score and its breakdown
+        
+        Grades, recommendations and rationale are left to explain(), which only
+        shortlisted candidates need.
+        
+        Returns:
+            (fit_score, score_breakdown)
+        """
+        features = self.featurize(candidate_data)
         scores = {}
         
         # Education Score (20%)
-        education_score = self._score_education(candidate_data.get('education', []))
+        education_score = features.education
         scores['education'] = education_score
         
         # Career Trajectory Score (20%)
-        trajectory_score = self._score_career_trajectory(candidate_data.get('experience', []))
+        trajectory_score = features.trajectory
         scores['trajectory'] = trajectory_score
         
         # Company Relevance Score (15%)
-        company_score = self._score_company_relevance(candidate_data.get('experience', []))
+        company_score = features.company
         scores['company'] = company_score
         
         # Experience Match Score (25%)
-        skills_score = self._score_experience_match(candidate_data, job_requirements)
+        skills_score = self._score_skill_overlap(features.skills, job_context)
         scores['skills'] = skills_score
         
         # Location Match Score (10%)
-        location_score = self._score_location_match(candidate_data.get('location', ''), job_requirements.get('location', ''))
+        location_score = self._score_location_match(features.location, job_context)
         scores['location'] = location_score
         
         # Tenure Score (10%)
-        tenure_score = self._score_tenure(candidate_data.get('experience', []))
+        tenure_score = features.tenure
         scores['tenure'] = tenure_score
         
         # Calculate total weighted score
@@ -88,13 +209,172 @@ class CandidateScorer:
             tenure_score * Config.SCORING_WEIGHTS['tenure']
         )
         
+        return round(total_score, 2), scores
+    
+    def explain(self, candidate_data: Dict[str, Any], job_requirements: Dict[str, Any],
+                job_context: JobScoringContext = None) -> Dict[str, Any]:
+        """
+        Score card for a shortlisted candidate: grade, recommendation and what drove each score
+        
+        Args:
+            candidate_data: Profile or scored candidate (its fit_score is used when present)
+            job_requirements: Dictionary containing job requirements
+            job_context: Precompiled job context from compile_job (built on the fly if omitted)
+            
+        Returns:
+            Dictionary with overall_grade, recommendation and an explanation of matched
+            and missing skills, the school and companies that scored, career steps,
+            average tenure and the location match
+        """
+        job_context = job_context or self.compile_job(job_requirements)
+        fit_score = candidate_data.get('fit_score')
+        if fit_score is None:
+            fit_score = self.score(candidate_data, job_context)[0]
+        features = self.featurize(candidate_data)
+        education = candidate_data.get('education', [])
+        experience = candidate_data.get('experience', [])
+        
+        school = max(education, key=lambda edu: self._score_education([edu]), default=None)
+        top_companies = []
+        for exp in experience:
+            company = exp.get('company', '')
+            if company and company not in top_companies and \
+               any(tech_company in company.lower() for tech_company in self.top_tech_companies):
+                top_companies.append(company)
+        promotions, average_years = self._explain_timeline(experience)
+        
+        explanation = {
+            'matched_skills': sorted(features.skills & job_context.skills),
+            'missing_skills': sorted(job_context.skills - features.skills),
+            'school': {'school': school.get('school', ''), 'degree': school.get('degree', ''),
+                       'elite': any(elite in school.get('school', '').lower() for elite in self.elite_schools)}
+                      if school else None,
+            'top_companies': top_companies,
+            'promotions': promotions,
+            'average_tenure_years': average_years,
+            'location': self._explain_location(features.location, job_context)
+        }
         return {
-            'fit_score': round(total_score, 2),
-            'score_breakdown': scores,
-            'overall_grade': self._get_grade(total_score),
-            'recommendation': self._get_recommendation(total_score)
+            'overall_grade': self._get_grade(fit_score),
+            'recommendation': self._get_recommendation(fit_score),
+            'explanation': explanation
         }
     
+    def _explain_timeline(self, experience: List[Dict]) -> tuple:
+        """Title steps counted as progression and average completed-role length in years, oldest role first"""
+        roles = []
+        for exp in experience:
+            role = self._parse_role(exp.get('start_date'), exp.get('end_date'), exp.get('title', ''))
+            if role is not None:
+                roles.append((role, exp.get('title', '')))
+        if not roles:
+            # Undated profiles are scored in list order
+            roles = [((None, None, bool(self._senior_title.search(exp.get('title', ''))),
+                       bool(self._manager_title.search(exp.get('title', '')))), exp.get('title', ''))
+                     for exp in experience]
+        else:
+            roles.sort(key=lambda item: item[0][0])
+        
+        promotions = []
+        for (previous, previous_title), (role, title) in zip(roles, roles[1:]):
+            if (role[2] and not previous[2]) or (not role[2] and role[3] and not previous[3]):
+                promotions.append(f"{previous_title} → {title}")
+        
+        completed = [role[1] - role[0] + 1 for role, _ in roles
+                     if role[0] is not None and role[1] is not None and role[1] != PRESENT]
+        average_years = round(sum(completed) / len(completed) / 12, 1) if completed else None
+        return promotions, average_years
+    
+    def _explain_location(self, candidate_location: str, job_context: JobScoringContext) -> str:
+        """Why the location scored what it did (mirrors _score_location_match)"""
+        score = self._score_location_match(candidate_location, job_context)
+        if not candidate_location or not job_context.location:
+            return 'location unknown'
+        if score == 10.0:
+            return 'same city'
+        
+        candidate = self.gazetteer.resolve(candidate_location.lower())
+        job = job_context.place
+        distance = distance_km(candidate, job) if candidate is not None and job is not None else None
+        if score == 8.0:
+            if candidate.metro and candidate.metro == job.metro:
+                return f"same metro area ({candidate.metro})"
+            return f"{distance:.0f} km away"
+        if score == 7.0:
+            if candidate.state and candidate.state == job.state:
+                return f"same state ({candidate.state})"
+            return f"{distance:.0f} km away"
+        if score == 6.0:
+            return 'remote'
+        return 'different location' + (f" ({distance:.0f} km away)" if distance is not None else '')
+    
+    def featurize(self, candidate_data: Dict[str, Any]) -> CandidateFeatures:
+        """
+        Job-independent features of a profile, cached by a hash of its content
+        
+        Args:
+            candidate_data: Dictionary containing candidate information
+            
+        Returns:
+            CandidateFeatures with the education, trajectory, company and tenure scores,
+            the candidate's skill set and location
+        """
+        key = profile_key(candidate_data, self.today)
+        features = self.feature_cache.get(key)
+        if features is None:
+            features = self._compute_features(candidate_data)
+            self.feature_cache.put(key, features)
+        return features
+    
+    def _compute_features(self, candidate_data: Dict[str, Any]) -> CandidateFeatures:
+        experience = candidate_data.get('experience', [])
+        trajectory, tenure = self._score_timeline(experience)
+        return CandidateFeatures(
+            education=self._score_education(candidate_data.get('education', [])),
+            trajectory=trajectory,
+            company=self._score_company_relevance(experience),
+            tenure=tenure,
+            skills=self._candidate_skills(candidate_data),
+            location=candidate_data.get('location', '') or ''
+        )
+    
+    def estimate_fit_score(self, profile_stub: Dict[str, Any], job_requirements: Dict[str, Any],
+                           job_context: JobScoringContext = None) -> float:
+        """
+        Cheap fit estimate from search-result data only (headline, company, location, snippet)
+        
+        Used to decide which profiles are worth enriching. Only the current role is known
+        before enrichment, so education, trajectory and tenure score neutral.
+        
+        Args:
+            profile_stub: Search result with snippet-derived headline, company and location
+            job_requirements: Dictionary containing job requirements
+            job_context: Precompiled job context from compile_job (built on the fly if omitted)
+            
+        Returns:
+            Estimated fit score on the same 0-10 scale as calculate_fit_score
+        """
+        job_context = job_context or self.compile_job(job_requirements)
+        headline = profile_stub.get('headline', '')
+        text = f"{headline} {profile_stub.get('snippet', '')}".lower()
+        
+        candidate = {
+            'skills': [skill for skill in job_context.skills.union(self.technical_skills) if skill in text],
+            'experience': [{'title': headline, 'company': profile_stub.get('company', '') or headline}]
+        }
+        
+        scores = {
+            'education': 5.0,
+            'trajectory': 5.0,
+            'company': self._score_company_relevance(candidate['experience']),
+            'skills': self._score_experience_match(candidate, job_context),
+            'location': self._score_location_match(profile_stub.get('location', ''), job_context),
+            'tenure': 5.0
+        }
+        
+        total_score = sum(score * Config.SCORING_WEIGHTS[category] for category, score in scores.items())
+        return round(total_score, 2)
+    
     def _score_education(self, education: List[Dict]) -> float:
         """Score education based on school prestige and degree progression"""
         if not education:
@@ -125,6 +405,104 @@ class CandidateScorer:
     
     def _score_career_trajectory(self, experience: List[Dict]) -> float:
         """Score career trajectory based on progression and growth"""
+        return self._score_timeline(experience)[0]
+    
+    def _score_tenure(self, experience: List[Dict]) -> float:
+        """Score tenure based on job stability"""
+        return self._score_timeline(experience)[1]
+    
+    def _score_timeline(self, experience: List[Dict]) -> tuple:
+        """
+        Score trajectory and tenure together from dated roles, in one pass over them
+        
+        Roles are put in chronological order by start date. Trajectory counts title
+        progression between consecutive roles. Tenure averages completed role lengths;
+        an ongoing role is included once it already outlasts that average. Profiles
+        without parseable dates fall back to the list-order heuristics.
+        
+        Returns:
+            (trajectory_score, tenure_score)
+        """
+        if not experience:
+            return 5.0, 5.0
+        
+        roles = []
+        newest_first = oldest_first = True
+        role_cache = self._role_cache
+        for exp in experience:
+            key = (exp.get('start_date'), exp.get('end_date'), exp.get('title', ''))
+            try:
+                role = role_cache[key]
+            except KeyError:
+                if len(role_cache) >= 50000:
+                    role_cache.clear()
+                role = role_cache[key] = self._parse_role(*key)
+            except TypeError:
+                # Unhashable dates (API dicts) are parsed without caching
+                role = self._parse_role(*key)
+            if role is None:
+                continue
+            if roles:
+                previous_start = roles[-1][0]
+                newest_first = newest_first and role[0] <= previous_start
+                oldest_first = oldest_first and role[0] >= previous_start
+            roles.append(role)
+        if not roles:
+            return self._heuristic_trajectory(experience), self._heuristic_tenure(experience)
+        
+        # APIs list roles newest first; only sort when the order is mixed
+        if newest_first:
+            roles.reverse()
+        elif not oldest_first:
+            roles.sort(key=lambda role: role[0])
+        
+        today = self.today
+        progression_score = 0
+        previous_senior = previous_manager = None
+        completed_months = completed_roles = ongoing_months = 0
+        
+        for start, end, senior, manager in roles:
+            if previous_senior is not None:
+                if senior:
+                    if not previous_senior:
+                        progression_score += 2
+                elif manager and not previous_manager:
+                    progression_score += 3
+            previous_senior, previous_manager = senior, manager
+            
+            if end is None or end == PRESENT:
+                ongoing_months = max(ongoing_months, today - start + 1)
+            else:
+                completed_months += max(1, end - start + 1)
+                completed_roles += 1
+        
+        if len(roles) > 1:
+            trajectory = min(progression_score / (len(roles) - 1) + 5, 10.0)
+        else:
+            trajectory = 5.0
+        
+        if completed_roles:
+            average = completed_months / completed_roles
+            if ongoing_months > average:
+                average = (completed_months + ongoing_months) / (completed_roles + 1)
+        elif ongoing_months >= 12:
+            average = ongoing_months
+        else:
+            return trajectory, 5.0  # Only a recent current role: too early to judge
+        
+        return trajectory, self._tenure_score_for_years(average / 12)
+    
+    def _parse_role(self, start_date, end_date, title: str):
+        """(start, end, senior, manager) for a role, or None if its start date is unknown"""
+        start = parse_month(start_date)
+        if start is None or start == PRESENT:
+            return None
+        return (start, parse_month(end_date),
+                self._senior_title.search(title or '') is not None,
+                self._manager_title.search(title or '') is not None)
+    
+    def _heuristic_trajectory(self, experience: List[Dict]) -> float:
+        """Trajectory from list order, for profiles without dates"""
         if not experience or len(experience) < 2:
             return 5.0  # Neutral score for insufficient data
         
@@ -184,8 +562,12 @@ class CandidateScorer:
         
         return 5.0
     
-    def _score_experience_match(self, candidate_data: Dict, job_requirements: Dict) -> float:
+    def _score_experience_match(self, candidate_data: Dict, job_context: JobScoringContext) -> float:
         """Score experience match based on skills and requirements"""
+        return self._score_skill_overlap(self._candidate_skills(candidate_data), job_context)
+    
+    def _candidate_skills(self, candidate_data: Dict) -> set:
+        """Skills listed on the profile plus known technical skills mentioned in experience"""
         candidate_skills = set()
         
         # Extract skills from various sources
@@ -202,17 +584,11 @@ class CandidateScorer:
                     if skill in title or skill in description:
                         candidate_skills.add(skill)
         
-        # Get job requirements
-        job_skills = set()
-        if 'skills' in job_requirements:
-            job_skills.update(skill.lower() for skill in job_requirements['skills'])
-        
-        if 'requirements' in job_requirements:
-            for req in job_requirements['requirements']:
-                req_lower = req.lower()
-                for skill in self.technical_skills:
-                    if skill in req_lower:
-                        job_skills.add(skill)
+        return candidate_skills
+    
+    def _score_skill_overlap(self, candidate_skills, job_context: JobScoringContext) -> float:
+        """Score the share of the job's skills the candidate has"""
+        job_skills = job_context.skills
         
         # Calculate match
         if not job_skills:
@@ -234,40 +610,46 @@ class CandidateScorer:
         
         return 5.0
     
-    def _score_location_match(self, candidate_location: str, job_location: str) -> float:
+    def _score_location_match(self, candidate_location: str, job_context: JobScoringContext) -> float:
         """Score location match"""
-        if not candidate_location or not job_location:
+        if not candidate_location or not job_context.location:
             return 6.0  # Neutral for remote-friendly positions
         
         candidate_loc = candidate_location.lower()
-        job_loc = job_location.lower()
         
-        # Exact city match
-        if candidate_loc == job_loc:
+        # Exact match
+        if candidate_loc == job_context.location:
             return 10.0
         
-        # Same metro area (simplified)
-        if any(city in candidate_loc for city in ['san francisco', 'san jose', 'oakland']) and \
-           any(city in job_loc for city in ['san francisco', 'san jose', 'oakland']):
-            return 8.0
+        candidate = self.gazetteer.resolve(candidate_loc)
+        job = job_context.place
+        if candidate is None or job is None:
+            # Unknown place: nothing to compare beyond the remote flag
+            return 6.0 if 'remote' in candidate_loc or job_context.is_remote else 4.0
+        
+        # Same city
+        if candidate.city and candidate.city == job.city and candidate.state == job.state:
+            return 10.0
         
-        if any(city in candidate_loc for city in ['new york', 'brooklyn', 'queens']) and \
-           any(city in job_loc for city in ['new york', 'brooklyn', 'queens']):
+        # Same metro area, or close enough to commute
+        distance = distance_km(candidate, job)
+        if (candidate.metro and candidate.metro == job.metro) or \
+           (distance is not None and distance <= Config.GEO_METRO_RADIUS_KM):
             return 8.0
         
         # Remote indicators
-        if 'remote' in candidate_loc or 'remote' in job_loc:
+        if candidate.remote or job.remote:
             return 6.0
         
-        # Same state
-        if any(state in candidate_loc for state in ['california', 'ca']) and \
-           any(state in job_loc for state in ['california', 'ca']):
+        # Same state, or nearby across a state line
+        if (candidate.state and candidate.state == job.state and candidate.country == job.country) or \
+           (distance is not None and distance <= Config.GEO_REGION_RADIUS_KM):
             return 7.0
         
         return 4.0  # Different locations
     
-    def _score_tenure(self, experience: List[Dict]) -> float:
-        """Score tenure based on job stability"""
+    def _heuristic_tenure(self, experience: List[Dict]) -> float:
+        """Tenure for profiles without dates"""
         if not experience:
             return 5.0
         
@@ -278,6 +660,10 @@ class CandidateScorer:
             # Simple heuristic: more roles = potentially shorter tenure
             avg_tenure = 2.0 / len(experience)
         
+        return self._tenure_score_for_years(avg_tenure)
+    
+    def _tenure_score_for_years(self, avg_tenure: float) -> float:
+        """Map average years per role to a tenure score"""
         if avg_tenure >= 2.0:
             return 9.5
         elif avg_tenure >= 1.5:
@@ -0,0 +1,198 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from geo import Gazetteer, default_gazetteer
+
+WORK_MODES = ['remote', 'hybrid', 'on-site']
+
+# Decorations LinkedIn wraps around a place name ("Greater Boston Area")
+LOCATION_PREFIXES = ('greater ',)
+LOCATION_SUFFIXES = (' bay area', ' metropolitan area', ' metro area', ' metroplex', ' area')
+
+# Words that mark a segment as a job title rather than a person's name
+ROLE_WORDS = {
+    'engineer', 'developer', 'manager', 'scientist', 'analyst', 'designer',
+    'architect', 'consultant', 'director', 'founder', 'co-founder', 'ceo', 'cto',
+    'vp', 'president', 'officer', 'head', 'lead', 'senior', 'junior', 'staff',
+    'principal', 'intern', 'student', 'graduate', 'recruiter', 'specialist',
+    'researcher', 'professor', 'software', 'data', 'product', 'full', 'stack'
+}
+
+
+class SnippetParser:
+    """Parse Google result snippets for LinkedIn profiles into structured fields"""
+
+    # Separators used by LinkedIn titles/snippets: " - ", " – ", " · ", " | "
+    _SEGMENT_RE = re.compile(r'\s+[-–—·|]\s+')
+    _LABEL_RE = re.compile(r'\b(Location|Experience|Education)\s*:\s*([^·|]+?)(?=\s*(?:[·|]|\b(?:Location|Experience|Education)\s*:|\d+\+? connections|$))')
+    _AT_RE = re.compile(r'\s+(?:at|@)\s+', re.IGNORECASE)
+    _TOKEN_RE = re.compile(r"[A-Za-z][A-Za-z'\-]*")
+    _NAME_RE = re.compile(r"^[A-Z][\w'.\-]*(?:\s+[A-Z][\w'.\-]*){0,3}$")
+
+    def __init__(self, gazetteer: Gazetteer = None, cache_size: int = 65536):
+        # Place names come from the gazetteer that scoring resolves locations with (geo.Gazetteer).
+        # kind per full phrase, plus first-token -> phrases index for O(1) token lookup
+        self.places: Dict[str, str] = {}
+        self.state_abbreviations = set()
+        for name, kind in (gazetteer or default_gazetteer()).entries():
+            if len(name) == 2 and kind != 'country':
+                # "CA", "IN", "ME" are only places after a comma ("Austin, TX"), never on their own
+                self.state_abbreviations.add(name)
+            else:
+                # Rows of a repeated name come most likely first
+                self.places.setdefault(name, kind)
+        for mode in WORK_MODES:
+            self.places[mode] = 'work_mode'
+
+        self.phrase_index: Dict[str, List[Tuple[str, ...]]] = {}
+        for phrase in self.places:
+            tokens = tuple(phrase.split())
+            self.phrase_index.setdefault(tokens[0], []).append(tokens)
+        # Longest phrase first so "new york city" style matches win
+        for phrases in self.phrase_index.values():
+            phrases.sort(key=len, reverse=True)
+
+        # The same place strings ("San Francisco Bay Area") end most snippets, so whole-segment checks are memoized
+        self.is_location = lru_cache(maxsize=cache_size)(self._is_location)
+
+    def parse(self, snippet: str) -> Dict[str, str]:
+        """
+        Parse a snippet into name, headline, company and location
+
+        Args:
+            snippet: Snippet text from a Google search result
+
+        Returns:
+            Dictionary with 'name', 'headline', 'company' and 'location' keys
+        """
+        result = {'name': '', 'headline': '', 'company': '', 'location': ''}
+        if not snippet:
+            return result
+
+        # Labelled fields ("Location: Seattle · Experience: Amazon") are the most reliable
+        labels = {}
+        if ':' in snippet:
+            for match in self._LABEL_RE.finditer(snippet):
+                labels.setdefault(match.group(1).lower(), match.group(2).strip(' .,'))
+            if labels:
+                snippet = self._LABEL_RE.sub('', snippet)
+
+        segments = []
+        for segment in self._SEGMENT_RE.split(snippet):
+            segment = segment.strip(' .,…')
+            if segment and segment != 'LinkedIn':
+                segments.append(segment)
+
+        # The location is normally the trailing segment, so scan from the end
+        location = labels.get('location', '')
+        if not location:
+            for i in range(len(segments) - 1, -1, -1):
+                if self.is_location(segments[i]):
+                    location = segments.pop(i)
+                    break
+        free_segments = segments
+
+        if free_segments and self.looks_like_name(free_segments[0]):
+            result['name'] = free_segments.pop(0)
+
+        if free_segments:
+            result['headline'] = free_segments.pop(0)
+
+        company = labels.get('experience', '')
+        headline = result['headline']
+        # Most headlines have no "at"/"@" at all; only those are worth the regex
+        if not company and headline and ('@' in headline or 'at' in headline.lower()):
+            parts = self._AT_RE.split(headline, maxsplit=1)
+            if len(parts) == 2:
+                company = parts[1].strip()
+        if not company and free_segments and len(free_segments[0]) <= 60:
+            company = free_segments[0]
+        result['company'] = company
+
+        if not location:
+            location = self.find_location(snippet)
+        result['location'] = location
+
+        return result
+
+    def looks_like_name(self, text: str) -> bool:
+        """Return True for short capitalised segments that are not job titles"""
+        if not self._NAME_RE.match(text):
+            return False
+        return ROLE_WORDS.isdisjoint(text.lower().split())
+
+    def _is_location(self, text: str) -> bool:
+        """Return True if the whole text reads as a place ("Austin, Texas Metropolitan Area"); see is_location"""
+        if not text[0].isupper():
+            return False
+        parts = text.lower().split(',')
+        if not self._lookup_part(parts[0].strip()):
+            return False
+        for part in parts[1:]:
+            if not self._lookup_part(part.strip(), allow_abbreviation=True):
+                return False
+        return True
+
+    def find_location(self, text: str) -> str:
+        """Find the first gazetteer place mentioned in free text, or '' if none"""
+        tokens = [(m.group(0), m.start(), m.end()) for m in self._TOKEN_RE.finditer(text)]
+        lowered = [t[0].lower() for t in tokens]
+
+        for i, token in enumerate(lowered):
+            # Place names are proper nouns, so lowercase words ("remote work") never start a match
+            if token not in self.phrase_index or not tokens[i][0][0].isupper():
+                continue
+            length = self._match_phrase(lowered, i)
+            if not length:
+                continue
+            start = tokens[i][1]
+            nxt = i + length
+            # Extend over trailing ", State" / ", Country" qualifiers
+            while nxt < len(tokens) and text[tokens[nxt - 1][2]:tokens[nxt][1]].strip() == ',':
+                length = self._match_phrase(lowered, nxt)
+                if not length and lowered[nxt] in self.state_abbreviations:
+                    length = 1
+                if not length:
+                    break
+                nxt += length
+            return text[start:tokens[nxt - 1][2]]
+        return ''
+
+    def _match_phrase(self, lowered: List[str], i: int) -> int:
+        """Return the token length of the longest gazetteer phrase starting at i, or 0"""
+        for phrase in self.phrase_index.get(lowered[i], ()):
+            if tuple(lowered[i:i + len(phrase)]) == phrase:
+                return len(phrase)
+        return 0
+
+    def _lookup_part(self, part: str, allow_abbreviation: bool = False) -> Optional[str]:
+        """Resolve one comma-separated part to a gazetteer kind"""
+        kind = self.places.get(part)
+        if kind:
+            return kind
+        if allow_abbreviation and part in self.state_abbreviations:
+            return 'state'
+        if ' ' not in part:
+            return None
+        for prefix in LOCATION_PREFIXES:
+            if part.startswith(prefix):
+                part = part[len(prefix):]
+        for suffix in LOCATION_SUFFIXES:
+            if part.endswith(suffix):
+                part = part[:-len(suffix)]
+                break
+        return self.places.get(part)
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = SnippetParser()
+    samples = [
+        "Jane Doe - Senior Software Engineer at Google - San Francisco Bay Area",
+        "Senior Data Scientist · Experience: Netflix · Education: Stanford University · Location: Los Gatos · 500+ connections on LinkedIn.",
+        "John Smith - Backend Engineer - Stripe | LinkedIn",
+    ]
+    for sample in samples:
+        print(sample)
+        print(f"  -> {parser.parse(sample)}")
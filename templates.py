@@ -0,0 +1,90 @@
+import re
+from string import Formatter
+from typing import Any, Dict, List, Mapping, Tuple
+
+_BLANK_LINES = re.compile(r'\n\s*\n')
+
+
+def clean_text(text: str) -> str:
+    """Collapse runs of blank lines and trim the ends"""
+    return _BLANK_LINES.sub('\n\n', text).strip()
+
+
+def job_fields(job_details: Dict[str, Any], recruiter_name: str) -> Dict[str, str]:
+    """Template fields that are the same for every candidate of a job"""
+    return {
+        'job_title': job_details.get('title', 'this position'),
+        'company': job_details.get('company', 'our company'),
+        'location': job_details.get('location', 'our location'),
+        'recruiter_name': recruiter_name
+    }
+
+
+def job_key(job_details: Dict[str, Any], recruiter_name: str) -> tuple:
+    """Identity of a job for caching templates bound to it"""
+    return (job_details.get('title'), job_details.get('company'), job_details.get('location'),
+            tuple(job_details.get('skills') or ()), recruiter_name)
+
+
+class CompiledTemplate:
+    """
+    A str.format template parsed once into literal text and named fields
+
+    The text is cleaned (runs of blank lines collapsed, ends trimmed) when compiled
+    instead of after every render. bind() fills fields that stay the same across
+    many renders, such as the job's title and company, so render() only has to
+    place the per-candidate values and join.
+    """
+
+    __slots__ = ('fields', '_parts', '_slots')
+
+    def __init__(self, template: str):
+        tokens = []
+        for literal, field, spec, conversion in Formatter().parse(clean_text(template)):
+            if literal:
+                tokens.append((False, literal))
+            if field is not None:
+                if spec or conversion or not field.isidentifier():
+                    raise ValueError(f"Unsupported template field: {{{field}}}")
+                tokens.append((True, field))
+        self._compile(tokens)
+
+    def _compile(self, tokens: List[Tuple[bool, str]]):
+        parts, slots = [], []
+        after_literal = False
+        for is_field, text in tokens:
+            if is_field:
+                slots.append((len(parts), text))
+                parts.append('')
+                after_literal = False
+            elif after_literal:
+                parts[-1] += text  # Adjacent literals (e.g. around a bound field) become one
+            else:
+                parts.append(text)
+                after_literal = True
+        self._parts = parts
+        self._slots = tuple(slots)
+        self.fields = frozenset(name for _, name in slots)
+
+    def _tokens(self) -> List[Tuple[bool, str]]:
+        names = dict(self._slots)
+        return [(True, names[index]) if index in names else (False, part) for index, part in enumerate(self._parts)]
+
+    def bind(self, values: Mapping[str, Any]) -> 'CompiledTemplate':
+        """A copy with the given fields filled in; fields not in values stay open"""
+        tokens = [(False, _text(values[text])) if is_field and text in values else (is_field, text)
+                  for is_field, text in self._tokens()]
+        bound = CompiledTemplate.__new__(CompiledTemplate)
+        bound._compile(tokens)
+        return bound
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Fill the open fields (KeyError if one is missing, like str.format)"""
+        parts = self._parts[:]
+        for index, name in self._slots:
+            parts[index] = _text(values[name])
+        return ''.join(parts)
+
+
+def _text(value: Any) -> str:
+    return value if value.__class__ is str else format(value)
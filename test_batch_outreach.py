@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test Batched LLM Outreach
+=========================
+
+Checks that several candidates share one LLM request and that bad items are retried one at a time.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+from benchmarks import BENCH_JOB, synthetic_profiles
+from config import Config
+from gpt_outreach import GPTOutreach
+
+class FakeAnthropic:
+    """Answers batch requests with JSON; drop/corrupt lets a test break chosen candidate ids"""
+
+    def __init__(self, drop=(), corrupt=()):
+        self.requests = []
+        self.drop = set(drop)
+        self.corrupt = set(corrupt)
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = kwargs['messages'][0]['content']
+        names = [block.split('\n')[0] for block in content.split('Name: ')[1:]]
+        if len(names) == 1:
+            text = f"Hi {names[0]},\n\nSingle message."
+        else:
+            items = []
+            for i, name in enumerate(names, 1):
+                if i in self.drop:
+                    continue
+                items.append({'id': i, 'message': '' if i in self.corrupt else f"Hi {name},\n\nBatched message."})
+            text = "Here you go:\n" + json.dumps({'messages': items})
+        usage = SimpleNamespace(input_tokens=50, output_tokens=100 * len(names),
+                                cache_creation_input_tokens=0, cache_read_input_tokens=0)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+def _outreach(client, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    outreach = GPTOutreach()
+    outreach.anthropic_client = client
+    return outreach
+
+def test_batches_split_into_messages_per_candidate(monkeypatch):
+    outreach = _outreach(FakeAnthropic(), monkeypatch)
+    profiles = list(synthetic_profiles(7))
+    results = outreach.generate_messages(profiles, BENCH_JOB, use_anthropic=True, batch_size=3)
+
+    assert len(outreach.anthropic_client.requests) == 3
+    for profile, (message, source) in zip(profiles, results):
+        assert source == 'claude'
+        assert message == f"Hi {profile['name']},\n\nBatched message." or message.startswith(f"Hi {profile['name']},")
+    assert 'JSON' in outreach.anthropic_client.requests[0]['system'][0]['text']
+
+def test_failed_items_are_retried_individually(monkeypatch):
+    outreach = _outreach(FakeAnthropic(drop={2}, corrupt={3}), monkeypatch)
+    profiles = list(synthetic_profiles(4))
+    results = outreach.generate_messages(profiles, BENCH_JOB, use_anthropic=True, batch_size=4)
+
+    assert len(outreach.anthropic_client.requests) == 3
+    assert [message.endswith('Single message.') for message, _ in results] == [False, True, True, False]
+
+def test_swapped_or_unparseable_replies_are_rejected():
+    outreach = GPTOutreach()
+    profiles = [dict(profile, name=name) for profile, name in zip(synthetic_profiles(2), ('Ada Park', 'Ben Ortiz'))]
+    second = 'Ben'
+    swapped = json.dumps({'messages': [{'id': 1, 'message': f"Hi {second}, ..."},
+                                       {'id': 2, 'message': f"Hi {second}, ..."},
+                                       {'id': 2, 'message': f"Hi {second}, again"}]})
+    assert outreach._parse_batch(swapped, profiles) == [None, f"Hi {second}, ..."]
+    assert outreach._parse_batch("not json", profiles) == [None, None]
+    assert outreach._parse_batch('{"messages": [{"id": "1", "message": "Hi"}]}', profiles) == [None, None]
+
+def test_batch_size_comes_from_config(monkeypatch):
+    monkeypatch.setattr(Config, 'LLM_BATCH_SIZE', 1)
+    outreach = _outreach(FakeAnthropic(), monkeypatch)
+    results = outreach.generate_messages(list(synthetic_profiles(3)), BENCH_JOB, use_anthropic=True)
+
+    assert len(outreach.anthropic_client.requests) == 3
+    assert all(message.endswith('Single message.') for message, _ in results)
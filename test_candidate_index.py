@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test Candidate Index
+====================
+
+Checks posting-list shortlisting against a brute-force scan and its use as a candidate source.
+"""
+
+import os
+from benchmarks import BENCH_JOB, synthetic_profiles
+from candidate_index import CandidateIndex
+from config import Config
+from job_orchestrator import JobOrchestrator
+from linkedin_search import LinkedInProfileSearcher
+
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_profiles.jsonl')
+
+def test_query_matches_brute_force():
+    index = CandidateIndex(LinkedInProfileSearcher())
+    profiles = list(synthetic_profiles(500))
+    for profile in profiles:
+        index.add(profile)
+
+    skills = {'python', 'react', 'aws', 'docker', 'go'}
+    locations = ['metro:new_york']
+    for min_skills in (1, 3, 5):
+        expected = [p['name'] for p in profiles
+                    if len(index.scorer.featurize(p).skills & skills) >= min_skills
+                    and 'metro:new_york' in index.scorer.location_keys(p['location'])]
+        found = index.query(skills, min_skills, locations=locations)
+        assert sorted(p['name'] for p in found) == sorted(expected)
+
+    assert index.query(skills, 6) == []
+
+def test_newer_profile_replaces_older():
+    index = CandidateIndex(LinkedInProfileSearcher())
+    old = next(synthetic_profiles(1))
+    new = dict(old, skills=['Rust'], experience=[], location='Seattle, WA')
+    index.add(old)
+    index.add(new)
+
+    assert len(index) == 1
+    assert [p.to_dict() for p in index.query(['rust'], 1)] == [new]
+    assert index.query(['python', 'java', 'javascript', 'react', 'aws', 'docker', 'sql', 'go'], 1) == []
+    assert [p.to_dict() for p in index.query(['rust'], 1, locations=['metro:seattle'])] == [new]
+
+def test_dump_and_company_filters():
+    index = CandidateIndex(LinkedInProfileSearcher())
+    assert index.add_dump(DUMP) == 5
+
+    shortlisted = [p['name'] for p in index.query_for_job(BENCH_JOB)]
+    assert 'Alice Johnson' in shortlisted
+    assert all(name != 'Bob Smith' for name in shortlisted)  # Seattle
+    assert [p['name'] for p in index.query(['python'], 1, companies=['Google'])] == ['Alice Johnson']
+
+def test_orchestrator_uses_index_as_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    orchestrator = JobOrchestrator(use_gpt4=False, profile_dumps=[DUMP], use_index=True, use_search=False)
+    monkeypatch.setattr(orchestrator.job_parser, 'get_job_details', lambda url: dict(BENCH_JOB))
+
+    results = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+
+    names = [c['name'] for c in results['top_candidates']]
+    assert names and 'Alice Johnson' in names
+    assert all(c['outreach_message'] for c in results['top_candidates'])
+
+    # The run is stored, so a fresh index picks its candidates up without the dump
+    index = CandidateIndex(LinkedInProfileSearcher())
+    assert index.add_runs(str(tmp_path)) == len(names)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test Date-Aware Tenure and Trajectory
+=====================================
+
+Checks profile date parsing and that tenure/trajectory follow real role intervals.
+"""
+
+from dates import PRESENT, month_index, parse_month
+from scoring import CandidateScorer
+
+def test_parse_month_formats():
+    assert parse_month('Mar 2019') == month_index(2019, 3)
+    assert parse_month('September 2012') == month_index(2012, 9)
+    assert parse_month('Sept. 2012') == month_index(2012, 9)
+    assert parse_month('2019-03') == month_index(2019, 3)
+    assert parse_month('2019-03-15') == month_index(2019, 3)
+    assert parse_month('03/2019') == month_index(2019, 3)
+    assert parse_month('2015') == month_index(2015, 1)
+    assert parse_month({'year': 2020, 'month': 6}) == month_index(2020, 6)
+    assert parse_month('Present') == PRESENT
+    for value in ('', None, 'sometime', '2019-13', 'Foo 2019'):
+        assert parse_month(value) is None
+
+def test_newest_first_roles_progress_chronologically():
+    scorer = CandidateScorer()
+    # API order: most recent role first
+    experience = [
+        {'title': 'Engineering Manager', 'start_date': 'Jan 2021', 'end_date': 'Present'},
+        {'title': 'Senior Engineer', 'start_date': 'Jan 2018', 'end_date': 'Dec 2020'},
+        {'title': 'Engineer', 'start_date': 'Jan 2015', 'end_date': 'Dec 2017'},
+    ]
+    trajectory, tenure = scorer._score_timeline(experience)
+
+    # Engineer -> Senior (+2) -> Manager (+3) over two steps
+    assert trajectory == 7.5
+    assert tenure == 9.5  # three-year roles
+    assert scorer._score_timeline(list(reversed(experience))) == (trajectory, tenure)
+
+def test_short_stints_score_as_job_hopping():
+    scorer = CandidateScorer()
+    experience = [
+        {'title': 'Engineer', 'start_date': '2022-01', 'end_date': '2022-06'},
+        {'title': 'Engineer', 'start_date': '2021-03', 'end_date': '2021-10'},
+        {'title': 'Engineer', 'start_date': '2020-05', 'end_date': '2021-01'},
+    ]
+    assert scorer._score_tenure(experience) == 3.0
+    assert scorer._score_career_trajectory(experience) == 5.0
+
+def test_ongoing_role_counts_once_it_outlasts_completed_ones():
+    scorer = CandidateScorer()
+    scorer.today = month_index(2024, 12)
+    experience = [
+        {'title': 'Engineer', 'start_date': 'Jan 2019', 'end_date': 'Present'},  # 6 years so far
+        {'title': 'Engineer', 'start_date': 'Jan 2018', 'end_date': 'Dec 2018'},  # 1 year
+    ]
+    assert scorer._score_tenure(experience) == 9.5
+    assert scorer._score_tenure([{'title': 'Engineer', 'start_date': 'Jun 2024', 'end_date': 'Present'}]) == 5.0
+
+def test_undated_profiles_keep_heuristics():
+    scorer = CandidateScorer()
+    experience = [{'title': 'Engineer', 'company': 'A'}, {'title': 'Senior Engineer', 'company': 'B'}]
+    assert scorer._score_timeline(experience) == (scorer._heuristic_trajectory(experience), scorer._heuristic_tenure(experience))
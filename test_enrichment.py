@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test Bulk Enrichment Providers
+==============================
+
+Checks the fetch_many contract of the RapidAPI and local JSONL providers without network access.
+"""
+
+import os
+from enrichment import JsonlFileProvider, RapidAPIProvider
+from linkedin_search import LinkedInProfileSearcher
+
+SAMPLE_DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_profiles.jsonl')
+
+class FakeResponse:
+    def __init__(self, status_code, payload):
+        self.status_code = status_code
+        self.payload = payload
+        self.text = ''
+
+    def json(self):
+        return self.payload
+
+class FakeLayer:
+    """Stands in for the resilience layer and records bulk requests"""
+
+    def __init__(self):
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append(kwargs['json']['linkedin_urls'])
+        records = [{'full_name': u.rsplit('/', 1)[-1], 'linkedin_url': u} for u in kwargs['json']['linkedin_urls']]
+        return FakeResponse(200, {'data': records})
+
+def test_jsonl_provider_reads_dump():
+    """Profiles come back in _parse_api_response format, missing ones as None"""
+    print("🧪 Testing JSONL enrichment provider")
+
+    searcher = LinkedInProfileSearcher()
+    provider = JsonlFileProvider(searcher, [SAMPLE_DUMP])
+    profiles = provider.fetch_many(['alice-johnson-demo', 'nobody-here'])
+
+    assert profiles['nobody-here'] is None
+    alice = profiles['alice-johnson-demo']
+    assert alice['name'] == 'Alice Johnson'
+    assert alice['experience'][0]['company'] == 'Google'
+    assert 'Python' in alice['skills']
+    assert provider.stats['profiles_found'] == 1
+
+def test_rapidapi_provider_batches():
+    """With a bulk endpoint, 25 usernames become 3 requests of at most 10"""
+    print("🧪 Testing RapidAPI bulk batching")
+
+    searcher = LinkedInProfileSearcher()
+    searcher.resilience = FakeLayer()
+    provider = RapidAPIProvider(searcher, batch_endpoint='https://example.test/bulk', batch_size=10)
+
+    usernames = [f'user-{i}' for i in range(25)]
+    profiles = provider.fetch_many(usernames + ['user-0'])
+
+    assert [len(call) for call in searcher.resilience.calls] == [10, 10, 5]
+    assert all(profiles[u]['name'] == u for u in usernames)
+    assert provider.stats['requests'] == 3
+
+def test_rapidapi_provider_pipelines_without_bulk_endpoint():
+    """Without a bulk endpoint every username is fetched once, concurrently"""
+    searcher = LinkedInProfileSearcher()
+    fetched = []
+
+    def fake_single(profile_url):
+        fetched.append(profile_url)
+        return {'name': profile_url.rsplit('/', 1)[-1], 'profile_url': profile_url}
+
+    searcher.get_profile_details_via_api = fake_single
+    provider = RapidAPIProvider(searcher, batch_endpoint='', max_workers=4)
+    profiles = provider.fetch_many(['a', 'b', 'c', 'a'])
+
+    assert sorted(fetched) == ['https://www.linkedin.com/in/a', 'https://www.linkedin.com/in/b', 'https://www.linkedin.com/in/c']
+    assert profiles['b']['name'] == 'b'
+
+if __name__ == "__main__":
+    test_jsonl_provider_reads_dump()
+    test_rapidapi_provider_batches()
+    test_rapidapi_provider_pipelines_without_bulk_endpoint()
+    print("\n✅ Enrichment provider tests passed!")
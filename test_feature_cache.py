@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test Candidate Feature Cache
+============================
+
+Checks that candidate features are computed once per profile content and reused across jobs.
+"""
+
+import copy
+from dates import month_index
+from benchmarks import BENCH_JOB, synthetic_profiles
+from feature_cache import CandidateFeatures, FeatureCache, profile_key
+from scoring import CandidateScorer
+
+def test_features_reused_across_jobs():
+    scorer = CandidateScorer(FeatureCache(path=''))
+    uncached = CandidateScorer(FeatureCache(max_size=1, path=''))
+    profiles = list(synthetic_profiles(200))
+    jobs = [BENCH_JOB, dict(BENCH_JOB, location='New York, NY', skills=['Java', 'SQL'])]
+
+    for job in jobs:
+        for profile in profiles:
+            assert scorer.calculate_fit_score(profile, job) == uncached.calculate_fit_score(profile, job)
+
+    assert scorer.feature_cache.stats['misses'] == 200
+    assert scorer.feature_cache.stats['hits'] == 200
+
+def test_changed_profile_is_refeaturized():
+    profile = next(synthetic_profiles(1))
+    edited = copy.deepcopy(profile)
+    edited['skills'] = edited['skills'] + ['Kubernetes']
+
+    assert profile_key(profile) == profile_key(copy.deepcopy(profile))
+    assert profile_key(profile) != profile_key(edited)
+
+def test_ongoing_tenure_follows_the_reference_month():
+    """Cached features are keyed by month, so an ongoing role keeps ageing"""
+    profile = {'name': 'Current', 'experience': [{'title': 'Engineer', 'start_date': '2020-01', 'end_date': 'Present'},
+                                                 {'title': 'Engineer', 'start_date': '2019-06', 'end_date': '2019-11'}]}
+    cache = FeatureCache(path='')
+    scorer = CandidateScorer(cache)
+    scorer.today = month_index(2020, 3)
+    early = scorer.featurize(profile).tenure
+    scorer.today = month_index(2026, 1)
+    later = scorer.featurize(profile).tenure
+
+    assert cache.stats['misses'] == 2
+    assert later > early
+    fresh = CandidateScorer(FeatureCache(path=''))
+    fresh.today = month_index(2026, 1)
+    assert fresh.featurize(profile).tenure == later
+
+def test_lru_eviction():
+    cache = FeatureCache(max_size=2, path='')
+    features = CandidateFeatures(5.0, 5.0, 5.0, 5.0, ['python'], 'Remote')
+    cache.put('a', features)
+    cache.put('b', features)
+    cache.get('a')
+    cache.put('c', features)
+
+    assert cache.get('b') is None
+    assert cache.get('a') is features
+    assert len(cache) == 2
+    assert cache.stats['evictions'] == 1
+
+def test_persisted_features_survive_restart(tmp_path):
+    path = str(tmp_path / 'features.jsonl')
+    profile = next(synthetic_profiles(1))
+
+    first = CandidateScorer(FeatureCache(path=path))
+    expected = first.calculate_fit_score(profile, BENCH_JOB)
+    assert first.feature_cache.save() == 1
+
+    second = CandidateScorer(FeatureCache(path=path))
+    assert second.calculate_fit_score(profile, BENCH_JOB) == expected
+    assert second.feature_cache.stats == {'hits': 1, 'misses': 0, 'evictions': 0}
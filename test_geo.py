@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test Gazetteer Location Matching
+================================
+
+Checks place resolution from free-text locations and the geo-aware location score.
+"""
+
+from geo import default_gazetteer, distance_km
+from scoring import CandidateScorer
+
+def test_resolve_city_state_country():
+    gazetteer = default_gazetteer()
+    place = gazetteer.resolve('oakland, california, united states')
+    assert (place.city, place.metro, place.state, place.country) == ('Oakland', 'sf_bay_area', 'CA', 'US')
+    assert gazetteer.resolve('chicago, il').state == 'IL'
+    assert gazetteer.resolve('somewhere unknown') is None
+
+def test_qualifiers_pick_between_same_named_places():
+    gazetteer = default_gazetteer()
+    assert gazetteer.resolve('portland, or').state == 'OR'
+    assert gazetteer.resolve('portland, me').state == 'ME'
+    assert gazetteer.resolve('cambridge, united kingdom').country == 'GB'
+    assert gazetteer.resolve('cambridge, ma').country == 'US'
+
+def test_qualifier_matching_no_row_is_not_guessed():
+    gazetteer = default_gazetteer()
+    # An unknown country, not the Bay Area's San Jose
+    assert gazetteer.resolve('san jose, costa rica') is None
+    place = gazetteer.resolve('cambridge, canada')
+    assert (place.kind, place.city, place.country) == ('country', '', 'CA')
+    assert gazetteer.resolve('portland, tx').kind == 'state'
+    assert gazetteer.resolve('san francisco, ca 94105').city == 'San Francisco'
+    scorer = CandidateScorer()
+    job_context = scorer.compile_job({'location': 'San Francisco, CA'})
+    assert scorer._score_location_match('San Jose, Costa Rica', job_context) == 4.0
+
+def test_metro_phrases_and_remote():
+    gazetteer = default_gazetteer()
+    place = gazetteer.resolve('greater seattle area')
+    assert place.kind == 'metro' and place.metro == 'seattle'
+    remote = gazetteer.resolve('remote - us')
+    assert remote.remote and remote.country == 'US'
+    assert gazetteer.resolve('remote').remote
+
+def test_distance():
+    gazetteer = default_gazetteer()
+    km = distance_km(gazetteer.resolve('san jose, ca'), gazetteer.resolve('san francisco, ca'))
+    assert 55 < km < 80
+
+def test_location_scores():
+    scorer = CandidateScorer()
+    job_context = scorer.compile_job({'location': 'San Francisco, CA'})
+    score = lambda location: scorer._score_location_match(location, job_context)
+    assert score('San Francisco, California') == 10.0
+    assert score('Los Gatos, CA') == 8.0            # same metro, not in the old city list
+    assert score('Sacramento, CA') == 7.0           # same state
+    assert score('Remote') == 6.0
+    assert score('') == 6.0
+    # 'ca' used to match as a substring of these
+    assert score('Chicago, IL') == 4.0
+    assert score('Toronto, Ontario, Canada') == 4.0
+
+def test_nearby_across_state_line():
+    scorer = CandidateScorer()
+    job_context = scorer.compile_job({'location': 'New York, NY'})
+    assert scorer._score_location_match('Jersey City, NJ', job_context) == 8.0
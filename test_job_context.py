@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test Precompiled Job Scoring Context
+====================================
+
+Checks that scoring with a JobScoringContext compiled once gives pinned fit scores.
+"""
+
+from benchmarks import BENCH_JOB, synthetic_profiles
+from dates import month_index
+from feature_cache import FeatureCache
+from scoring import CandidateScorer
+
+JOBS = [BENCH_JOB, dict(BENCH_JOB, location='Brooklyn, NY'), dict(BENCH_JOB, location='Remote'), dict(BENCH_JOB, location='')]
+
+# Fit scores of the first six synthetic profiles per job, with ongoing roles measured to January 2025
+EXPECTED = [
+    [6.68, 7.8, 6.98, 6.98, 8.15, 8.47],
+    [6.68, 7.8, 6.98, 7.38, 7.55, 8.08],
+    [6.88, 8.0, 7.38, 7.17, 7.75, 8.28],
+    [6.88, 8.0, 6.98, 7.17, 7.75, 8.28],
+]
+
+def _scorer():
+    scorer = CandidateScorer(FeatureCache(path=''))
+    scorer.today = month_index(2025, 1)
+    return scorer
+
+def test_compiled_context_gives_pinned_scores():
+    scorer = _scorer()
+    profiles = list(synthetic_profiles(6))
+
+    for job, expected in zip(JOBS, EXPECTED):
+        job_context = scorer.compile_job(job)
+        assert [scorer.calculate_fit_score(profile, job, job_context)['fit_score'] for profile in profiles] == expected
+        assert [scorer.calculate_fit_score(profile, job)['fit_score'] for profile in profiles] == expected
+
+    assert scorer.calculate_fit_score(profiles[0], BENCH_JOB)['score_breakdown'] == {
+        'education': 7.0, 'trajectory': 5.0, 'company': 9.5, 'skills': 6.0, 'location': 4.0, 'tenure': 9.5}
+
+def test_context_normalizes_job_side():
+    scorer = CandidateScorer()
+    job_context = scorer.compile_job(BENCH_JOB)
+
+    assert {'python', 'javascript', 'react', 'node.js', 'aws', 'docker'} <= job_context.skills
+    assert job_context.place.metro == 'sf_bay_area'
+    assert job_context.place.state == 'CA' and not job_context.is_remote
+    assert job_context.location == 'san francisco, ca'
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test LLM Cost Accounting
+========================
+
+Checks per-model usage and cost, and that --llm-budget switches to local templates once spent.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+from benchmarks import BENCH_JOB
+from config import Config
+from gpt_outreach import ANTHROPIC_MODEL, GPTOutreach, llm_cost, usage_since
+from job_orchestrator import JobOrchestrator
+from main import parse_budget
+
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_profiles.jsonl')
+
+class FakeAnthropic:
+    """Every request: 340 input tokens (300 read from cache) and 120 output tokens"""
+
+    def __init__(self):
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        usage = SimpleNamespace(input_tokens=40, output_tokens=120, cache_creation_input_tokens=0,
+                                cache_read_input_tokens=300)
+        name = kwargs['messages'][0]['content'].split('Name: ')[1].split('\n')[0]
+        return SimpleNamespace(content=[SimpleNamespace(text=f"Hi {name},\n\nBest regards, Team")], usage=usage)
+
+def test_cost_uses_cache_prices():
+    prices = Config.LLM_PRICES[ANTHROPIC_MODEL]
+    expected = (40 * prices['input'] + 300 * prices['cached_input'] + 120 * prices['output']) / 1e6
+    assert abs(llm_cost(ANTHROPIC_MODEL, 340, 300, 0, 120) - expected) < 1e-12
+    assert llm_cost('unpriced-model', 1000, 0, 0, 1000) == 0.0
+
+def test_usage_is_kept_per_model():
+    outreach = GPTOutreach()
+    outreach._record_usage(ANTHROPIC_MODEL, 340, 300, 0, 120, 0.5)
+    before = {**outreach.usage, 'by_model': {m: dict(c) for m, c in outreach.usage['by_model'].items()}}
+    outreach._record_usage('gpt-3.5-turbo', 500, 0, 0, 100, 0.2)
+    outreach._record_usage(ANTHROPIC_MODEL, 340, 300, 0, 120, 0.5)
+
+    assert outreach.usage['requests'] == 3
+    assert outreach.usage['by_model'][ANTHROPIC_MODEL]['requests'] == 2
+    delta = usage_since(outreach.usage, before)
+    assert delta['requests'] == 2 and set(delta['by_model']) == {ANTHROPIC_MODEL, 'gpt-3.5-turbo'}
+    assert abs(delta['cost_usd'] - sum(c['cost_usd'] for c in delta['by_model'].values())) < 1e-9
+
+def test_parse_budget():
+    assert parse_budget('200000') == (200000.0, 'tokens')
+    assert parse_budget('200k tokens') == (200000.0, 'tokens')
+    assert parse_budget('$0.50') == (0.5, 'usd')
+    assert parse_budget('2usd') == (2.0, 'usd')
+    for bad in ('lots', '$-1'):
+        try:
+            parse_budget(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+def test_budget_switches_to_local_templates(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 3)
+    monkeypatch.setattr(Config, 'LLM_BATCH_SIZE', 1)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    orchestrator = JobOrchestrator(use_gpt4=False, use_anthropic=True, profile_dumps=[DUMP], use_index=True,
+                                   use_search=False, llm_budget=(500, 'tokens'))
+    orchestrator.outreach_generator.anthropic_client = FakeAnthropic()
+    monkeypatch.setattr(orchestrator.job_parser, 'get_job_details', lambda url: dict(BENCH_JOB))
+
+    results = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+
+    # 460 tokens per request: the second request crosses the 500-token budget
+    assert [c['message_source'] for c in results['top_candidates']] == ['claude', 'claude', 'enhanced_local']
+    assert results['llm_budget'] == {'limit': 500, 'unit': 'tokens', 'spent': 920, 'template_messages': 1}
+    usage = results['llm_usage']
+    assert usage['by_model'][ANTHROPIC_MODEL]['requests'] == 2
+    assert abs(usage['cost_usd'] - 2 * llm_cost(ANTHROPIC_MODEL, 340, 300, 0, 120)) < 1e-9
+    assert results['job_llm_usage']['runs'] == 1
+    assert results['job_llm_usage']['cost_usd'] == usage['cost_usd']
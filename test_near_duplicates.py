@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test Near-Duplicate Outreach
+============================
+
+Checks MinHash LSH near-duplicate detection and that only flagged messages are regenerated.
+"""
+
+import os
+import time
+import enhanced_outreach
+from types import SimpleNamespace
+from benchmarks import BENCH_JOB
+from config import Config
+from job_orchestrator import JobOrchestrator
+from near_duplicates import NearDuplicateDetector, lsh_bands
+
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_profiles.jsonl')
+
+SKELETON = ("Hi {name},\n\nI noticed your background in software engineering and thought you might be "
+            "interested in a Senior Software Engineer position at TechCorp in San Francisco. Your skills "
+            "align perfectly with what we're looking for. Would you be open to a brief conversation?\n\n"
+            "Best regards, Team")
+DISTINCT = [
+    "Your work scaling payment systems caught my eye; our platform team is rebuilding checkout from scratch.",
+    "Congratulations on the recent launch. We are a small group shipping developer tools to millions of users.",
+    "A former colleague of yours mentioned your talk on distributed tracing, which is exactly our problem today.",
+    "We are hiring someone to own our data pipeline end to end, and your open source contributions stood out.",
+]
+
+class FakeAnthropic:
+    """Replies with the same skeleton for everyone, unless asked to diversify"""
+
+    def __init__(self):
+        self.prompts = []
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        prompt = kwargs['messages'][0]['content']
+        self.prompts.append(prompt)
+        name = prompt.split('Name: ')[1].split('\n')[0]
+        if 'Another candidate has already been sent' in prompt:
+            text = f"Hi {name},\n\n{DISTINCT[len(self.prompts) % len(DISTINCT)]}\n\nBest regards, Team"
+        else:
+            text = SKELETON.format(name=name)
+        usage = SimpleNamespace(input_tokens=400, output_tokens=100, cache_creation_input_tokens=0,
+                                cache_read_input_tokens=0)
+        return SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+def test_groups_near_duplicates_keeping_the_first():
+    names = ['Ada Park', 'Ben Ortiz', 'Cy Young', 'Di Lopez']
+    texts = [SKELETON.format(name=names[0]), f"Hi {names[1]},\n\n{DISTINCT[0]}",
+             SKELETON.format(name=names[2]), SKELETON.format(name=names[3]), f"Hi Ed,\n\n{DISTINCT[1]}"]
+    detector = NearDuplicateDetector()
+
+    assert detector.clusters(texts) == [[0, 2, 3]]
+    assert detector.duplicates(texts) == {2: 0, 3: 0}
+    assert detector.similarity(detector.signature(texts[0]), detector.signature(texts[1])) < 0.2
+
+def test_lsh_bands_sit_just_below_threshold():
+    for threshold in (0.45, 0.6, 0.8):
+        bands, rows = lsh_bands(128, threshold)
+        assert bands * rows <= 128 and (1 / bands) ** (1 / rows) <= threshold
+
+def test_only_flagged_messages_are_regenerated(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 4)
+    monkeypatch.setattr(Config, 'LLM_BATCH_SIZE', 1)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    orchestrator = JobOrchestrator(use_gpt4=False, use_anthropic=True, profile_dumps=[DUMP], use_index=True,
+                                   use_search=False)
+    client = orchestrator.outreach_generator.anthropic_client = FakeAnthropic()
+    monkeypatch.setattr(orchestrator.job_parser, 'get_job_details', lambda url: dict(BENCH_JOB))
+
+    results = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+
+    assert results['outreach_duplicates'] == {'messages': 4, 'near_duplicates': 3, 'duplicate_rate': 0.75,
+                                              'regenerated': 3, 'remaining': 0}
+    top = results['top_candidates']
+    # The best candidate keeps the first message; the retries quote it
+    assert top[0]['outreach_message'] == SKELETON.format(name=top[0]['name'])
+    assert len(client.prompts) == 7
+    assert all(top[0]['outreach_message'] in prompt for prompt in client.prompts[4:])
+    assert [c['message_source'] for c in top] == ['claude'] * 4
+    assert results['llm_usage']['requests'] == 7
+    meta = orchestrator.run_store.load_meta(results['job_id'])
+    assert meta['outreach_duplicates'] == results['outreach_duplicates']
+
+class SameRewrite(FakeAnthropic):
+    """Asked to diversify, writes the same new message for everyone"""
+
+    def create(self, **kwargs):
+        response = super().create(**kwargs)
+        if 'Another candidate has already been sent' in kwargs['messages'][0]['content']:
+            response.content[0].text = f"Hi there,\n\n{DISTINCT[0]}\n\nBest regards, Team"
+        return response
+
+def _run(monkeypatch, **kwargs):
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 4)
+    monkeypatch.setattr(Config, 'LLM_BATCH_SIZE', 1)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    orchestrator = JobOrchestrator(profile_dumps=[DUMP], use_index=True, use_search=False, **kwargs)
+    monkeypatch.setattr(orchestrator.job_parser, 'get_job_details', lambda url: dict(BENCH_JOB))
+    return orchestrator
+
+def test_rewrites_are_checked_against_each_other(monkeypatch):
+    orchestrator = _run(monkeypatch, use_gpt4=False, use_anthropic=True)
+    orchestrator.outreach_generator.anthropic_client = SameRewrite()
+
+    results = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+
+    # Only the first identical rewrite is kept; the other two stay duplicates of the best candidate's message
+    assert results['outreach_duplicates'] == {'messages': 4, 'near_duplicates': 3, 'duplicate_rate': 0.75,
+                                              'regenerated': 1, 'remaining': 2}
+    assert [c['message_source'] for c in results['top_candidates']] == ['claude'] * 4
+
+def test_template_backends(monkeypatch):
+    orchestrator = _run(monkeypatch, backend='templates')
+    assert 'outreach_duplicates' not in orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+
+    orchestrator = _run(monkeypatch, backend='enhanced')
+    built = []
+    monkeypatch.setattr(enhanced_outreach.EnhancedOutreachGenerator, '__init__',
+                        lambda self, *args, **kwargs: built.append(self))
+    results = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+
+    texts = [c['outreach_message'] for c in results['top_candidates']]
+    assert results['outreach_duplicates']['remaining'] == len(NearDuplicateDetector().duplicates(texts))
+    assert [c['message_source'] for c in results['top_candidates']] == ['enhanced_local'] * 4
+    assert built == []
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Outreach Backends
+======================
+
+Checks the backend registry and the shared generate_many: order, concurrency, caching and fallbacks.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from benchmarks import BENCH_JOB, synthetic_profiles
+from config import Config
+from enhanced_outreach import EnhancedOutreachGenerator
+from gpt_outreach import GPT4OutreachGenerator, GPTOutreach
+from job_orchestrator import JobOrchestrator
+from outreach import OutreachGenerator
+from outreach_backend import OUTREACH_BACKENDS, create_backend
+
+class FakeAnthropic:
+    """Fails for one candidate; records the threads requests arrive on"""
+
+    def __init__(self, fail_for=None):
+        self.fail_for = fail_for
+        self.threads = set()
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        self.threads.add(threading.get_ident())
+        name = kwargs['messages'][0]['content'].split('Name: ')[1].split('\n')[0]
+        if name == self.fail_for:
+            raise RuntimeError("overloaded")
+        usage = SimpleNamespace(input_tokens=400, output_tokens=100, cache_creation_input_tokens=0,
+                                cache_read_input_tokens=0)
+        return SimpleNamespace(content=[SimpleNamespace(text=f"Hi {name},\n\nBest regards, Team")], usage=usage)
+
+def _backend(monkeypatch, fail_for=None):
+    monkeypatch.setattr(Config, 'LLM_BATCH_SIZE', 1)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    backend = create_backend('anthropic')
+    backend.anthropic_client = FakeAnthropic(fail_for)
+    backend.openai_client = None
+    return backend
+
+def test_registry_covers_all_generators():
+    expected = {'openai': GPT4OutreachGenerator, 'anthropic': GPTOutreach, 'enhanced': EnhancedOutreachGenerator,
+                'templates': OutreachGenerator}
+    assert set(OUTREACH_BACKENDS) >= set(expected)
+    for name, cls in expected.items():
+        backend = create_backend(name)
+        assert isinstance(backend, cls) and backend.name == name
+    try:
+        create_backend('carrier-pigeon')
+        assert False
+    except ValueError:
+        pass
+
+def test_openai_backend_uses_its_key_and_model(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.setattr(Config, 'OPENAI_API_KEY', '')
+    generator = GPT4OutreachGenerator(api_key='sk-test', model='gpt-4o')
+
+    assert generator.gpt_outreach.openai_client.api_key == 'sk-test'
+    assert generator.gpt_outreach.model == 'gpt-4o'
+    assert not hasattr(generator, 'client')
+
+def test_orchestrator_selects_backend_by_name():
+    assert isinstance(JobOrchestrator(backend='enhanced').outreach_generator, EnhancedOutreachGenerator)
+    orchestrator = JobOrchestrator(use_gpt4=False, use_anthropic=True)
+    assert orchestrator.outreach_generator.name == 'anthropic' and orchestrator.use_anthropic
+
+def test_batch_and_router_follow_backend_provider():
+    orchestrator = JobOrchestrator(use_gpt4=True, backend='anthropic', batch_outreach=True, route=True)
+    assert orchestrator.batch_outreach.provider == 'anthropic'
+    assert orchestrator.router.provider == 'anthropic'
+    assert orchestrator.router.models == Config.ROUTING_MODELS['anthropic']
+    assert orchestrator.router.templates is orchestrator.template_generator
+
+def test_generate_many_keeps_order_and_falls_back(monkeypatch):
+    backend = _backend(monkeypatch, fail_for='Candidate 2')
+    candidates = list(synthetic_profiles(8))
+    results = backend.generate_many(candidates, BENCH_JOB)
+
+    assert results == candidates
+    assert [c['outreach_message'].split(',')[0] for c in candidates] == [f"Hi {c['name']}" for c in candidates]
+    assert [c['message_source'] for c in candidates] == ['claude'] * 2 + ['template'] + ['claude'] * 5
+    assert len(backend.anthropic_client.threads) > 1
+    assert backend.stats['fallbacks'] == 1
+
+def test_cached_messages_are_not_requested_again(monkeypatch):
+    backend = _backend(monkeypatch)
+    candidates = list(synthetic_profiles(3))
+    backend.generate_many(candidates, BENCH_JOB)
+    requests = backend.usage['requests']
+
+    again = [dict(c) for c in synthetic_profiles(4)]
+    asyncio.run(backend.agenerate_many(again, BENCH_JOB))
+    assert backend.usage['requests'] == requests + 1
+    assert backend.stats['cached'] == 3
+    assert [c['outreach_message'] for c in again[:3]] == [c['outreach_message'] for c in candidates]
+
+    # Another job is another cache entry
+    backend.generate_many([dict(candidates[0])], dict(BENCH_JOB, title='Staff Engineer'))
+    assert backend.usage['requests'] == requests + 2
+
+def test_no_client_goes_straight_to_templates(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    backend = create_backend('anthropic')
+    backend.anthropic_client = backend.openai_client = None
+    monkeypatch.setattr(backend, 'generate_message', lambda *args, **kwargs: 1 / 0)
+    candidates = list(synthetic_profiles(12))
+
+    backend.generate_many(candidates, BENCH_JOB)
+
+    assert [c['message_source'] for c in candidates] == ['template'] * 12
+    assert sleeps == [] and backend.stats['fallbacks'] == 12
+
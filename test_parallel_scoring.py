@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test Process-Pool Parallel Scoring
+==================================
+
+Checks that ParallelScorer returns the same top-K as a serial score-and-sort.
+"""
+
+from benchmarks import BENCH_JOB, synthetic_profiles
+from parallel_scoring import ParallelScorer
+from scoring import CandidateScorer
+
+def serial_top_k(profiles, job, k):
+    scorer = CandidateScorer()
+    scored = [(scorer.calculate_fit_score(p, job)['fit_score'], i) for i, p in enumerate(profiles)]
+    scored.sort(key=lambda item: item[0], reverse=True)  # stable: earlier profile wins ties
+    return scored[:k]
+
+def test_parallel_matches_serial():
+    """Process pool + chunked top-K merge must agree with a full sort, ties included"""
+    print("🧪 Testing parallel scoring")
+
+    profiles = list(synthetic_profiles(600, seed=7))
+    expected = serial_top_k(profiles, BENCH_JOB, 15)
+
+    for workers in (1, 2):
+        top = ParallelScorer(workers=workers, chunk_size=50, top_k=15).score(iter(profiles), BENCH_JOB)
+        assert [(c['fit_score'], c['index']) for c in top] == expected
+        assert set(top[0]['score_breakdown']) == {'education', 'trajectory', 'company', 'skills', 'location', 'tenure'}
+
+def test_small_pool_returns_everything():
+    top = ParallelScorer(workers=2, chunk_size=4, top_k=10).score(list(synthetic_profiles(3)), BENCH_JOB)
+    assert sorted(c['index'] for c in top) == [0, 1, 2]
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_small_pool_returns_everything()
+    print("\n✅ Parallel scoring tests passed!")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test Snippet Pre-Scoring for Enrichment Selection
+=================================================
+
+Checks that profiles are ranked by snippet-based estimates and only the budget is enriched.
+"""
+
+from scoring import CandidateScorer
+from job_orchestrator import JobOrchestrator
+
+JOB = {
+    'title': 'Senior Software Engineer',
+    'location': 'San Francisco, CA',
+    'skills': ['Python', 'JavaScript', 'React', 'AWS'],
+    'requirements': ['Experience with Python and React']
+}
+
+STUBS = [
+    {'url': 'https://www.linkedin.com/in/poor-fit', 'headline': 'Store Manager', 'company': 'Corner Shop',
+     'location': 'Dublin, Ireland', 'snippet': 'Retail operations and team scheduling'},
+    {'url': 'https://www.linkedin.com/in/good-fit', 'headline': 'Senior Software Engineer at Google', 'company': 'Google',
+     'location': 'San Francisco, CA', 'snippet': 'Python, React and AWS services at scale'},
+    {'url': 'https://www.linkedin.com/in/medium-fit', 'headline': 'Software Engineer', 'company': 'StartupXYZ',
+     'location': 'Austin, TX', 'snippet': 'Python backend developer'},
+]
+
+def test_estimate_ranks_snippet_fit():
+    """A matching snippet should estimate higher than an unrelated one"""
+    print("🧪 Testing snippet pre-score")
+
+    scorer = CandidateScorer()
+    estimates = {stub['url'].rsplit('/', 1)[-1]: scorer.estimate_fit_score(stub, JOB) for stub in STUBS}
+    print(f"   {estimates}")
+
+    assert estimates['good-fit'] > estimates['medium-fit'] > estimates['poor-fit']
+    assert 0 <= estimates['poor-fit'] <= 10
+
+def test_only_budget_is_enriched():
+    """The orchestrator enriches the top-N estimates, not the first N search results"""
+    orchestrator = JobOrchestrator(use_gpt4=False)
+    selected = orchestrator._select_for_enrichment([dict(stub) for stub in STUBS], JOB, budget=2)
+
+    assert [p['url'].rsplit('/', 1)[-1] for p in selected] == ['good-fit', 'medium-fit']
+
+if __name__ == "__main__":
+    test_estimate_ranks_snippet_fit()
+    test_only_budget_is_enriched()
+    print("\n✅ Pre-scoring tests passed!")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Prompt Caching Layout
+==========================
+
+Checks that LLM prompts share a per-job prefix and that cached-token usage is recorded per run.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+from benchmarks import BENCH_JOB, synthetic_profiles
+from config import Config
+from gpt_outreach import GPTOutreach
+from job_orchestrator import JobOrchestrator
+
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_profiles.jsonl')
+
+class FakeAnthropic:
+    """Records requests; reports the system prompt as cached after the first call"""
+
+    def __init__(self):
+        self.requests = []
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        first = not self.requests
+        self.requests.append(kwargs)
+        usage = SimpleNamespace(input_tokens=40, output_tokens=120,
+                                cache_creation_input_tokens=300 if first else 0,
+                                cache_read_input_tokens=0 if first else 300)
+        name = kwargs['messages'][0]['content'].split('Name: ')[1].split('\n')[0]
+        return SimpleNamespace(content=[SimpleNamespace(text=f"Hi {name},\n\nBest regards, Team")], usage=usage)
+
+def test_prefix_is_shared_per_job():
+    outreach = GPTOutreach()
+    first, second = list(synthetic_profiles(2))
+    prefix_a, suffix_a = outreach._build_prompt_parts(first, BENCH_JOB, "Team")
+    prefix_b, suffix_b = outreach._build_prompt_parts(second, BENCH_JOB, "Team")
+    assert prefix_a is prefix_b
+    assert first['name'] in suffix_a and first['name'] not in prefix_a
+    assert BENCH_JOB['title'] in prefix_a and BENCH_JOB['title'] not in suffix_a
+
+    other_prefix, _ = outreach._build_prompt_parts(first, dict(BENCH_JOB, title='Data Engineer'), "Team")
+    assert other_prefix != prefix_a
+    assert outreach._build_prompt(first, BENCH_JOB, "Team") == f"{prefix_a}\n\n{suffix_a}"
+
+def test_anthropic_marks_prefix_cacheable_and_counts_tokens():
+    outreach = GPTOutreach()
+    outreach.anthropic_client = FakeAnthropic()
+    for profile in synthetic_profiles(3):
+        message, source = outreach.generate_message(profile, BENCH_JOB, use_anthropic=True)
+        assert source == 'claude' and message.startswith(f"Hi {profile['name']},")
+
+    system = outreach.anthropic_client.requests[0]['system']
+    assert system[0]['cache_control'] == {'type': 'ephemeral'}
+    assert len({request['system'][0]['text'] for request in outreach.anthropic_client.requests}) == 1
+    assert outreach.usage['requests'] == 3
+    assert outreach.usage['input_tokens'] == 3 * 340
+    assert outreach.usage['cached_input_tokens'] == 600
+    assert outreach.usage['cache_write_tokens'] == 300
+
+def test_run_records_llm_usage(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 3)
+    monkeypatch.setattr(Config, 'LLM_BATCH_SIZE', 1)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    orchestrator = JobOrchestrator(use_gpt4=False, use_anthropic=True, profile_dumps=[DUMP], use_index=True, use_search=False)
+    orchestrator.outreach_generator.anthropic_client = FakeAnthropic()
+    monkeypatch.setattr(orchestrator.job_parser, 'get_job_details', lambda url: dict(BENCH_JOB))
+
+    results = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+
+    usage = results['llm_usage']
+    assert usage['requests'] == len(results['top_candidates']) == 3
+    assert usage['cached_input_tokens'] == 600
+    meta, _ = orchestrator.run_store.load(results['job_id'])
+    assert meta['llm_usage'] == usage
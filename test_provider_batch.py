@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Provider Batch Outreach
+============================
+
+Checks batch request files, submission and later collection against the local batch stand-in.
+"""
+
+import json
+import os
+import time
+from batch_outreach import REQUESTS_FILE, BatchOutreach, LocalBatchEndpoint, read_batch_record
+from benchmarks import BENCH_JOB, synthetic_profiles
+from config import Config
+from gpt_outreach import GPTOutreach
+from job_orchestrator import JobOrchestrator
+from records import ScoredCandidate
+
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_profiles.jsonl')
+
+def _candidates(count):
+    return [ScoredCandidate.from_dict(dict(profile, linkedin_url=f"https://linkedin.com/in/c{i}", fit_score=7.0))
+            for i, profile in enumerate(synthetic_profiles(count))]
+
+def test_openai_batch_round_trip(tmp_path):
+    endpoint = LocalBatchEndpoint(str(tmp_path / 'endpoint'), complete_after=1)
+    backend = BatchOutreach('openai', client=endpoint, prompts=GPTOutreach())
+    candidates = _candidates(3)
+    record = backend.submit(str(tmp_path), candidates, BENCH_JOB)
+
+    with open(tmp_path / REQUESTS_FILE, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert [line['url'] for line in lines] == ['/v1/chat/completions'] * 3
+    assert len({line['body']['messages'][0]['content'] for line in lines}) == 1
+    assert read_batch_record(str(tmp_path))['batch_id'] == record['batch_id']
+
+    status, messages = backend.collect(str(tmp_path))
+    assert status == 'in_progress' and messages == {}
+    status, messages = backend.collect(str(tmp_path))
+    assert status == 'completed'
+    for candidate in candidates:
+        message, source = messages[candidate.linkedin_url]
+        assert message.startswith(f"Hi {candidate.name},") and source == 'gpt-4_batch'
+    assert backend.usage['requests'] == 3
+
+def test_anthropic_batch_reports_failed_requests(tmp_path):
+    candidates = _candidates(3)
+    failing = f"Name: {candidates[1].name}\n"
+    endpoint = LocalBatchEndpoint(str(tmp_path / 'endpoint'),
+                                  responder=lambda system, user: None if failing in user else "Hi there,")
+    backend = BatchOutreach('anthropic', client=endpoint, prompts=GPTOutreach())
+    backend.submit(str(tmp_path), candidates, BENCH_JOB)
+
+    with open(tmp_path / REQUESTS_FILE, encoding='utf-8') as f:
+        first = json.loads(f.readline())
+    assert first['params']['system'][0]['cache_control'] == {'type': 'ephemeral'}
+
+    status, messages = backend.collect(str(tmp_path))
+    assert status == 'ended'
+    assert [messages[c.linkedin_url][0] is None for c in candidates] == [False, True, False]
+    assert messages[candidates[1].linkedin_url][1] == 'anthropic_batch_error'
+
+def test_collect_merges_batch_into_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 3)
+    monkeypatch.setattr(Config, 'LLM_BATCH_ENDPOINT', 'local')
+    monkeypatch.setattr(Config, 'LOCAL_BATCH_DIR', str(tmp_path / '_local_batches'))
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    orchestrator = JobOrchestrator(use_gpt4=False, use_anthropic=True, profile_dumps=[DUMP], use_index=True,
+                                   use_search=False, batch_outreach=True)
+    monkeypatch.setattr(orchestrator.job_parser, 'get_job_details', lambda url: dict(BENCH_JOB))
+
+    submitted = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+    assert submitted['outreach_batch']['requests'] == 3
+    assert not any('outreach_message' in candidate for candidate in submitted['top_candidates'])
+    assert 'llm_usage' not in submitted
+
+    # A separate process picks the batch up from the run directory
+    collector = JobOrchestrator(use_gpt4=False, use_anthropic=True, use_search=False)
+    collected = collector.collect(submitted['job_id'])
+    assert collected['outreach_batch']['collected'] == 3
+    assert [c['message_source'] for c in collected['top_candidates']] == ['claude_batch'] * 3
+    assert [c['name'] for c in collected['top_candidates']] == [c['name'] for c in submitted['top_candidates']]
+    meta, _ = collector.run_store.load(submitted['job_id'])
+    assert len(meta['outreach']) == 3 and meta['llm_usage']['requests'] == 3
+
+    again = collector.collect(submitted['job_id'])
+    assert again['top_candidates'] == collected['top_candidates'] and 'llm_usage' not in again
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Test Profile and Candidate Records
+==================================
+
+Checks that slotted records keep the JSON output shape and share data instead of copying it.
+"""
+
+import json
+from benchmarks import synthetic_profiles
+from enhanced_outreach import EnhancedOutreachGenerator
+from feature_cache import profile_key
+from records import EnrichedProfile, ProfileStub, ScoredCandidate
+
+BREAKDOWN = {'education': 8.0, 'trajectory': 6.0, 'company': 7.0, 'skills': 5.5, 'location': 10.0, 'tenure': 7.0}
+
+def test_output_shape_matches_dicts():
+    data = next(synthetic_profiles(1))
+    candidate = ScoredCandidate(EnrichedProfile.from_dict(data), 7.2, BREAKDOWN)
+    assert candidate.to_dict() == {
+        'name': data['name'], 'linkedin_url': data['profile_url'], 'fit_score': 7.2,
+        'score_breakdown': BREAKDOWN, 'headline': data['headline'], 'location': data['location'],
+        'education': data['education'], 'experience': data['experience'], 'skills': data['skills']
+    }
+    assert list(candidate.to_dict())[:3] == ['name', 'linkedin_url', 'fit_score']
+
+    # Stored candidates round-trip through JSON
+    candidate.outreach_message = 'Hi'
+    restored = ScoredCandidate.from_dict(json.loads(json.dumps(candidate.to_dict())))
+    assert restored.to_dict() == candidate.to_dict()
+
+def test_dict_style_access():
+    stub = ProfileStub.from_dict({'url': 'https://linkedin.com/in/x', 'headline': 'Engineer', 'snippet': 'Python'})
+    assert stub.get('company', 'n/a') == '' and stub.get('estimated_score', 0) == 0
+    stub['estimated_score'] = 6.5
+    assert stub['estimated_score'] == 6.5 and 'estimated_score' in stub
+
+    candidate = ScoredCandidate(EnrichedProfile(name='Ann'), 5.0, BREAKDOWN)
+    assert candidate.get('name') == 'Ann' and 'outreach_message' not in candidate
+    assert candidate.get('unknown', 'x') == 'x'
+
+def test_interned_and_shared():
+    first, second = [EnrichedProfile.from_dict(json.loads(json.dumps(p))) for p in synthetic_profiles(2, seed=3)]
+    shared = set(first.skills) & set(second.skills)
+    assert shared
+    for skill in shared:
+        assert first.skills[first.skills.index(skill)] is second.skills[second.skills.index(skill)]
+
+    # Same content hash as the dict it came from, so cached features still apply
+    data = next(synthetic_profiles(1))
+    assert profile_key(EnrichedProfile.from_dict(data)) == profile_key(data)
+
+    candidate = ScoredCandidate(first, 5.0, BREAKDOWN)
+    assert candidate.experience is first.experience
+    results = EnhancedOutreachGenerator().generate_bulk_outreach_messages([candidate], {'title': 'Engineer'})
+    assert results[0] is candidate and candidate.message_source == 'enhanced_local'
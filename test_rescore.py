@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test Incremental Rescoring
+==========================
+
+Checks that stored runs can be re-ranked with new weights and that outreach is only
+generated for candidates who newly enter the top K.
+"""
+
+import time
+from config import Config
+from job_orchestrator import JobOrchestrator
+from scoring import weighted_fit_scores
+
+def _orchestrator(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 2)
+    return JobOrchestrator(use_gpt4=False)
+
+def test_runs_of_the_same_job_get_their_own_directory(tmp_path, monkeypatch):
+    orchestrator = _orchestrator(tmp_path, monkeypatch)
+    monkeypatch.setattr(time, 'time', lambda: 1700000000.0)
+    first = orchestrator.process_job_posting("demo", max_candidates=5)
+    second = orchestrator.process_job_posting("demo", max_candidates=5)
+
+    assert first['job_id'] != second['job_id']
+    assert sorted(orchestrator.run_store.list_runs()) == sorted([first['job_id'], second['job_id']])
+    try:
+        orchestrator.run_store.start(first['job_id'], {})
+        assert False, "expected FileExistsError"
+    except FileExistsError:
+        pass
+
+def test_same_weights_reproduce_ranking(tmp_path, monkeypatch):
+    orchestrator = _orchestrator(tmp_path, monkeypatch)
+    results = orchestrator.process_job_posting("demo", max_candidates=5)
+
+    rescored = orchestrator.rescore(results['job_id'], dict(Config.SCORING_WEIGHTS))
+
+    assert [c['linkedin_url'] for c in rescored['top_candidates']] == [c['linkedin_url'] for c in results['top_candidates']]
+    assert [c['fit_score'] for c in rescored['top_candidates']] == [c['fit_score'] for c in results['top_candidates']]
+    assert rescored['candidates_found'] == 5
+    assert rescored['rescored']['messages_generated'] == 0
+
+def test_only_new_entrants_get_outreach(tmp_path, monkeypatch):
+    orchestrator = _orchestrator(tmp_path, monkeypatch)
+    results = orchestrator.process_job_posting("demo", max_candidates=5)
+    before = {c['linkedin_url']: c['outreach_message'] for c in results['top_candidates']}
+
+    generated = []
+    original = orchestrator._generate_outreach
+    def spy(candidates, job_details):
+        generated.extend(c['linkedin_url'] for c in candidates)
+        return original(candidates, job_details)
+    orchestrator._generate_outreach = spy
+
+    # Reward only location: the demo job is in San Francisco
+    weights = {'education': 0.0, 'trajectory': 0.0, 'company': 0.0, 'skills': 0.0, 'location': 1.0, 'tenure': 0.0}
+    rescored = orchestrator.rescore(results['job_id'], weights)
+    top = rescored['top_candidates']
+
+    assert all(c['fit_score'] == c['score_breakdown']['location'] for c in top)
+    assert set(generated) == {c['linkedin_url'] for c in top} - set(before)
+    for candidate in top:
+        assert candidate['outreach_message']
+        if candidate['linkedin_url'] in before:
+            assert candidate['outreach_message'] == before[candidate['linkedin_url']]
+
+    # A second rescore with the same weights has nothing new to write
+    again = orchestrator.rescore(results['job_id'], weights)
+    assert again['rescored']['messages_generated'] == 0
+
+def test_weighted_fit_scores_columns():
+    breakdowns = [{'education': 10.0, 'skills': 5.0}, {'education': 0.0, 'skills': 10.0}]
+    assert weighted_fit_scores(breakdowns, {'education': 0.5, 'skills': 0.5}) == [7.5, 5.0]
+
+def test_unknown_run(tmp_path, monkeypatch):
+    orchestrator = _orchestrator(tmp_path, monkeypatch)
+    assert 'error' in orchestrator.rescore('missing-run')
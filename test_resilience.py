@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test Retry, Backoff and Circuit Breaker Layer
+=============================================
+
+Exercises ResilienceLayer with a fake HTTP session and clock, so no network is needed.
+"""
+
+import threading
+from linkedin_search import LinkedInProfileSearcher
+from resilience import CircuitBreaker, CircuitOpenError, ResilienceLayer, RetryPolicy, parse_retry_after
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, text=''):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+class FakeSession:
+    """Returns queued responses in order and counts requests"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = 0
+
+    def request(self, method, url, **kwargs):
+        self.requests += 1
+        return self.responses.pop(0)
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_layer(responses, max_attempts=3):
+    clock = FakeClock()
+    sleeps = []
+    layer = ResilienceLayer(
+        policy=RetryPolicy(max_attempts=max_attempts, base_delay=1.0, max_delay=30.0),
+        session=FakeSession(responses),
+        sleep=sleeps.append,
+        clock=clock
+    )
+    return layer, sleeps, clock
+
+def test_retry_after_is_honoured():
+    """A 429 with Retry-After waits that long, then the retry succeeds"""
+    print("🧪 Testing Retry-After handling")
+
+    layer, sleeps, _ = make_layer([FakeResponse(429, {'Retry-After': '7'}), FakeResponse(200)])
+    response = layer.request("GET", "https://api.example.com/profile")
+
+    assert response.status_code == 200
+    assert sleeps == [7.0]
+    assert layer.stats['retries'] == 1
+
+def test_backoff_is_jittered_and_bounded():
+    policy = RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=4.0)
+    for attempt in range(1, 6):
+        delay = policy.backoff(attempt)
+        assert 0 <= delay <= min(4.0, 2 ** attempt)
+    assert policy.backoff(1, retry_after=120) == 4.0
+    assert parse_retry_after('3') == 3.0
+    assert parse_retry_after('not a date') is None
+
+def test_non_retryable_status_returned():
+    """404s are not retried and do not raise"""
+    layer, sleeps, _ = make_layer([FakeResponse(404)])
+    response = layer.request("GET", "https://api.example.com/profile")
+
+    assert response.status_code == 404
+    assert sleeps == []
+    assert layer.session.requests == 1
+
+def test_circuit_opens_and_recovers():
+    """After repeated failures the host is short-circuited, then probed after the reset timeout"""
+    print("🧪 Testing circuit breaker")
+
+    layer, _, clock = make_layer([FakeResponse(503)] * 10 + [FakeResponse(200)], max_attempts=1)
+    host = "https://api.example.com/profile"
+    threshold = layer.breaker("api.example.com").failure_threshold
+
+    for _ in range(threshold):
+        assert layer.request("GET", host).status_code == 503
+    assert layer.is_open("api.example.com")
+
+    requests_before = layer.session.requests
+    try:
+        layer.request("GET", host)
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+    assert layer.session.requests == requests_before
+
+    # Half-open probe after the reset timeout
+    clock.now += layer.breaker("api.example.com").reset_timeout
+    layer.session.responses = [FakeResponse(200)]
+    assert layer.request("GET", host).status_code == 200
+    assert layer.breaker("api.example.com").state == CircuitBreaker.CLOSED
+
+def test_bad_credentials_open_circuit_immediately():
+    """A 401 (e.g. a dead API key) stops every later call to that host"""
+    layer, sleeps, _ = make_layer([FakeResponse(401)])
+
+    assert layer.request("GET", "https://api.example.com/profile").status_code == 401
+    assert sleeps == []
+    assert layer.is_open("api.example.com")
+
+class StatusError(Exception):
+    """SDK-style error carrying an HTTP status"""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+def test_half_open_allows_a_single_probe():
+    """While the probe is in flight every other caller is short-circuited"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+
+    allowed = []
+    threads = [threading.Thread(target=lambda: allowed.append(breaker.allow())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(allowed) == [False] * 7 + [True]
+    assert breaker.state == CircuitBreaker.HALF_OPEN and not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    clock.now += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.allow()
+
+def test_client_errors_do_not_trip_the_circuit():
+    """400/404 from an SDK mean the host is up; 5xx and 429 count against it"""
+    layer, _, _ = make_layer([], max_attempts=1)
+    threshold = layer.breaker("api.example.com").failure_threshold
+
+    def fail(status):
+        raise StatusError(status)
+
+    for status in [404, 400] * threshold:
+        try:
+            layer.call("api.example.com", fail, status)
+        except StatusError:
+            pass
+    assert not layer.is_open("api.example.com")
+
+    for status in ([500, 429, 503] * threshold)[:threshold]:
+        try:
+            layer.call("api.example.com", fail, status)
+        except StatusError:
+            pass
+    assert layer.is_open("api.example.com")
+    assert layer.stats['calls'] == layer.stats['failures'] == 3 * threshold
+
+def test_profile_pages_go_through_the_layer():
+    """Profile page fetches are retried and short-circuited like every other call"""
+    layer, sleeps, _ = make_layer([FakeResponse(503), FakeResponse(200, text='<html><h1>Ada Park</h1></html>')])
+    searcher = LinkedInProfileSearcher()
+    searcher.resilience = layer
+
+    candidate = searcher.extract_candidate_data("https://www.linkedin.com/in/ada")
+
+    assert candidate['profile_url'] == "https://www.linkedin.com/in/ada"
+    assert layer.session.requests == 2 and len(sleeps) == 1
+
+if __name__ == "__main__":
+    test_retry_after_is_honoured()
+    test_backoff_is_jittered_and_bounded()
+    test_non_retryable_status_returned()
+    test_circuit_opens_and_recovers()
+    test_bad_credentials_open_circuit_immediately()
+    test_half_open_allows_a_single_probe()
+    test_client_errors_do_not_trip_the_circuit()
+    test_profile_pages_go_through_the_layer()
+    print("\n✅ Resilience tests passed!")
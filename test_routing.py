@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test Outreach Routing
+=====================
+
+Checks that candidates are routed to templates, a small or a premium model by score band and budget.
+"""
+
+import time
+from types import SimpleNamespace
+from benchmarks import BENCH_JOB, synthetic_profiles
+from config import Config
+from gpt_outreach import GPTOutreach
+from routing import OutreachRouter
+
+SMALL, PREMIUM = Config.ROUTING_MODELS['anthropic']['small'], Config.ROUTING_MODELS['anthropic']['premium']
+
+class FakeAnthropic:
+    """Records the model of every request; 400 input and 100 output tokens each"""
+
+    def __init__(self):
+        self.models = []
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        self.models.append(kwargs['model'])
+        name = kwargs['messages'][0]['content'].split('Name: ')[1].split('\n')[0]
+        usage = SimpleNamespace(input_tokens=400, output_tokens=100, cache_creation_input_tokens=0,
+                                cache_read_input_tokens=0)
+        return SimpleNamespace(content=[SimpleNamespace(text=f"Hi {name},\n\nBest regards, Team")], usage=usage)
+
+def _router(monkeypatch, budget=None):
+    monkeypatch.setattr(Config, 'LLM_BATCH_SIZE', 1)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    outreach = GPTOutreach()
+    outreach.anthropic_client = FakeAnthropic()
+    return OutreachRouter(outreach, 'anthropic', budget)
+
+def _candidates(*scores):
+    return [dict(profile, fit_score=score) for profile, score in zip(synthetic_profiles(len(scores)), scores)]
+
+def test_tiers_follow_score_bands_and_budget():
+    router = OutreachRouter(GPTOutreach(), 'openai')
+    assert [router.tier({'fit_score': score}) for score in (9.0, 7.5, 6.0, 4.9)] == \
+        ['premium', 'premium', 'small', 'template']
+    assert router.tier({'fit_score': 9.0}, spent_share=0.85) == 'small'
+    assert router.tier({'fit_score': 9.0}, spent_share=1.0) == 'template'
+
+def test_routed_sources_and_models(monkeypatch):
+    router = _router(monkeypatch)
+    candidates = _candidates(6.0, 9.0, 3.0, 8.0)
+    results = router.generate_bulk_outreach_messages(candidates, BENCH_JOB)
+
+    assert results == candidates
+    assert [c['message_source'] for c in candidates] == \
+        [f'small/{SMALL}', f'premium/{PREMIUM}', 'template/enhanced_local', f'premium/{PREMIUM}']
+    # Best candidates are sent first
+    assert router.gpt_outreach.anthropic_client.models == [PREMIUM, PREMIUM, SMALL]
+
+def test_routing_costs_less_than_premium_for_all(monkeypatch):
+    router = _router(monkeypatch)
+    router.generate_bulk_outreach_messages(_candidates(9.0, 8.0, 6.0, 6.0, 3.0, 2.0), BENCH_JOB)
+    routed = router.usage['cost_usd']
+
+    unrouted = GPTOutreach()
+    unrouted.anthropic_client = FakeAnthropic()
+    unrouted.generate_messages(_candidates(9.0, 8.0, 6.0, 6.0, 3.0, 2.0), BENCH_JOB, use_anthropic=True)
+    assert routed < unrouted.usage['cost_usd'] / 2
+
+def test_budget_downgrades_then_falls_back_to_templates(monkeypatch):
+    # 500 tokens per request: the first premium request spends 0.83 of the budget
+    router = _router(monkeypatch, budget=(600, 'tokens'))
+    candidates = _candidates(9.5, 9.0, 8.5)
+    router.generate_bulk_outreach_messages(candidates, BENCH_JOB)
+
+    assert [c['message_source'] for c in candidates] == \
+        [f'premium/{PREMIUM}', f'small/{SMALL}', 'template/enhanced_local']
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test Lazy Score Cards
+=====================
+
+Checks the numeric scoring path against the full one and the explanations built for shortlisted candidates.
+"""
+
+from benchmarks import BENCH_JOB, synthetic_profiles
+from config import Config
+from job_orchestrator import JobOrchestrator
+from scoring import CandidateScorer
+
+def test_numeric_path_matches_full_scoring():
+    scorer = CandidateScorer()
+    job_context = scorer.compile_job(BENCH_JOB)
+    for profile in synthetic_profiles(50):
+        full = scorer.calculate_fit_score(profile, BENCH_JOB, job_context)
+        assert scorer.score(profile, job_context) == (full['fit_score'], full['score_breakdown'])
+
+def test_explain():
+    scorer = CandidateScorer()
+    profile = {
+        'location': 'Oakland, CA',
+        'education': [{'school': 'Coding Bootcamp', 'degree': ''}, {'school': 'Stanford University', 'degree': 'MS'}],
+        'experience': [
+            {'title': 'Senior Engineer', 'company': 'Google', 'start_date': '2019-01', 'end_date': 'Present'},
+            {'title': 'Engineer', 'company': 'Acme Corp', 'start_date': '2015-01', 'end_date': '2018-12'}
+        ],
+        'skills': ['Python', 'React']
+    }
+    card = scorer.explain(profile, BENCH_JOB)
+    full = scorer.calculate_fit_score(profile, BENCH_JOB)
+    assert (card['overall_grade'], card['recommendation']) == (full['overall_grade'], full['recommendation'])
+
+    explanation = card['explanation']
+    assert explanation['matched_skills'] == ['python', 'react']
+    assert 'aws' in explanation['missing_skills']
+    assert explanation['school'] == {'school': 'Stanford University', 'degree': 'MS', 'elite': True}
+    assert explanation['top_companies'] == ['Google']
+    assert explanation['promotions'] == ['Engineer → Senior Engineer']
+    assert explanation['average_tenure_years'] == 4.0
+    assert explanation['location'] == 'same metro area (sf_bay_area)'
+
+    # A scored candidate's (possibly reweighted) fit score sets the grade
+    assert scorer.explain(dict(profile, fit_score=9.0), BENCH_JOB)['overall_grade'] == 'A'
+
+def test_only_shortlist_gets_score_cards(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 2)
+    orchestrator = JobOrchestrator(use_gpt4=False)
+    explained = []
+    explain = orchestrator.candidate_scorer.explain
+    monkeypatch.setattr(orchestrator.candidate_scorer, 'explain',
+                        lambda candidate, *args: explained.append(candidate) or explain(candidate, *args))
+
+    results = orchestrator.process_job_posting('demo')
+
+    assert len(explained) == 2
+    for candidate in results['top_candidates']:
+        assert candidate['overall_grade'] and candidate['recommendation'] and candidate['explanation']
+        assert 'processed_at' not in candidate
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Request Coalescing for Profile Enrichment
+==============================================
+
+Checks that concurrent lookups of the same profile share one in-flight request.
+"""
+
+import threading
+import time
+from single_flight import SingleFlight
+from linkedin_search import LinkedInProfileSearcher
+
+def test_concurrent_calls_share_one_execution():
+    """Eight threads asking for the same key trigger a single call"""
+    print("🧪 Testing single-flight coalescing")
+
+    flights = SingleFlight()
+    executions = []
+    start = threading.Barrier(8)
+    results = []
+
+    def slow_fetch(key):
+        executions.append(key)
+        time.sleep(0.2)
+        return {'username': key}
+
+    def worker():
+        start.wait()
+        results.append(flights.do('alice', slow_fetch, 'alice'))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert executions == ['alice']
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+    assert flights.stats == {'calls': 8, 'executions': 1, 'coalesced': 7}
+    assert flights.in_flight() == 0
+
+def test_errors_are_shared_and_not_cached():
+    flights = SingleFlight()
+
+    def failing():
+        raise ValueError("boom")
+
+    try:
+        flights.do('bob', failing)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    # A later call runs again instead of replaying the old failure
+    assert flights.do('bob', lambda: 'ok') == 'ok'
+    assert flights.stats['executions'] == 2
+
+def test_canonical_username_matches_url_variants():
+    """URL variants of one person map to the same single-flight key"""
+    searcher = LinkedInProfileSearcher()
+    variants = [
+        'https://www.linkedin.com/in/Jane-Doe/',
+        'https://uk.linkedin.com/in/jane-doe?trk=public_profile',
+        'https://linkedin.com/in/jane%2Ddoe',
+    ]
+    keys = {searcher._canonical_username(url) for url in variants}
+    assert keys == {'jane-doe'}
+
+    profiles = [{'url': url} for url in variants]
+    assert len(searcher._remove_duplicates(profiles)) == 1
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_execution()
+    test_errors_are_shared_and_not_cached()
+    test_canonical_username_matches_url_variants()
+    print("\n✅ Single-flight tests passed!")
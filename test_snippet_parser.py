@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test Snippet Parsing Accuracy
+=============================
+
+Checks SnippetParser against the recorded Google snippets in data/recorded_snippets.jsonl.
+"""
+
+import json
+import os
+from geo import Gazetteer
+from snippet_parser import SnippetParser
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'recorded_snippets.jsonl')
+FIELDS = ('name', 'headline', 'company', 'location')
+
+def load_corpus(path=CORPUS_PATH):
+    """Load recorded snippets with their expected fields"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def field_accuracy(parse, corpus):
+    """Return per-field accuracy of a parse function over the corpus"""
+    correct = {field: 0 for field in FIELDS}
+    for record in corpus:
+        parsed = parse(record['snippet'])
+        for field in FIELDS:
+            if parsed.get(field, '') == record['expected'][field]:
+                correct[field] += 1
+    return {field: correct[field] / len(corpus) for field in FIELDS}
+
+def test_snippet_accuracy():
+    """Parser should recover most fields from recorded snippets"""
+    print("🧪 Testing snippet parsing accuracy")
+    print("=" * 50)
+
+    parser = SnippetParser()
+    corpus = load_corpus()
+    accuracy = field_accuracy(parser.parse, corpus)
+
+    for field, value in accuracy.items():
+        print(f"   {field}: {value:.0%}")
+
+    assert accuracy['location'] >= 0.9
+    assert accuracy['name'] >= 0.9
+    assert accuracy['company'] >= 0.9
+    assert accuracy['headline'] >= 0.9
+
+def test_location_never_returns_name():
+    """A bare "Name - Title" snippet must not report the name as the location"""
+    parser = SnippetParser()
+
+    result = parser.parse("Jessica Lee - Senior Product Designer - Figma | LinkedIn")
+    assert result['location'] == ''
+    assert result['name'] == 'Jessica Lee'
+
+    result = parser.parse("Bob Smith - Lead Developer at Chicago Trading Co")
+    assert result['location'] != 'Bob Smith'
+
+def test_state_abbreviation_needs_context():
+    """Short tokens like 'CA' or 'IN' only count as states after a city"""
+    parser = SnippetParser()
+
+    assert parser.is_location("San Francisco, CA")
+    assert not parser.is_location("CA")
+    assert not parser.is_location("Canada Goose")
+    assert parser.find_location("Engineer based in Denver, CO and hiring") == "Denver, CO"
+
+def test_places_come_from_the_gazetteer(tmp_path):
+    """Location phrases are whatever the gazetteer knows, not a list of its own"""
+    path = tmp_path / 'gazetteer.tsv'
+    path.write_text("il\tstate\t\t\tIL\tUS\t\t\nspringfield\tcity\tSpringfield\t\tIL\tUS\t39.8\t-89.6\n")
+    parser = SnippetParser(Gazetteer(str(path)))
+
+    assert parser.find_location("Engineer based in Springfield, IL and hiring") == "Springfield, IL"
+    assert not parser.is_location("San Francisco, CA")
+    assert SnippetParser().is_location("Lisbon, Portugal")
+
+if __name__ == "__main__":
+    test_snippet_accuracy()
+    test_location_never_returns_name()
+    test_state_abbreviation_needs_context()
+    print("\n✅ Snippet parser tests passed!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Outreach
+=======================
+
+Checks that streamed messages are assembled, timed and stored, and rendered by print_results.
+"""
+
+import os
+import time
+from types import SimpleNamespace
+from benchmarks import BENCH_JOB, synthetic_profiles
+from config import Config
+from gpt_outreach import GPTOutreach
+from job_orchestrator import JobOrchestrator
+
+DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_profiles.jsonl')
+
+def _reply(kwargs):
+    name = kwargs['messages'][-1]['content'].split('Name: ')[1].split('\n')[0]
+    return ["Hi ", f"{name},", "\n\nLet's talk.", "\n\nBest regards, Team"]
+
+class FakeAnthropic:
+    """Streams the reply as Messages API events"""
+
+    def __init__(self):
+        self.requests = []
+        self.messages = SimpleNamespace(create=self.create)
+
+    def create(self, **kwargs):
+        assert kwargs['stream'] is True
+        self.requests.append(kwargs)
+        usage = SimpleNamespace(input_tokens=40, output_tokens=1, cache_read_input_tokens=300,
+                                cache_creation_input_tokens=0)
+        yield SimpleNamespace(type='message_start', message=SimpleNamespace(usage=usage))
+        for text in _reply(kwargs):
+            yield SimpleNamespace(type='content_block_delta', delta=SimpleNamespace(type='text_delta', text=text))
+        yield SimpleNamespace(type='message_delta', usage=SimpleNamespace(output_tokens=12))
+        yield SimpleNamespace(type='message_stop')
+
+class FakeOpenAI:
+    """Streams the reply as chat completion chunks, usage in a final chunk"""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        assert kwargs['stream_options'] == {'include_usage': True}
+        for text in _reply(kwargs):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+        usage = SimpleNamespace(prompt_tokens=340, completion_tokens=12,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=256))
+        yield SimpleNamespace(choices=[], usage=usage)
+
+def test_stream_assembles_message_and_metrics():
+    for client, use_anthropic in ((FakeAnthropic(), True), (FakeOpenAI(), False)):
+        outreach = GPTOutreach()
+        outreach.anthropic_client = client if use_anthropic else None
+        outreach.openai_client = None if use_anthropic else client
+        profile = next(synthetic_profiles(1))
+        pieces = []
+        message, source, metrics = outreach.stream_message(profile, BENCH_JOB, use_anthropic=use_anthropic,
+                                                           on_text=pieces.append)
+
+        assert message == ''.join(pieces).strip() and message.startswith(f"Hi {profile['name']},")
+        assert source == ('claude' if use_anthropic else 'gpt-4')
+        assert metrics['output_tokens'] == 12 and metrics['ttft_seconds'] >= 0
+        assert outreach.usage['requests'] == 1 and outreach.usage['input_tokens'] == 340
+
+def test_failed_stream_reports_error_source():
+    outreach = GPTOutreach()
+    outreach.anthropic_client = SimpleNamespace(messages=SimpleNamespace(create=lambda **kwargs: 1 / 0))
+    assert outreach.stream_message(next(synthetic_profiles(1)), BENCH_JOB, use_anthropic=True) == \
+        (None, 'anthropic_error', {})
+
+def test_print_results_streams_and_stores_messages(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(Config, 'RUNS_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'TOP_K_CANDIDATES', 3)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    orchestrator = JobOrchestrator(use_gpt4=False, use_anthropic=True, profile_dumps=[DUMP], use_index=True,
+                                   use_search=False, stream=True)
+    orchestrator.outreach_generator.anthropic_client = FakeAnthropic()
+    monkeypatch.setattr(orchestrator.job_parser, 'get_job_details', lambda url: dict(BENCH_JOB))
+
+    results = orchestrator.process_job_posting('https://www.linkedin.com/jobs/view/1')
+    assert not orchestrator.outreach_generator.anthropic_client.requests
+    capsys.readouterr()
+
+    orchestrator.print_results(results, max_candidates=2)
+    printed = capsys.readouterr().out
+    first = results['top_candidates'][0]
+    assert f"Hi {first['name']},\n      \n      Let's talk." in printed
+
+    # The candidate not printed is generated too, so the export is complete
+    assert [c['message_source'] for c in results['top_candidates']] == ['claude'] * 3
+    assert set(results['stream_metrics']) == {c['linkedin_url'] for c in results['top_candidates']}
+    assert results['llm_usage']['requests'] == 3
+    meta = orchestrator.run_store.load_meta(results['job_id'])
+    assert meta['outreach'][first['linkedin_url']]['outreach_message'] == first['outreach_message']
+    assert meta['stream_metrics'] == results['stream_metrics']
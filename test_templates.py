@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test Precompiled Outreach Templates
+===================================
+
+Checks the template compiler and that both template generators render exactly what str.format did.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks import BENCH_JOB, _legacy_outreach_message, synthetic_profiles
+from enhanced_outreach import EnhancedOutreachGenerator
+from outreach import OutreachGenerator
+from templates import CompiledTemplate
+
+def test_compile_bind_render():
+    template = CompiledTemplate("""
+Hi {name},
+
+
+A {job_title} role at {company} ({{remote}}).
+        """)
+    assert template.fields == {'name', 'job_title', 'company'}
+    assert template.render({'name': 'Ann', 'job_title': 'SRE', 'company': 'Acme'}) == "Hi Ann,\n\nA SRE role at Acme ({remote})."
+
+    bound = template.bind({'job_title': 'SRE', 'company': 'Acme'})
+    assert bound.fields == {'name'}
+    assert bound.render({'name': 'Bo'}) == "Hi Bo,\n\nA SRE role at Acme ({remote})."
+    with pytest.raises(KeyError):
+        bound.render({})
+    with pytest.raises(ValueError):
+        CompiledTemplate("{score:.2f}")
+
+def test_generators_match_str_format():
+    candidates = list(synthetic_profiles(300))
+    candidates.append({'name': 'No Skills', 'headline': 'Junior Developer', 'location': 'Oakland, CA'})
+    other_job = dict(BENCH_JOB, title='Junior Developer', skills=['Go'], location='Oakland, CA')
+    for generator in (OutreachGenerator(), EnhancedOutreachGenerator()):
+        for job in (BENCH_JOB, other_job, BENCH_JOB):
+            def variation(c):
+                bound = generator.bind_job(job, "Jo") if isinstance(generator, EnhancedOutreachGenerator) else None
+                return lambda templates: templates[generator._variation_index(c, bound, len(templates))]
+            expected = [_legacy_outreach_message(generator, c, job, "Jo", choice=variation(c)) for c in candidates]
+            assert [generator.generate_outreach_message(c, job, "Jo") for c in candidates] == expected
+
+def test_personalization_variants():
+    generator = EnhancedOutreachGenerator()
+    candidate = {'name': 'Ann', 'headline': 'Staff Engineer', 'skills': ['Python'],
+                 'education': [{'school': 'Stanford University'}], 'experience': [{'title': 'Staff Engineer'}] * 5}
+    messages = {generator.generate_outreach_message(dict(candidate, name=f"Ann {i}"), BENCH_JOB) for i in range(20)}
+    assert any('Your background from Stanford University and expertise in' in m for m in messages)
+    assert not any('Your extensive experience' in m for m in messages)
+
+# Run in a fresh interpreter, so string hashing (and with it set order) follows PYTHONHASHSEED
+REPRODUCE = """
+import json
+from benchmarks import BENCH_JOB, synthetic_profiles
+from enhanced_outreach import EnhancedOutreachGenerator
+from outreach import OutreachGenerator
+# No current company and another city, so the seniority templates (two variations each) are used
+candidates = [dict(c, headline=c['headline'].split(' at ')[0], experience=[],
+                   linkedin_url=f"https://linkedin.com/in/c{i}") for i, c in enumerate(synthetic_profiles(60))]
+job = dict(BENCH_JOB, job_id='4256398535', location='Lisbon, Portugal')
+print(json.dumps({
+    'seed 3': [EnhancedOutreachGenerator(seed=3).generate_outreach_message(c, job) for c in candidates],
+    'seed 4': [EnhancedOutreachGenerator(seed=4).generate_outreach_message(c, job) for c in candidates],
+    'other job': [EnhancedOutreachGenerator(seed=3).generate_outreach_message(c, dict(job, job_id='1'))
+                  for c in candidates],
+    'basic': [OutreachGenerator().generate_outreach_message(c, job) for c in candidates],
+}))
+"""
+
+def test_enhanced_messages_are_reproducible():
+    runs = []
+    for hash_seed in ('1', '2', '3', '4'):
+        env = dict(os.environ, PYTHONHASHSEED=hash_seed)
+        output = subprocess.run([sys.executable, '-c', REPRODUCE], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                env=env, capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    # Same candidate, job and seed: the same messages in every process
+    assert all(run == runs[0] for run in runs[1:])
+    # Another seed or job id reshuffles the variations
+    assert runs[0]['seed 4'] != runs[0]['seed 3']
+    assert runs[0]['other job'] != runs[0]['seed 3']
+
+def test_shared_generator_serves_jobs_concurrently():
+    """One generator writing for several jobs at once gives each job its own messages"""
+    candidates = list(synthetic_profiles(40))
+    jobs = [dict(BENCH_JOB, job_id=str(i), title=title, company=company)
+            for i, (title, company) in enumerate([('Staff Engineer', 'Acme'), ('Junior Developer', 'Globex'),
+                                                  ('Data Engineer', 'Initech'), ('SRE', 'Umbrella')])]
+    for cls in (OutreachGenerator, EnhancedOutreachGenerator):
+        expected = {job['job_id']: [cls().generate_outreach_message(c, job) for c in candidates] for job in jobs}
+        shared = cls()
+
+        def write(job):
+            return job['job_id'], [shared.generate_outreach_message(c, job) for c in candidates]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for job_id, messages in pool.map(write, jobs * 5):
+                assert messages == expected[job_id]
+
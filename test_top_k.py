@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Top-K Selection
+==============================
+
+Checks that the heap-based accumulator matches a stable sort and trims rejected candidates.
+"""
+
+import random
+
+from records import EnrichedProfile, ScoredCandidate
+from top_k import TopKAccumulator
+
+
+def _candidate(name, score):
+    return {'name': name, 'fit_score': score, 'experience': [{'title': 'Engineer'}], 'skills': ['Python']}
+
+
+def test_matches_stable_sort():
+    rng = random.Random(7)
+    candidates = [_candidate(f"c{i}", round(rng.uniform(0, 10), 1)) for i in range(500)]
+    expected = sorted(candidates, key=lambda c: c['fit_score'], reverse=True)[:10]
+
+    top = TopKAccumulator(k=10)
+    for candidate in candidates:
+        top.offer(candidate)
+
+    assert [c['name'] for c in top.results()] == [c['name'] for c in expected]
+    assert len(top) == 10
+    assert top.seen == 500
+    assert top.dropped == 490
+
+
+def test_ties_keep_earliest():
+    top = TopKAccumulator(k=2)
+    for name in ('first', 'second', 'third'):
+        top.offer(_candidate(name, 5.0))
+
+    assert [c['name'] for c in top.results()] == ['first', 'second']
+
+
+def test_threshold_and_dropped_fields():
+    top = TopKAccumulator(k=5, threshold=6.0)
+    low = _candidate('low', 3.0)
+    high = _candidate('high', 8.0)
+
+    assert not top.offer(low)
+    assert top.offer(high)
+    assert 'experience' not in low and 'skills' not in low
+    assert low['name'] == 'low'
+    assert top.results() == [high]
+    assert high['experience']
+
+
+def test_evicted_candidate_is_trimmed():
+    top = TopKAccumulator(k=1)
+    weak = _candidate('weak', 4.0)
+    top.offer(weak)
+    top.offer(_candidate('strong', 9.0))
+
+    assert 'experience' not in weak
+    assert [c['name'] for c in top.results()] == ['strong']
+
+
+def test_rejected_record_keeps_shared_profile():
+    profile = EnrichedProfile(name='shared', experience=[{'title': 'Engineer'}], skills=['Python'])
+    top = TopKAccumulator(k=1)
+    top.offer(ScoredCandidate(profile, 9.0, {}))
+    assert not top.offer(ScoredCandidate(profile, 4.0, {}))
+
+    assert profile.experience and profile.skills == ['Python']
+    assert [c['name'] for c in top.results()] == ['shared']
@@ -0,0 +1,77 @@
+import heapq
+from typing import Any, Dict, List, Optional
+
+from config import Config
+
+# Fields that dominate a candidate's memory and are only needed for shortlisted candidates
+HEAVY_FIELDS = ('experience', 'education', 'skills', 'summary', 'snippet')
+
+
+class TopKAccumulator:
+    """
+    Streaming top-K selection over scored candidates in O(K) memory
+
+    Candidates are offered one at a time. Ties are broken by offer order (earlier wins),
+    which matches a stable descending sort. Candidate dicts that fall below the threshold
+    or out of the top K have their heavy fields dropped straight away. Records
+    (ScoredCandidate) are left as they are: their profile fields belong to a shared
+    EnrichedProfile, and the record itself is released once it is rejected.
+    """
+
+    def __init__(self, k: int = None, threshold: Optional[float] = None, score_key: str = 'fit_score',
+                 drop_fields=HEAVY_FIELDS):
+        self.k = k or Config.TOP_K_CANDIDATES
+        self.threshold = threshold
+        self.score_key = score_key
+        self.drop_fields = drop_fields
+        # Min-heap of (score, -order, candidate): the root is the weakest kept candidate
+        self._heap: List[tuple] = []
+        self.seen = 0
+        self.dropped = 0
+
+    def would_admit(self, score: float, order: int = None) -> bool:
+        """True if a candidate with this score (and order) would currently make the top K"""
+        if self.threshold is not None and score < self.threshold:
+            return False
+        if len(self._heap) < self.k:
+            return True
+        order = self.seen if order is None else order
+        return (score, -order) > self._heap[0][:2]
+
+    def offer(self, candidate: Dict[str, Any], score: float = None, order: int = None) -> bool:
+        """
+        Offer a scored candidate; returns True if it is (for now) in the top K
+
+        Args:
+            candidate: Candidate dict (heavy fields are removed in place if it is rejected) or record
+            score: Score to rank by (default: candidate[score_key])
+            order: Unique tie-break position (default: number of candidates offered so far)
+        """
+        score = candidate[self.score_key] if score is None else score
+        order = self.seen if order is None else order
+        self.seen += 1
+
+        if not self.would_admit(score, order):
+            self._drop(candidate)
+            return False
+
+        item = (score, -order, candidate)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        else:
+            evicted = heapq.heapreplace(self._heap, item)
+            self._drop(evicted[2])
+        return True
+
+    def results(self) -> List[Dict[str, Any]]:
+        """Kept candidates, best first"""
+        return [item[2] for item in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _drop(self, candidate):
+        self.dropped += 1
+        if isinstance(candidate, dict):
+            for field in self.drop_fields:
+                candidate.pop(field, None)